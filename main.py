@@ -1,12 +1,92 @@
-# Third-party library
-from PySide6.QtWidgets import QApplication
+# Standard libraries
+import argparse
+import json
+import sys
+from pathlib import Path
 
 # Source
-from src.ui.main import MainUI
+from src.utils.instance_client import send_command
+
+# Seconds to wait for the running instance, an OCR command waits for the recognition
+COMMAND_TIMEOUTS = {'ocr': 120.0}
+DEFAULT_COMMAND_TIMEOUT = 5.0
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="PyTextractOCR. Commands are forwarded to the running instance, "
+                                                 "which is started first when there is none.")
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.add_parser('capture', help="Capture a region of the screen")
+    scan_parser = subparsers.add_parser('scan', help="OCR an image file and show the text in the OCR Text window")
+    scan_parser.add_argument('path')
+    ocr_parser = subparsers.add_parser('ocr', help="OCR an image file and print the text")
+    ocr_parser.add_argument('path')
+    ocr_parser.add_argument('--profile', default=None, help="OCR profile (default: the active profile)")
+    ocr_parser.add_argument('--json', action='store_true', help="Print the text, word boxes, confidences and timings as JSON")
+    return parser.parse_args()
+
+
+def build_request(args):
+    # Without a command a second launch brings the running instance to the front
+    request = {'command': args.command or 'show'}
+    if args.command in ('scan', 'ocr'):
+        request['path'] = str(Path(args.path).resolve())  # The running instance has its own working directory
+    if args.command == 'ocr':
+        request['profile'] = args.profile
+    return request
+
+
+def print_response(args, response):
+    if not response.get('ok'):
+        print(f"Error: {response.get('error')}", file=sys.stderr)
+        return 1
+    if args.command == 'ocr':
+        result = response['result']
+        print(json.dumps(result, ensure_ascii=False, indent=2) if args.json else result['text'])
+    return 0
+
+
+def forward_command(args, request):
+    # Returns None when no instance is running
+    response = send_command(request, COMMAND_TIMEOUTS.get(request['command'], DEFAULT_COMMAND_TIMEOUT))
+    return None if response is None else print_response(args, response)
+
+
+def run_ocr_in_process(args, request):
+    # No running instance, the OCR runs without Qt and without starting the application
+    from src.core import ocr
+
+    try:
+        response = {'ok': True, 'result': ocr(request['path'], args.profile).to_dict()}
+    except Exception as e:
+        response = {'ok': False, 'error': str(e)}
+    return print_response(args, response)
+
+
+def run_application(args, request):
+    from PySide6.QtCore import QTimer
+    from PySide6.QtWidgets import QApplication
+    from src.ui.main import MainUI
+    from src.utils.instance_server import InstanceServer
 
-if __name__ == "__main__":
     app = QApplication([])
     app.setQuitOnLastWindowClosed(False)
     dialog = MainUI()
+    instance_server = InstanceServer(dialog)
+    if not instance_server.listen():
+        return forward_command(args, request)
     dialog.show()
-    app.exec()
+    if request['command'] != 'show':
+        QTimer.singleShot(0, lambda: instance_server.run(request['command'], request))
+    return app.exec()
+
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+    command_request = build_request(arguments)
+    exit_code = forward_command(arguments, command_request)
+    if exit_code is not None:
+        sys.exit(exit_code)
+    if arguments.command == 'ocr':
+        sys.exit(run_ocr_in_process(arguments, command_request))
+    sys.exit(run_application(arguments, command_request))
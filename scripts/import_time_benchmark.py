@@ -0,0 +1,99 @@
+"""
+Import time of the modules loaded before the first window of PyTextractOCR, from python -X importtime.
+
+Every run is a fresh interpreter. The script fails when the median import time of the
+main window module exceeds the budget, or when a module of the application imports one
+of the deferred libraries of src.utils.preload at startup instead of on first use.
+
+Usage (from the repository root): python scripts/import_time_benchmark.py [--runs 5] [--budget-ms 700] [--top 15]
+"""
+
+# Standard libraries
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.utils.preload import DEFERRED_MODULES  # noqa: E402
+
+MODULE = 'src.ui.main'
+LINE_PATTERN = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$')
+
+
+def run_importtime(module):
+    # Returns (name, depth, self microseconds, cumulative microseconds) in the order printed by Python
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get('QT_QPA_PLATFORM', 'offscreen'))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    imports = []
+    for line in result.stderr.splitlines():
+        match = LINE_PATTERN.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            imports.append((name, len(indent) // 2, int(self_us), int(cumulative_us)))
+    return imports
+
+
+def find_importers(imports):
+    # A module is printed after the modules it imports, its importer is the next line one level up
+    importers = {}
+    for index, (name, depth, _, _) in enumerate(imports):
+        importers[name] = next((parent for parent, parent_depth, _, _ in imports[index + 1:] if parent_depth < depth), None)
+    return importers
+
+
+def deferred_imports(imports):
+    # Deferred libraries imported directly by an application module, a library importing another one is not reported
+    packages = {module.split('.')[0] for module in DEFERRED_MODULES}
+    importers = find_importers(imports)
+    return sorted((name, importer) for name, importer in importers.items()
+                  if name.split('.')[0] in packages and importer is not None and importer.startswith('src.'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=f"Import time of {MODULE} with a regression budget")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=700.0, help="Maximum median import time in milliseconds")
+    parser.add_argument('--top', type=int, default=15, help="Number of slowest modules to list")
+    args = parser.parse_args()
+
+    runs = [run_importtime(MODULE) for _ in range(max(1, args.runs))]
+    totals = [next(cumulative for name, depth, _, cumulative in imports if name == MODULE) / 1000 for imports in runs]
+    median_total = statistics.median(totals)
+
+    # Self time of every module, median over the runs
+    self_times = {}
+    for imports in runs:
+        for name, _, self_us, _ in imports:
+            self_times.setdefault(name, []).append(self_us / 1000)
+    slowest = sorted(((statistics.median(times), name) for name, times in self_times.items()), reverse=True)[:args.top]
+
+    print(f"{MODULE}: median {median_total:.1f} ms over {len(runs)} runs (min {min(totals):.1f}, max {max(totals):.1f}), budget {args.budget_ms:.0f} ms")
+    print(f"\n{'Self (ms)':>10}  Module")
+    for self_ms, name in slowest:
+        print(f"{self_ms:>10.1f}  {name}")
+
+    failures = []
+    eager_imports = deferred_imports(runs[0])
+    if eager_imports:
+        print("\nDeferred libraries imported at startup:")
+        for name, importer in eager_imports:
+            print(f"  {name} (imported by {importer})")
+        failures.append(f"{len(eager_imports)} deferred libraries imported at startup")
+    if median_total > args.budget_ms:
+        failures.append(f"import time {median_total:.1f} ms over the {args.budget_ms:.0f} ms budget")
+
+    if failures:
+        print(f"\nFAILED: {'; '.join(failures)}")
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Stand-in for a LibreTranslate server, used to test the libretranslate translation backend without a real service.
+
+Translations are the upper-cased source texts prefixed with the target language code.
+Every request is logged with the number of texts it contained and whether the
+connection was reused, so batching and keep-alive can be checked.
+
+Usage: python scripts/libretranslate_stub.py [--port 5000] [--delay 0.0]
+Then set translate.backend = "libretranslate" and translate.service_url = "http://localhost:5000" in config.toml.
+"""
+
+# Standard libraries
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive connections
+    delay = 0.0
+
+    def do_POST(self):
+        if self.path != '/translate':
+            self.send_json(404, {'error': 'Not found'})
+            return
+
+        payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        texts = payload.get('q', '')
+        target = payload.get('target', '')
+        time.sleep(self.delay)
+
+        translate = lambda text: f"[{target}] {text.upper()}"
+        translated = [translate(text) for text in texts] if isinstance(texts, list) else translate(texts)
+        self.server.request_count += 1
+        self.log_message(f"request {self.server.request_count}: {len(texts) if isinstance(texts, list) else 1} texts "
+                         f"{payload.get('source')} -> {target}, connection {self.client_address[1]}")
+        self.send_json(200, {'translatedText': translated})
+
+    def send_json(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LibreTranslate stand-in server")
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--delay', type=float, default=0.0, help="Seconds to wait before answering each request")
+    args = parser.parse_args()
+
+    StubHandler.delay = args.delay
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), StubHandler)
+    server.request_count = 0
+    print(f"LibreTranslate stub listening on http://127.0.0.1:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
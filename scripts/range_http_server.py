@@ -0,0 +1,105 @@
+"""
+Static file server with HTTP Range support, used to test the segmented language downloads locally.
+
+Serves a folder with HEAD, Accept-Ranges, ETag and single byte-range GET requests.
+--rate limits every response to a number of bytes per second and --drop-after closes
+each connection after that many bytes, which simulates an interrupted download.
+
+Usage: python scripts/range_http_server.py FOLDER [--port 8000] [--rate 0] [--drop-after 0]
+Then set download.base_url = "http://127.0.0.1:8000/" in config.toml.
+"""
+
+# Standard libraries
+import argparse
+import os
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    folder = Path('.')
+    rate = 0
+    drop_after = 0
+
+    def do_HEAD(self):
+        self.handle_request(send_body=False)
+
+    def do_GET(self):
+        self.handle_request(send_body=True)
+
+    def handle_request(self, send_body):
+        file_path = (self.folder / self.path.lstrip('/')).resolve()
+        if self.folder.resolve() not in file_path.parents or not file_path.is_file():
+            self.send_error(404, "File not found")
+            return
+
+        stat = file_path.stat()
+        size = stat.st_size
+        etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+        start, end, status = 0, size - 1, 200
+
+        match = re.fullmatch(r'bytes=(\d*)-(\d*)', self.headers.get('Range', ''))
+        if match and self.headers.get('If-Range', etag) == etag:
+            start = int(match.group(1)) if match.group(1) else size - int(match.group(2))
+            end = int(match.group(2)) if match.group(1) and match.group(2) else size - 1
+            if start >= size:
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{size}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            end, status = min(end, size - 1), 206
+
+        self.send_response(status)
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(end - start + 1))
+        if status == 206:
+            self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+        self.end_headers()
+        if send_body:
+            self.send_file(file_path, start, end)
+
+    def send_file(self, file_path, start, end):
+        sent = 0
+        with open(file_path, 'rb') as file:
+            file.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = file.read(min(65536, remaining))
+                if self.drop_after and sent + len(chunk) > self.drop_after:
+                    self.wfile.write(chunk[:self.drop_after - sent])
+                    self.close_connection = True
+                    self.log_message(f"dropped {file_path.name} after {self.drop_after} bytes")
+                    return
+                self.wfile.write(chunk)
+                sent += len(chunk)
+                remaining -= len(chunk)
+                if self.rate:
+                    time.sleep(len(chunk) / self.rate)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Static file server with HTTP Range support")
+    parser.add_argument('folder')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--rate', type=int, default=0, help="Bytes per second per response, 0 is unlimited")
+    parser.add_argument('--drop-after', type=int, default=0, help="Close each connection after this many bytes, 0 never")
+    args = parser.parse_args()
+
+    RangeHandler.folder = Path(args.folder)
+    RangeHandler.rate = args.rate
+    RangeHandler.drop_after = args.drop_after
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), RangeHandler)
+    print(f"Serving {os.path.abspath(args.folder)} on http://127.0.0.1:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Load test of the OCR HTTP service (src/service/server.py) running on localhost.
+
+Sends the same image from a number of concurrent clients over keep-alive connections and
+reports the throughput, the latency percentiles of the accepted requests, the status codes
+and the highest X-Queue-Depth seen. Rejected requests (429) are not retried, so raising
+--concurrency above the workers and queue of the service shows the backpressure.
+
+Usage (from the repository root, with the service started):
+    python -m src.service.server --workers 2 --max-queue 4
+    python scripts/service_load_test.py IMAGE [--requests 200] [--concurrency 8] [--profile fast]
+"""
+
+# Standard libraries
+import argparse
+import http.client
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlencode
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))] if values else 0.0
+
+
+class LoadTest:
+    def __init__(self, host, port, image, profile, total_requests):
+        self.host = host
+        self.port = port
+        self.image = image
+        self.path = f"/ocr?{urlencode({'profile': profile})}" if profile else "/ocr"
+        self.remaining = total_requests
+        self.lock = threading.Lock()
+        self.statuses = Counter()
+        self.latencies = []  # Seconds of the accepted requests
+        self.max_queue_depth = 0
+
+    def next_request(self):
+        with self.lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+    def client(self):
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=120)
+        try:
+            while self.next_request():
+                start_time = time.perf_counter()
+                try:
+                    connection.request('POST', self.path, body=self.image, headers={'Content-Type': 'application/octet-stream'})
+                    response = connection.getresponse()
+                    response.read()
+                except (OSError, http.client.HTTPException) as e:
+                    connection.close()
+                    with self.lock:
+                        self.statuses[type(e).__name__] += 1
+                    continue
+                elapsed = time.perf_counter() - start_time
+                with self.lock:
+                    self.statuses[response.status] += 1
+                    if response.status == 200:
+                        self.latencies.append(elapsed)
+                    self.max_queue_depth = max(self.max_queue_depth, int(response.getheader('X-Queue-Depth', 0)))
+                if response.getheader('Connection', '').lower() == 'close':
+                    connection.close()
+        finally:
+            connection.close()
+
+    def run(self, concurrency):
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for _ in range(concurrency):
+                executor.submit(self.client)
+        return time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test of the OCR HTTP service on localhost")
+    parser.add_argument('image', type=Path)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--profile', default=None)
+    args = parser.parse_args()
+
+    try:
+        connection = http.client.HTTPConnection(args.host, args.port, timeout=5)
+        connection.request('GET', '/health')
+        health = connection.getresponse()
+        print(f"Health: {health.status} {health.read().decode('utf-8')}")
+        connection.close()
+    except OSError as e:
+        sys.exit(f"The service is not running on {args.host}:{args.port}: {e}")
+
+    load_test = LoadTest(args.host, args.port, args.image.read_bytes(), args.profile, args.requests)
+    duration = load_test.run(max(1, args.concurrency))
+
+    accepted = len(load_test.latencies)
+    print(f"\n{args.requests} requests, {args.concurrency} clients, {duration:.2f} s")
+    print(f"Throughput: {accepted / duration:.1f} images/s accepted, {args.requests / duration:.1f} requests/s")
+    print("Status: " + ", ".join(f"{status}: {count}" for status, count in sorted(load_test.statuses.items(), key=str)))
+    print(f"Highest queue depth: {load_test.max_queue_depth}")
+    if accepted:
+        latencies_ms = [latency * 1000 for latency in load_test.latencies]
+        print(f"Latency (ms) - mean {statistics.mean(latencies_ms):.1f} | p50 {percentile(latencies_ms, 0.5):.1f} | "
+              f"p95 {percentile(latencies_ms, 0.95):.1f} | p99 {percentile(latencies_ms, 0.99):.1f} | max {max(latencies_ms):.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Time to first window of PyTextractOCR, with the Settings window built lazily or eagerly.
+
+Every run is a fresh interpreter, so the imports are measured cold. --eager builds the
+Settings window with every tab and the language list before the main window is shown,
+which is what the application did before the tabs were built on first display.
+
+Usage (from the repository root): python scripts/startup_benchmark.py [--runs 5]
+Set QT_QPA_PLATFORM=offscreen to run it without a display.
+"""
+
+# Standard libraries
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+START_TIME = time.perf_counter()
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+STAGES = ['imports', 'main_window', 'first_window', 'settings_open']
+
+
+def elapsed_ms(start_time):
+    return (time.perf_counter() - start_time) * 1000
+
+
+def wait_until_exposed(app, window, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        app.processEvents()
+        if window.windowHandle() is not None and window.windowHandle().isExposed():
+            return
+        time.sleep(0.001)
+
+
+def measure(eager):
+    # Runs in the child process, the timings are relative to the start of the interpreter script
+    from PySide6.QtWidgets import QApplication
+    from src.ui.main import MainUI
+    timings = {'imports': elapsed_ms(START_TIME)}
+
+    app = QApplication([])
+    app.setQuitOnLastWindowClosed(False)
+    main_ui = MainUI()
+    if eager:
+        settings_ui = main_ui.get_settings_ui()
+        for index in range(settings_ui.settings_tab_widget.count()):
+            tab = settings_ui.settings_tab_widget.widget(index)
+            if settings_ui.build_tab(tab):
+                settings_ui.initialize_tab(tab)
+        settings_ui.build_language_list()
+    timings['main_window'] = elapsed_ms(START_TIME)
+
+    main_ui.show()
+    wait_until_exposed(app, main_ui)
+    timings['first_window'] = elapsed_ms(START_TIME)
+
+    settings_start_time = time.perf_counter()
+    main_ui.show_settings_ui_main()
+    wait_until_exposed(app, main_ui.settings_ui)
+    timings['settings_open'] = elapsed_ms(settings_start_time)
+
+    main_ui.tray_icon.hide()
+    return timings
+
+
+def run_child(eager):
+    command = [sys.executable, __file__, '--child'] + (['--eager'] if eager else [])
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time to first window with lazy and eager Settings construction")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--eager', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        # loguru writes to stderr, the timings are the last line of stdout
+        print(json.dumps(measure(args.eager)))
+        return
+
+    results = {}
+    for mode, eager in (('eager', True), ('lazy', False)):
+        runs = [run_child(eager) for _ in range(max(1, args.runs))]
+        results[mode] = {stage: statistics.median(run[stage] for run in runs) for stage in STAGES}
+
+    print(f"Median of {args.runs} runs, milliseconds since interpreter start (settings_open: from the click)")
+    print(f"{'Stage':<15}{'Eager':>10}{'Lazy':>10}{'Saved':>10}")
+    for stage in STAGES:
+        eager, lazy = results['eager'][stage], results['lazy'][stage]
+        print(f"{stage:<15}{eager:>10.1f}{lazy:>10.1f}{eager - lazy:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
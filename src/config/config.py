@@ -1,5 +1,10 @@
-# Standard library
+# Standard libraries
+import atexit
+import os
+import tempfile
+import threading
 from pathlib import Path
+from types import MappingProxyType
 
 # Third-party libraries
 import toml
@@ -7,8 +12,13 @@ from loguru import logger
 from toml import TomlDecodeError
 
 
-def load_config():
-    default_config = {
+CONFIG_FILE = 'config.toml'
+FLUSH_DELAY = 1.0  # Quiet period in seconds before pending updates are written to the configuration file
+USER_SECTIONS = ('profiles',)  # Sections whose keys are defined by the user, keys that are not in the defaults are kept
+
+
+def get_default_config():
+    return {
         "preferences": {
             'minimize_to_system_tray': False,
             'enable_sound': True,
@@ -17,13 +27,16 @@ def load_config():
         "ocr": {
             'tesseract_path': "C:\\Program Files\\Tesseract-OCR\\tesseract.exe",
             'language': "eng",
+            'model_variant': "best",
             'page_segmentation_mode': 6,
             'ocr_engine_mode': 3,
             'preserve_interword_spaces': False,
             'enable_blacklist_char': False,
             'blacklist_char': "",
             'enable_whitelist_char': False,
-            'whitelist_char': ""
+            'whitelist_char': "",
+            'enable_pre_ocr': False,
+            'pre_ocr_min_confidence': 60
         },
         "preprocess": {
             'enable_preprocess': False,
@@ -65,6 +78,19 @@ def load_config():
         "translate": {
             'enable_translation': False,
             'server_timeout': 2000,
+            'backend': "google",
+            'service_url': "http://localhost:5000",
+            'service_api_key': "",
+            'dictionary_file': "dictionary.json",
+            'batch_size': 50,
+            'batch_characters': 4500,
+            'max_parallel_requests': 4,
+            'max_retries': 2,
+            'retry_backoff': 0.5,
+            'enable_cache': True,
+            'cache_max_entries': 2048,
+            'cache_ttl_days': 30,
+            'cache_file': "translation_cache.sqlite3",
             'languages': ["en", "en", "en", "en", "en", "en", "en", "en", "en", "en", "en", "en", "en", "en", "en", "en", "en", "en", "en", "en",
                           "en", "en", "en", "tl", "en", "en", "en", "en", "en", "en", "en", "en", "en", "en", "en", "en", "en", "en", "en", "en",
                           "en", "en", "en", "en", "en", "en", "en", "en", "en", "en", "en", "en", "en", "en", "en", "en", "en", "en", "en", "en",
@@ -83,6 +109,38 @@ def load_config():
             'position_y': 0,
             'always_on_top': False
         },
+        "history": {
+            'enable_history': True,
+            'max_entries': 50,
+            'max_bytes': 33554432,
+            'spill_to_disk': False,
+            'spill_folder': "history"
+        },
+        "download": {
+            'base_url': "https://raw.githubusercontent.com/tesseract-ocr/tessdata_best/main/",
+            'fast_base_url': "https://raw.githubusercontent.com/tesseract-ocr/tessdata_fast/main/",
+            'max_concurrent_downloads': 3,
+            'segments': 4,
+            'segment_min_size': 4194304,
+            'chunk_size': 1048576,
+            'progress_interval_ms': 100,
+            'timeout': 30,
+            'fetch_checksum': False,
+            'store_folder': "models",
+            'mirror_manifest': False
+        },
+        "profiles": {
+            'active_profile': "",
+            'fast': {'model_variant': "fast"},
+            'accurate': {'model_variant': "best"},
+        },
+        "service": {
+            'host': "127.0.0.1",
+            'port': 8765,
+            'workers': 2,
+            'max_queue': 8,
+            'max_upload_bytes': 20971520,
+        },
         "miscellaneous": {
             'main_window_position_x': 0,
             'main_window_position_y': 0,
@@ -92,11 +150,12 @@ def load_config():
         }
     }
 
+
+def read_config_file(config_path):
+    default_config = get_default_config()
     try:
-        config_path = Path('config.toml')
         if not config_path.is_file():
-            with config_path.open('w') as f:
-                toml.dump(default_config, f)
+            write_config_file(config_path, default_config)
             config = default_config
         else:
             config = toml.load(config_path)
@@ -107,40 +166,190 @@ def load_config():
     modified = False
     new_config = {section: {} for section in default_config}  # Create a new dictionary with the same sections as default_config
     for section, section_config in default_config.items():
-        if section in config:
-            for key in section_config:
-                if key in config[section]:
-                    new_config[section][key] = config[section][key]  # Update the value from loaded config
-                else:
-                    logger.warning(f"Missing keys: {[section]}{[key]}")
-                    new_config[section][key] = section_config[key]  # If key was not present in loaded config, use the default value
-                    modified = True  # If key was not present in loaded config, it's a missing key
+        loaded_section = config.get(section, {})
+        for key in section_config:
+            if key in loaded_section:
+                new_config[section][key] = loaded_section[key]  # Update the value from loaded config
+            else:
+                logger.warning(f"Missing keys: {[section]}{[key]}")
+                new_config[section][key] = section_config[key]  # If key was not present in loaded config, use the default value
+                modified = True  # If key was not present in loaded config, it's a missing key
+        if section in USER_SECTIONS:
+            for key, value in loaded_section.items():
+                new_config[section].setdefault(key, value)
 
     if modified:  # If there was a missing key
-        with open("config.toml", "w") as f:
-            toml.dump(new_config, f)  # Overwrite the config.toml file with the updated config
+        write_config_file(config_path, new_config)  # Overwrite the config.toml file with the updated config
     else:
         logger.success("All keys were found in the configuration file")
 
     return new_config  # Return the updated config
 
 
+def write_config_file(config_path, config):
+    # Write through a temporary file in the same folder and replace, so a crash never leaves a truncated file
+    with tempfile.NamedTemporaryFile('w', dir=config_path.resolve().parent, prefix=f'.{config_path.name}.',
+                                     suffix='.tmp', delete=False) as f:
+        temporary_path = f.name
+        try:
+            toml.dump(config, f)
+            f.flush()
+            os.fsync(f.fileno())
+        except Exception:
+            f.close()
+            os.remove(temporary_path)
+            raise
+    os.replace(temporary_path, config_path)
+
+
+def merge_config(config, new_config):
+    merged_config = {section: dict(section_values) for section, section_values in config.items()}
+    for section, section_values in new_config.items():
+        merged_config.setdefault(section, {}).update(section_values)
+    return merged_config
+
+
+def thaw_config(value):
+    if isinstance(value, MappingProxyType):
+        return {key: thaw_config(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw_config(item) for item in value]
+    return value
+
+
+def freeze_config(value):
+    # Snapshots are shared by every consumer, so they are made read-only
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze_config(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze_config(item) for item in value)
+    return value
+
+
+class ConfigStore:
+    """
+    Process-wide cache of the configuration file.
+
+    The file is parsed once and served as an immutable snapshot from memory. It is
+    parsed again only when its modification time or size changes, and the
+    subscribed callbacks are called with the new snapshot.
+
+    Updates are applied to the snapshot immediately and written behind: they are
+    merged in memory and flushed atomically after a quiet period or on shutdown.
+    """
+
+    def __init__(self, config_file=CONFIG_FILE, flush_delay=FLUSH_DELAY):
+        self.config_path = Path(config_file)
+        self.flush_delay = flush_delay
+        self.lock = threading.RLock()
+        self.snapshot = None
+        self.file_signature = None
+        self.version = 0
+        self.listeners = []
+        self.pending_updates = {}
+        self.flush_timer = None
+        self.metrics = {'updates_requested': 0, 'file_writes': 0, 'writes_saved': 0}
+
+    def get_file_signature(self):
+        try:
+            stat = os.stat(self.config_path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def load(self):
+        with self.lock:
+            if self.snapshot is None or self.get_file_signature() != self.file_signature:
+                self.reload()
+            return self.snapshot
+
+    def reload(self):
+        with self.lock:
+            previous_snapshot = self.snapshot
+            config = read_config_file(self.config_path)
+            self.file_signature = self.get_file_signature()  # Read after parsing, the missing keys may have been written back
+            # Updates that are not flushed yet are kept on top of the external changes
+            self.snapshot = freeze_config(merge_config(config, self.pending_updates))
+            self.version += 1
+            snapshot = self.snapshot
+        logger.info(f"Configuration loaded from disk (version {self.version})")
+        if previous_snapshot is not None:
+            self.notify(snapshot)
+        return snapshot
+
+    def update(self, new_config):
+        with self.lock:
+            config = thaw_config(self.load())
+            self.snapshot = freeze_config(merge_config(config, new_config))
+            self.version += 1
+            snapshot = self.snapshot
+            for section, section_values in new_config.items():
+                self.pending_updates.setdefault(section, {}).update(section_values)
+            self.metrics['updates_requested'] += 1
+            self.schedule_flush()
+        self.notify(snapshot)
+
+    def schedule_flush(self):
+        # Every update restarts the quiet period, so bursts of updates end up in a single write
+        if self.flush_timer is not None:
+            self.flush_timer.cancel()
+        self.flush_timer = threading.Timer(self.flush_delay, self.flush)
+        self.flush_timer.daemon = True
+        self.flush_timer.start()
+
+    def flush(self):
+        with self.lock:
+            if self.flush_timer is not None:
+                self.flush_timer.cancel()
+                self.flush_timer = None
+            if not self.pending_updates:
+                return
+
+            try:
+                existing_config = toml.load(self.config_path) if self.config_path.is_file() else {}
+            except TomlDecodeError:
+                logger.error(f"An error occurred while updating the configuration file '{self.config_path}'")
+                existing_config = thaw_config(self.snapshot)
+
+            try:
+                write_config_file(self.config_path, merge_config(existing_config, self.pending_updates))
+            except OSError as e:
+                logger.error(f"Failed to write the configuration file '{self.config_path}': {e}")
+                return
+
+            self.pending_updates = {}
+            self.file_signature = self.get_file_signature()
+            self.metrics['file_writes'] += 1
+            self.metrics['writes_saved'] = self.metrics['updates_requested'] - self.metrics['file_writes']
+            logger.success(f"Configuration file successfully updated - {self.metrics['updates_requested']} updates, "
+                           f"{self.metrics['file_writes']} writes, {self.metrics['writes_saved']} writes saved")
+
+    def subscribe(self, callback):
+        self.listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    def notify(self, snapshot):
+        for listener in list(self.listeners):
+            try:
+                listener(snapshot)
+            except Exception as e:
+                logger.error(f"An error occurred in a configuration change callback: {e}")
+
+
+config_store = ConfigStore()
+atexit.register(config_store.flush)
+
+
+def load_config():
+    return config_store.load()
+
+
 def update_config(new_config):
-    try:
-        # Read the existing TOML configuration file
-        with open('config.toml', 'r') as f:
-            existing_config = toml.load(f)
-
-        # Merge the existing config with the new values
-        for section, section_values in new_config.items():
-            if section in existing_config:
-                existing_config[section].update(section_values)
-            else:
-                existing_config[section] = section_values
+    config_store.update(new_config)
 
-        with open('config.toml', 'w') as f:
-            toml.dump(existing_config, f)
 
-        logger.success("Configuration file successfully updated")
-    except TomlDecodeError:
-        logger.error("An error occurred while updating the configuration file 'config.toml'")
+def flush_config():
+    config_store.flush()
@@ -0,0 +1,255 @@
+# Standard libraries
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+# Third-party library
+from loguru import logger
+
+# Custom libraries
+from src.config.config import get_default_config, load_config
+from src.ocr.capabilities import capability_cache, get_capabilities
+from src.ocr.variants import LEGACY_ENGINE_VARIANTS, VARIANTS, resolve_variant, tessdata_folder, tessdata_index
+from src.utils.languages import resolve_language_pair
+
+
+@dataclass(frozen=True, slots=True)
+class PreprocessPlan:
+    scale_factor: float
+    read_grayscale: bool
+    remove_noise: bool
+    enable_deskew: bool
+    deskew_position: int
+    enable_blurring: bool
+    blurring: int
+    blur_average_kernel: tuple
+    blur_gaussian_kernel: tuple
+    blur_median_kernel: int
+    blur_bilateral_dcs: tuple
+    enable_thresholding: bool
+    thresholding: int
+    threshold_global: int
+    threshold_global_type: int
+    threshold_adaptive: int
+    threshold_adaptive_method: int
+    enable_morphological_transformation: bool
+    morphological_transformation: int
+    erosion_kernel_iteration: tuple
+    dilation_kernel_iteration: tuple
+    opening_kernel: tuple
+    closing_kernel: tuple
+    gradient_kernel: tuple
+    top_hat_kernel: tuple
+    black_hat_kernel: tuple
+
+
+@dataclass(frozen=True, slots=True)
+class TranslationPair:
+    source_code: str
+    source_name: str
+    destination_code: str
+    destination_name: str
+
+
+@dataclass(frozen=True, slots=True)
+class ExecutionPlan:
+    profile: str  # Empty when no profile is applied
+    language: str
+    model_variant: str
+    missing_languages: tuple  # Languages without an installed model, Tesseract would fail on them
+    tesseract_path: str  # None when the Tesseract executable was not found
+    capabilities: object  # EngineCapabilities of the executable, None until it was probed once
+    tessdata_prefix: str
+    tesseract_args: str
+    full_frame_args: str
+    preserve_interword_spaces: bool
+    preprocess: PreprocessPlan  # None when preprocessing is disabled
+    translation: TranslationPair  # None when the language pair cannot be resolved
+    translation_error: str
+    remove_empty_lines: bool
+    copy_to_clipboard: bool
+
+
+def config_value(config, section, key, converter, valid=None):
+    # Invalid values are replaced by the default value instead of failing on every capture
+    value = config[section][key]
+    try:
+        converted = converter(value)
+        if valid is None or valid(converted):
+            return converted
+    except (TypeError, ValueError):
+        pass
+    default = converter(get_default_config()[section][key])
+    logger.error(f"Invalid configuration - Table: {section} | Key: {key} | Value: {value}, using default value {default}")
+    return default
+
+
+def kernel(length):
+    return lambda value: tuple(int(item) for item in value[:length]) if len(value) >= length else None
+
+
+def is_kernel(value):
+    return value is not None and all(item > 0 for item in value)
+
+
+def build_preprocess_plan(config):
+    if not config_value(config, 'preprocess', 'enable_preprocess', bool):
+        return None
+
+    def value(key, converter, valid=None):
+        return config_value(config, 'preprocess', key, converter, valid)
+
+    enable_thresholding = value('enable_thresholding', bool)
+    remove_noise = value('remove_noise', bool)
+    return PreprocessPlan(
+        scale_factor=value('scale_factor', float, lambda v: 1.0 <= v <= 10.0),
+        read_grayscale=value('enable_grayscale', bool) or enable_thresholding or remove_noise,
+        remove_noise=remove_noise,
+        enable_deskew=value('enable_deskew', bool),
+        deskew_position=value('deskew_position', int, lambda v: v in (0, 1)),
+        enable_blurring=value('enable_blurring', bool),
+        blurring=value('blurring', int, lambda v: 0 <= v <= 3),
+        blur_average_kernel=value('blur_average_kernel', kernel(2), is_kernel),
+        blur_gaussian_kernel=value('blur_gaussian_kernel', kernel(2), is_kernel),
+        blur_median_kernel=value('blur_median_kernel', int, lambda v: v > 0),
+        blur_bilateral_dcs=value('blur_bilateral_dcs', kernel(3), is_kernel),
+        enable_thresholding=enable_thresholding,
+        thresholding=value('thresholding', int, lambda v: 0 <= v <= 2),
+        threshold_global=value('threshold_global', int, lambda v: 0 <= v <= 255),
+        threshold_global_type=value('threshold_global_type', int, lambda v: 0 <= v <= 4),
+        threshold_adaptive=value('threshold_adaptive', int, lambda v: v > 1 and v % 2 == 1),
+        threshold_adaptive_method=value('threshold_adaptive_method', int, lambda v: v in (0, 1)),
+        enable_morphological_transformation=value('enable_morphological_transformation', bool),
+        morphological_transformation=value('morphological_transformation', int, lambda v: 0 <= v <= 6),
+        erosion_kernel_iteration=value('erosion_kernel_iteration', kernel(3), is_kernel),
+        dilation_kernel_iteration=value('dilation_kernel_iteration', kernel(3), is_kernel),
+        opening_kernel=value('opening_kernel', kernel(2), is_kernel),
+        closing_kernel=value('closing_kernel', kernel(2), is_kernel),
+        gradient_kernel=value('gradient_kernel', kernel(2), is_kernel),
+        top_hat_kernel=value('top_hat_kernel', kernel(2), is_kernel),
+        black_hat_kernel=value('black_hat_kernel', kernel(2), is_kernel),
+    )
+
+
+def build_tesseract_args(config):
+    language = config['ocr']['language']
+    key = f"-l {language} " if language else ""
+    psmv = f"--psm {config_value(config, 'ocr', 'page_segmentation_mode', int, lambda v: 0 <= v <= 13)} "
+    oemv = f"--oem {config_value(config, 'ocr', 'ocr_engine_mode', int, lambda v: 0 <= v <= 3)} "
+    pisv = "-c preserve_interword_spaces=1 " if config['ocr']['preserve_interword_spaces'] else ""
+
+    te_char = ""
+    if config['ocr']['enable_blacklist_char']:
+        te_char = fr"-c tessedit_char_blacklist={config['ocr']['blacklist_char']}"
+    elif config['ocr']['enable_whitelist_char']:
+        te_char = fr"-c tessedit_char_whitelist={config['ocr']['whitelist_char']}"
+
+    return f"{key}{psmv}{oemv}{pisv}{te_char}"
+
+
+def apply_profile(config, profile=None):
+    """
+    Returns the configuration with the OCR settings of a profile applied.
+
+    Profiles are tables of the profiles section that override keys of the ocr section,
+    for instance [profiles.fast] model_variant = "fast". Without a profile name the
+    active profile of the configuration is used.
+    """
+    profile = config['profiles']['active_profile'] if profile is None else profile
+    if not profile:
+        return config, ""
+
+    overrides = config['profiles'].get(profile)
+    if profile == 'active_profile' or not hasattr(overrides, 'items'):
+        logger.error(f"Unknown OCR profile: {profile}")
+        return config, ""
+    unknown_keys = [key for key in overrides if key not in config['ocr']]
+    if unknown_keys:
+        logger.warning(f"Ignoring unknown keys of the '{profile}' profile: {unknown_keys}")
+    profile_config = dict(config)
+    profile_config['ocr'] = {**config['ocr'], **{key: value for key, value in overrides.items() if key in config['ocr']}}
+    return profile_config, profile
+
+
+def build_execution_plan(config, profile=None):
+    config, profile = apply_profile(config, profile)
+    language = str(config['ocr']['language'])
+    tesseract_path = str(config['ocr']['tesseract_path'])
+    if not Path(tesseract_path).exists():
+        logger.error(f"Tesseract installation path not found: {tesseract_path}")
+        tesseract_path = None
+
+    # A language missing from the preferred variant falls back to the other installed variant
+    model_variant = resolve_variant(language, config_value(config, 'ocr', 'model_variant', str, lambda v: v in VARIANTS))
+    missing_languages = ()
+    if language or tesseract_path is None:
+        tessdata_prefix = f"./{tessdata_folder(model_variant).as_posix()}/"
+        missing_languages = tuple(tessdata_index.missing_languages(language, model_variant))
+        legacy_models = model_variant in LEGACY_ENGINE_VARIANTS
+    else:
+        # The models installed with Tesseract may include the legacy engine
+        tessdata_prefix = f"{Path(tesseract_path).parent}/tessdata"
+        legacy_models = True
+
+    ocr_engine_mode = config_value(config, 'ocr', 'ocr_engine_mode', int, lambda v: 0 <= v <= 3)
+    # Cached probe results only, the executable is probed in the background and the plan built again
+    capabilities = get_capabilities(tesseract_path) if tesseract_path is not None else None
+    if capabilities is not None and not capabilities.supports_engine_mode(ocr_engine_mode, legacy_models):
+        default_engine_mode = get_default_config()['ocr']['ocr_engine_mode']
+        supported_engine_modes = capabilities.supported_engine_modes(legacy_models)
+        supported_engine_mode = default_engine_mode if default_engine_mode in supported_engine_modes else supported_engine_modes[-1]
+        logger.error(f"OCR engine mode {ocr_engine_mode} is not supported by Tesseract {capabilities.version} and the "
+                     f"installed models, using {supported_engine_mode}")
+        ocr_engine_mode = supported_engine_mode
+        config = dict(config)
+        config['ocr'] = {**config['ocr'], 'ocr_engine_mode': ocr_engine_mode}
+    key = f"-l {language} " if language else ""
+
+    translation, translation_error = None, None
+    try:
+        translation = TranslationPair(*resolve_language_pair(config['ocr']['language'], config['translate']['languages']))
+    except (ValueError, IndexError) as e:
+        translation_error = str(e)
+
+    plan = ExecutionPlan(
+        profile=profile,
+        language=language,
+        model_variant=model_variant,
+        missing_languages=missing_languages,
+        tesseract_path=tesseract_path,
+        capabilities=capabilities,
+        tessdata_prefix=tessdata_prefix,
+        tesseract_args=build_tesseract_args(config),
+        full_frame_args=f"{key}--psm 11 --oem {ocr_engine_mode}",
+        preserve_interword_spaces=config_value(config, 'ocr', 'preserve_interword_spaces', bool),
+        preprocess=build_preprocess_plan(config),
+        translation=translation,
+        translation_error=translation_error,
+        remove_empty_lines=config_value(config, 'output', 'remove_empty_lines', bool),
+        copy_to_clipboard=config_value(config, 'output', 'copy_to_clipboard', bool),
+    )
+    logger.info(f"Execution plan built - Profile: {profile or 'none'} | Models: {model_variant} | Tesseract arguments: {plan.tesseract_args}")
+    return plan
+
+
+plan_lock = threading.Lock()
+cached_plans = {}  # Profile name -> (snapshot, tessdata index and capability cache versions, plan)
+
+
+def get_execution_plan(config=None, profile=None):
+    """
+    Returns the execution plan of a configuration snapshot and profile, built once per snapshot.
+
+    Snapshots are immutable and replaced whenever the configuration changes,
+    so the snapshot identity is the configuration version. The plan also depends
+    on the installed models and the probed Tesseract capabilities, it is built again
+    when the tessdata index or the capability cache changes.
+    """
+    snapshot = load_config() if config is None else config
+    version = (tessdata_index.current_version(), capability_cache.version)
+    with plan_lock:
+        cached_snapshot, cached_version, plan = cached_plans.get(profile, (None, None, None))
+        if cached_snapshot is not snapshot or cached_version != version:
+            plan = build_execution_plan(snapshot, profile)
+            cached_plans[profile] = (snapshot, version, plan)
+        return plan
@@ -0,0 +1,16 @@
+"""
+Qt-free OCR library, for services and workers that embed PyTextractOCR without the GUI.
+
+    from src.core import ocr
+    result = ocr('screenshot.png', profile='fast')
+    print(result.text, result.confidence, result.timings)
+
+Nothing imported from this package imports PySide6.
+"""
+
+# Custom libraries
+from src.core.engine import ocr
+from src.core.models import install_model, installed_models, is_model_installed, model_sha256, remove_model
+from src.core.result import OCRResult, OCRWord
+
+__all__ = ['ocr', 'OCRResult', 'OCRWord', 'install_model', 'installed_models', 'is_model_installed', 'model_sha256', 'remove_model']
@@ -0,0 +1,141 @@
+# Standard libraries
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+# Third-party library
+from loguru import logger
+
+# Custom libraries
+from src.config.model import get_execution_plan
+from src.core.result import OCRResult, OCRWord
+from src.ocr.ocr_processor import check_installed_languages, layout_text
+from src.ocr.preprocess import preprocess_image
+
+
+def elapsed_ms(start_time):
+    return (time.perf_counter() - start_time) * 1000
+
+
+def write_image(image, folder):
+    # The preprocessing works on a file and replaces it, so the image of the caller is never touched
+    if isinstance(image, (str, os.PathLike)):
+        image_path = Path(folder) / f"image{Path(image).suffix or '.png'}"
+        shutil.copyfile(image, image_path)
+    elif isinstance(image, (bytes, bytearray, memoryview)):
+        image_path = Path(folder) / 'image.png'
+        image_path.write_bytes(image)
+    elif hasattr(image, 'save'):
+        image_path = Path(folder) / 'image.png'
+        image.save(image_path, format='PNG')
+    else:
+        # A NumPy array in the channel order of OpenCV
+        import cv2
+
+        image_path = Path(folder) / 'image.png'
+        if not cv2.imwrite(str(image_path), image):
+            raise ValueError("Unsupported image, expected a path, encoded image bytes, a PIL image or a NumPy array")
+    return image_path
+
+
+def recognize(image_path, plan):
+    import pytesseract
+    from pytesseract import Output
+
+    # The models are passed with --tessdata-dir instead of TESSDATA_PREFIX, so threads using
+    # different profiles do not change the environment of each other
+    if pytesseract.pytesseract.tesseract_cmd != plan.tesseract_path:
+        pytesseract.pytesseract.tesseract_cmd = plan.tesseract_path
+    args = f"--tessdata-dir {plan.tessdata_prefix} {plan.tesseract_args}" if plan.language else plan.tesseract_args
+    return pytesseract.image_to_data(str(image_path), config=args, output_type=Output.DICT)
+
+
+def extract_words(data, scale_factor=1.0):
+    words = []
+    for i, text in enumerate(data['text']):
+        confidence = float(data['conf'][i])
+        if confidence < 0 or not str(text).strip():
+            continue
+        words.append(OCRWord(
+            text=str(text),
+            confidence=confidence,
+            left=round(data['left'][i] / scale_factor),
+            top=round(data['top'][i] / scale_factor),
+            width=round(data['width'][i] / scale_factor),
+            height=round(data['height'][i] / scale_factor),
+            block=data['block_num'][i],
+            paragraph=data['par_num'][i],
+            line=data['line_num'][i],
+        ))
+    return words
+
+
+def words_to_lines(words):
+    # The words of a line joined by spaces and an empty line between paragraphs, as printed by Tesseract
+    lines = []
+    previous_line = None
+    for word in words:
+        line = (word.block, word.paragraph, word.line)
+        if line == previous_line:
+            lines[-1] += f" {word.text}"
+            continue
+        if previous_line is not None and line[:2] != previous_line[:2]:
+            lines.append("")
+        lines.append(word.text)
+        previous_line = line
+    return "\n".join(lines)
+
+
+def ocr(image, profile=None, config=None):
+    """
+    Recognizes the text of an image and returns an OCRResult.
+
+    The image is a file path, encoded image bytes, a PIL image or a NumPy array. The profile
+    is the name of a table of the profiles section, None applies the active profile. Nothing
+    is copied to the clipboard and nothing depends on Qt. Raises FileNotFoundError when
+    Tesseract or one of the language models is not installed.
+    """
+    start_time = time.perf_counter()
+    plan = get_execution_plan(config, profile)
+    if plan.tesseract_path is None:
+        raise FileNotFoundError("Tesseract installation path not found")
+    check_installed_languages(plan)
+
+    timings = {}
+    with tempfile.TemporaryDirectory(prefix='pytextractocr-') as folder:
+        stage_time = time.perf_counter()
+        if plan.preprocess is None and isinstance(image, (str, os.PathLike)):
+            image_path = Path(image)
+        else:
+            image_path = write_image(image, folder)
+        timings['load'] = elapsed_ms(stage_time)
+
+        stage_time = time.perf_counter()
+        preprocess_image(str(image_path), plan.preprocess)
+        timings['preprocess'] = elapsed_ms(stage_time)
+
+        stage_time = time.perf_counter()
+        data = recognize(image_path, plan)
+        timings['recognize'] = elapsed_ms(stage_time)
+
+    # Word boxes are scaled back to the given image, a deskewed image keeps the boxes of the rotated image
+    stage_time = time.perf_counter()
+    words = extract_words(data, plan.preprocess.scale_factor if plan.preprocess else 1.0)
+    text = layout_text(data) if plan.preserve_interword_spaces and words else words_to_lines(words)
+    if plan.remove_empty_lines:
+        text = "\n".join(line for line in text.split("\n") if line.strip())
+    timings['layout'] = elapsed_ms(stage_time)
+    timings['total'] = elapsed_ms(start_time)
+
+    logger.info(f"OCR of {len(words)} words in {timings['total']:.1f} ms - Profile: {plan.profile or 'none'} | Models: {plan.model_variant}")
+    return OCRResult(
+        text=text,
+        words=tuple(words),
+        confidence=sum(word.confidence for word in words) / len(words) if words else 0.0,
+        language=plan.language,
+        model_variant=plan.model_variant,
+        profile=plan.profile,
+        timings=timings,
+    )
@@ -0,0 +1,71 @@
+# Standard library
+from pathlib import Path
+
+# Third-party library
+from loguru import logger
+
+# Custom libraries
+from src.config.config import load_config
+from src.ocr.variants import VARIANTS, model_path, tessdata_index
+from src.utils.model_store import DEFAULT_VARIANT, get_base_url, get_model_store, model_name, provision_model
+
+
+def check_variant(variant):
+    if variant not in VARIANTS:
+        raise ValueError(f"Unknown model variant '{variant}', expected one of {', '.join(VARIANTS)}")
+
+
+def installed_models(variant=None):
+    # InstalledModel entries of the tessdata index, sorted by variant and language code
+    variants = VARIANTS if variant is None else (variant,)
+    for name in variants:
+        check_variant(name)
+    return sorted((tessdata_index.get(code, name) for name in variants for code in tessdata_index.installed_languages(name)),
+                  key=lambda model: (model.variant, model.code))
+
+
+def is_model_installed(language_code, variant=None):
+    return tessdata_index.is_installed(language_code, variant)
+
+
+def model_sha256(language_code, variant=DEFAULT_VARIANT):
+    return tessdata_index.sha256(language_code, variant)
+
+
+def install_model(language_code, variant=DEFAULT_VARIANT, progress_callback=None, config=None):
+    """
+    Installs a language model from the model store, or downloads it and adds it to the store.
+
+    Blocks until the model is in the tessdata folder of the variant and returns its path.
+    The progress callback receives the download progress in percent.
+    """
+    from src.utils.downloader import create_download_manager
+
+    check_variant(variant)
+    download_config = (load_config() if config is None else config)['download']
+    destination = model_path(language_code, variant)
+    base_url = get_base_url(download_config, variant)
+    logger.info(f"Installing '{language_code}' language ({variant} model)")
+
+    download_manager = create_download_manager(download_config)
+    try:
+        provision_model(get_model_store(download_config['store_folder']), download_manager, base_url,
+                        model_name(destination.name, variant), destination, progress_callback, download_config['mirror_manifest'])
+    finally:
+        download_manager.close()
+        tessdata_index.invalidate()
+    return Path(destination)
+
+
+def remove_model(language_code, variant=DEFAULT_VARIANT):
+    # The copy in the model store is kept, installing the model again does not download it
+    check_variant(variant)
+    destination = model_path(language_code, variant)
+    try:
+        destination.unlink()
+    except FileNotFoundError:
+        return False
+    finally:
+        tessdata_index.invalidate()
+    logger.info(f"Removed '{language_code}' language ({variant} model)")
+    return True
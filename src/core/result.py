@@ -0,0 +1,34 @@
+# Standard library
+from dataclasses import asdict, dataclass, field
+
+
+@dataclass(frozen=True, slots=True)
+class OCRWord:
+    text: str
+    confidence: float
+    left: int
+    top: int
+    width: int
+    height: int
+    block: int
+    paragraph: int
+    line: int
+
+
+@dataclass(frozen=True, slots=True)
+class OCRResult:
+    text: str
+    words: tuple  # OCRWord in reading order, in pixels of the image given to ocr()
+    confidence: float  # Mean confidence of the words, 0 without words
+    language: str
+    model_variant: str
+    profile: str  # Empty when no profile is applied
+    timings: dict = field(default_factory=dict)  # Stage -> milliseconds: load, preprocess, recognize, layout, total
+
+    @property
+    def confidences(self):
+        return [word.confidence for word in self.words]
+
+    def to_dict(self):
+        # JSON serializable
+        return asdict(self)
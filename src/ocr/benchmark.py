@@ -0,0 +1,155 @@
+"""
+Micro-benchmark of the tessdata_best and tessdata_fast models.
+
+Every image of the sample folder is recognized with each installed variant of the language.
+An image with a ground truth file next to it ('sample.png' and 'sample.gt.txt', the
+tesstrain naming) is also scored with the character error rate (CER) and the word accuracy.
+
+    python -m src.ocr.benchmark samples --language eng --variants best fast --repeat 3
+    python -m src.ocr.benchmark samples --language jpn --json benchmark.json
+"""
+
+# Standard libraries
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+# Third-party libraries
+import pytesseract
+from loguru import logger
+from PIL import Image
+
+# Custom libraries
+from src.config.config import load_config
+from src.config.model import config_value
+from src.ocr.variants import VARIANTS, is_language_installed, tessdata_folder
+
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff'}
+
+
+def edit_distance(reference, hypothesis):
+    # Levenshtein distance between two sequences, characters or words, with a single row of the table
+    previous = list(range(len(hypothesis) + 1))
+    for i, reference_item in enumerate(reference, 1):
+        current = [i]
+        for j, hypothesis_item in enumerate(hypothesis, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (reference_item != hypothesis_item)))
+        previous = current
+    return previous[-1]
+
+
+def normalize_text(text):
+    return ' '.join(text.split())
+
+
+def character_error_rate(reference, hypothesis):
+    reference, hypothesis = normalize_text(reference), normalize_text(hypothesis)
+    return edit_distance(reference, hypothesis) / max(1, len(reference))
+
+
+def word_accuracy(reference, hypothesis):
+    reference_words, hypothesis_words = reference.split(), hypothesis.split()
+    return max(0.0, 1 - edit_distance(reference_words, hypothesis_words) / max(1, len(reference_words)))
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))]
+
+
+def find_samples(sample_folder):
+    samples = []
+    for image_path in sorted(Path(sample_folder).iterdir()):
+        if image_path.suffix.lower() not in IMAGE_EXTENSIONS:
+            continue
+        ground_truth_path = image_path.with_suffix('.gt.txt')
+        ground_truth = ground_truth_path.read_text(encoding='utf-8') if ground_truth_path.is_file() else None
+        samples.append((image_path, ground_truth))
+    return samples
+
+
+def benchmark_variant(samples, language, variant, tesseract_args, repeat):
+    # The first run of each image warms up the model loading and the file cache and is not measured
+    tessdata_dir = tessdata_folder(variant).resolve().as_posix()
+    config = f'--tessdata-dir "{tessdata_dir}" -l {language} {tesseract_args}'
+    latencies, error_rates, accuracies = [], [], []
+    for image_path, ground_truth in samples:
+        image = Image.open(image_path)
+        image.load()
+        text = pytesseract.image_to_string(image, config=config)
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            pytesseract.image_to_string(image, config=config)
+            latencies.append(time.perf_counter() - start_time)
+        if ground_truth is not None:
+            error_rates.append(character_error_rate(ground_truth, text))
+            accuracies.append(word_accuracy(ground_truth, text))
+        logger.info(f"{variant} - {image_path.name}: {statistics.median(latencies[-repeat:]) * 1000:.0f} ms")
+
+    return {
+        'variant': variant,
+        'images': len(samples),
+        'scored_images': len(error_rates),
+        'median_ms': statistics.median(latencies) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'cer': statistics.mean(error_rates) if error_rates else None,
+        'word_accuracy': statistics.mean(accuracies) if accuracies else None,
+    }
+
+
+def run_benchmark(sample_folder, language, variants=VARIANTS, repeat=3, config=None):
+    config = load_config() if config is None else config
+    pytesseract.pytesseract.tesseract_cmd = str(config['ocr']['tesseract_path'])
+    tesseract_args = (f"--psm {config_value(config, 'ocr', 'page_segmentation_mode', int, lambda v: 0 <= v <= 13)} "
+                      f"--oem {config_value(config, 'ocr', 'ocr_engine_mode', int, lambda v: 0 <= v <= 3)}")
+
+    samples = find_samples(sample_folder)
+    if not samples:
+        raise ValueError(f"No sample images in '{sample_folder}'")
+
+    results = []
+    for variant in variants:
+        missing = [code for code in language.split('+') if not is_language_installed(code, variant)]
+        if missing:
+            logger.warning(f"Skipping the {variant} variant, not installed: {', '.join(missing)}")
+            continue
+        results.append(benchmark_variant(samples, language, variant, tesseract_args, max(1, repeat)))
+    return results
+
+
+def format_results(language, results):
+    lines = [f"Language: {language}",
+             f"{'Variant':<8}{'Images':>8}{'Median ms':>11}{'p95 ms':>9}{'CER':>8}{'Words':>8}"]
+    for result in results:
+        cer = f"{result['cer']:.2%}" if result['cer'] is not None else "-"
+        accuracy = f"{result['word_accuracy']:.2%}" if result['word_accuracy'] is not None else "-"
+        lines.append(f"{result['variant']:<8}{result['images']:>8}{result['median_ms']:>11.1f}{result['p95_ms']:>9.1f}"
+                     f"{cer:>8}{accuracy:>8}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency and accuracy of the tessdata_best and tessdata_fast models")
+    parser.add_argument('samples', help="Folder of sample images, with optional <image>.gt.txt ground truth files")
+    parser.add_argument('--language', default=None, help="Tesseract language, such as eng or eng+jpn (default: ocr.language)")
+    parser.add_argument('--variants', nargs='+', choices=VARIANTS, default=list(VARIANTS))
+    parser.add_argument('--repeat', type=int, default=3, help="Measured runs per image")
+    parser.add_argument('--json', default=None, help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    config = load_config()
+    language = args.language or config['ocr']['language'] or 'eng'
+    try:
+        results = run_benchmark(args.samples, language, args.variants, args.repeat, config)
+    except (ValueError, OSError, pytesseract.TesseractError, pytesseract.TesseractNotFoundError) as e:
+        parser.exit(1, f"Benchmark failed: {e}\n")
+
+    print(format_results(language, results))
+    if args.json:
+        Path(args.json).write_text(json.dumps({'language': language, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+# Standard libraries
+import json
+import os
+import re
+import subprocess
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+# Third-party library
+from loguru import logger
+
+CACHE_FILE = Path('./tesseract_capabilities.json')
+PROBE_TIMEOUT = 10
+
+# --oem 0 and 2 need the legacy engine, 1 and 3 the LSTM engine that exists since Tesseract 4.
+# The legacy engine also needs models that include it, tessdata_best and tessdata_fast models do not
+LEGACY_ENGINE_MODES = (0, 2)
+LSTM_ENGINE_MODES = (1, 3)
+
+
+@dataclass(frozen=True, slots=True)
+class EngineCapabilities:
+    path: str
+    mtime_ns: int
+    size: int
+    version: str
+    languages: tuple  # Languages of the tessdata folder next to the executable
+    engine_modes: tuple  # --oem values supported by the executable, whatever the models
+    openmp: bool
+    thread_count: int  # Threads used by one recognition, 1 without OpenMP
+    probed_at: float
+
+    def supported_engine_modes(self, legacy_models=True):
+        # Without legacy models only the LSTM modes run, Tesseract 3 has no LSTM mode and keeps its own
+        modes = tuple(mode for mode in self.engine_modes if legacy_models or mode not in LEGACY_ENGINE_MODES)
+        return modes or self.engine_modes
+
+    def supports_engine_mode(self, engine_mode, legacy_models=True):
+        return engine_mode in self.supported_engine_modes(legacy_models)
+
+
+def binary_key(tesseract_path):
+    # The cache key of an executable, None when it does not exist
+    try:
+        stat = os.stat(tesseract_path)
+    except OSError:
+        return None
+    return str(Path(tesseract_path).resolve()), stat.st_mtime_ns, stat.st_size
+
+
+def run_tesseract(tesseract_path, *args):
+    result = subprocess.run([tesseract_path, *args], capture_output=True, text=True, timeout=PROBE_TIMEOUT,
+                            creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
+    # Tesseract 3 prints --version on stderr
+    return result.stdout + result.stderr
+
+
+def parse_version(output):
+    match = re.search(r'tesseract\s+v?(\d+(?:\.\d+)*\S*)', output, re.IGNORECASE)
+    return match.group(1) if match else ""
+
+
+def major_version(version):
+    match = re.match(r'\d+', version)
+    return int(match.group()) if match else 0
+
+
+def parse_languages(output):
+    # The first line is 'List of available languages in "<folder>" (N):'
+    return tuple(sorted(line.strip() for line in output.splitlines()[1:] if line.strip() and ' ' not in line.strip()))
+
+
+def openmp_thread_count(openmp):
+    # Tesseract honours OMP_THREAD_LIMIT, OpenMP otherwise uses every logical processor
+    if not openmp:
+        return 1
+    try:
+        return max(1, int(os.environ['OMP_THREAD_LIMIT']))
+    except (KeyError, ValueError):
+        return os.cpu_count() or 1
+
+
+def probe_engine(tesseract_path):
+    """
+    Runs the executable to find its version, languages, engine modes and OpenMP support.
+
+    The legacy engine cannot be detected without recognizing an image, builds that do
+    not include it only fail once a legacy --oem value is used.
+    """
+    key = binary_key(tesseract_path)
+    if key is None:
+        raise FileNotFoundError(f"Tesseract installation path not found: {tesseract_path}")
+
+    version_output = run_tesseract(tesseract_path, '--version')
+    version = parse_version(version_output)
+    if not version:
+        raise ValueError(f"Not a Tesseract executable: {tesseract_path}")
+    tessdata_folder = Path(tesseract_path).parent / 'tessdata'
+    languages = parse_languages(run_tesseract(tesseract_path, '--list-langs', '--tessdata-dir', str(tessdata_folder)))
+
+    engine_modes = LEGACY_ENGINE_MODES + LSTM_ENGINE_MODES if major_version(version) >= 4 else (0,)
+    openmp = 'Found OpenMP' in version_output
+    return EngineCapabilities(
+        path=key[0],
+        mtime_ns=key[1],
+        size=key[2],
+        version=version,
+        languages=languages,
+        engine_modes=tuple(sorted(engine_modes)),
+        openmp=openmp,
+        thread_count=openmp_thread_count(openmp),
+        probed_at=time.time(),
+    )
+
+
+class CapabilityCache:
+    """
+    Engine capabilities cached on disk by executable path, modification time and size.
+
+    get() never starts Tesseract: it answers from memory or from the cache file and
+    schedules a probe in a background thread, once per executable and process, so a
+    cached answer is confirmed and a new or updated executable is probed. Listeners
+    are called from that thread with the path and the capabilities, or None when the
+    probe failed. The version changes with every probe result that differs.
+    """
+
+    def __init__(self, cache_file):
+        self.cache_file = Path(cache_file)
+        self.lock = threading.RLock()
+        self.entries = None  # Cache key -> EngineCapabilities, loaded on first use
+        self.refreshed = set()  # Cache keys probed by this process
+        self.pending = set()
+        self.listeners = []
+        self.version = 0
+
+    def load(self):
+        entries = {}
+        try:
+            for item in json.loads(self.cache_file.read_text()).get('engines', []):
+                item['languages'] = tuple(item['languages'])
+                item['engine_modes'] = tuple(item['engine_modes'])
+                capabilities = EngineCapabilities(**item)
+                entries[(capabilities.path, capabilities.mtime_ns, capabilities.size)] = capabilities
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            logger.error(f"An error occurred while reading the Tesseract capabilities cache '{self.cache_file}': {e}")
+        return entries
+
+    def save(self):
+        try:
+            folder = self.cache_file.resolve().parent
+            with tempfile.NamedTemporaryFile('w', dir=folder, prefix=f'{self.cache_file.stem}.', suffix='.tmp', delete=False) as temp:
+                json.dump({'engines': [asdict(capabilities) for capabilities in self.entries.values()]}, temp, indent=2)
+            os.replace(temp.name, self.cache_file)
+        except OSError as e:
+            logger.error(f"An error occurred while writing the Tesseract capabilities cache '{self.cache_file}': {e}")
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def get(self, tesseract_path, refresh=True):
+        key = binary_key(tesseract_path)
+        if key is None:
+            return None
+        with self.lock:
+            if self.entries is None:
+                self.entries = self.load()
+            capabilities = self.entries.get(key)
+            if refresh and key not in self.refreshed and key not in self.pending:
+                self.pending.add(key)
+                threading.Thread(target=self.refresh, args=(tesseract_path, key), name='tesseract-probe', daemon=True).start()
+            return capabilities
+
+    def refresh(self, tesseract_path, key):
+        capabilities = None
+        try:
+            capabilities = probe_engine(tesseract_path)
+            logger.info(f"Tesseract {capabilities.version} probed - Engine modes: {capabilities.engine_modes} | "
+                        f"Threads: {capabilities.thread_count} | Languages: {len(capabilities.languages)}")
+        except (OSError, ValueError, subprocess.SubprocessError) as e:
+            logger.error(f"An error occurred while probing Tesseract '{tesseract_path}': {e}")
+
+        with self.lock:
+            self.pending.discard(key)
+            self.refreshed.add(key)
+            if capabilities is not None:
+                previous = self.entries.get(key)
+                # Entries of replaced executables at the same path are dropped
+                self.entries = {entry_key: entry for entry_key, entry in self.entries.items() if entry_key[0] != key[0]}
+                self.entries[key] = capabilities
+                if previous is None or previous.version != capabilities.version or previous.languages != capabilities.languages \
+                        or previous.engine_modes != capabilities.engine_modes or previous.thread_count != capabilities.thread_count:
+                    self.version += 1
+                self.save()
+        for listener in list(self.listeners):
+            try:
+                listener(tesseract_path, capabilities)
+            except Exception as e:
+                logger.error(f"An error occurred while notifying a Tesseract probe listener: {e}")
+
+
+capability_cache = CapabilityCache(CACHE_FILE)
+
+
+def get_capabilities(tesseract_path, refresh=True):
+    return capability_cache.get(tesseract_path, refresh)
@@ -3,39 +3,32 @@ import re
 import os
 from pathlib import Path
 
-# Third-party libraries
-import pandas as pd
-import pyperclip
-import pytesseract
+# Third-party library
+# pandas, pyperclip, pytesseract and PIL are imported on first use, the first window does not need them
 from loguru import logger
-from PIL import Image
-from pytesseract import Output
 
 # Custom libraries
+from src.config.model import get_execution_plan
 from src.ocr.preprocess import preprocess_image
 
 
-def perform_ocr(working_image, configuration):
-    config = configuration
+def perform_ocr(working_image, configuration, clipboard=True, profile=None):
+    # Validation, argument building and the language pair are resolved once per configuration version and profile
+    plan = get_execution_plan(configuration, profile)
     extracted_text = None
 
-    tesseract_path = tesseract_check(config['ocr']['tesseract_path'])
-    tessdata_path(config, tesseract_path)
+    apply_execution_plan(plan)
 
     try:
-        preprocess_image(working_image, config)
-        custom_config = get_pytesseract_configuration(config)
+        check_installed_languages(plan)
+        preprocess_image(working_image, plan.preprocess)
 
-        if config['ocr']['preserve_interword_spaces']:
-            extracted_text = perform_ocr_image_to_data(working_image, custom_config)
+        if plan.preserve_interword_spaces:
+            extracted_text = perform_ocr_image_to_data(working_image, plan.tesseract_args)
         else:
-            extracted_text = perform_ocr_image_to_string(working_image, custom_config)
+            extracted_text = perform_ocr_image_to_string(working_image, plan.tesseract_args)
 
-        if extracted_text:
-            if config['output']['remove_empty_lines']:
-                extracted_text = "\n".join(line for line in extracted_text.split("\n") if line.strip())
-            if config['output']['copy_to_clipboard']:
-                copy_to_clipboard(extracted_text)
+        extracted_text = finalize_extracted_text(extracted_text, configuration, clipboard)
 
     except Exception as e:
         logger.error(f"An error occurred during OCR process: {e}")
@@ -49,31 +42,87 @@ def perform_ocr(working_image, configuration):
         return extracted_text
 
 
-def get_pytesseract_configuration(config):
-    key = f"-l {config['ocr']['language']} " if config['ocr']['language'] else ""
-    psmv = f"--psm {str(config['ocr']['page_segmentation_mode'])} "
-    oemv = f"--oem {str(config['ocr']['ocr_engine_mode'])} "
-    pisv = "-c preserve_interword_spaces=1 " if config['ocr']['preserve_interword_spaces'] else ""
+def remove_empty_lines(text):
+    return "\n".join(line for line in text.split("\n") if line.strip())
+
+
+def finalize_extracted_text(extracted_text, config, clipboard=True):
+    plan = get_execution_plan(config)
+    if extracted_text:
+        if plan.remove_empty_lines:
+            extracted_text = remove_empty_lines(extracted_text)
+        if clipboard and plan.copy_to_clipboard:
+            copy_to_clipboard(extracted_text)
+    return extracted_text
+
+
+def finalize_area_texts(area_texts, config):
+    # The empty lines are removed from every area before the areas are joined, so the empty line
+    # that separates the areas of a batch capture is kept
+    plan = get_execution_plan(config)
+    texts = [text.rstrip().lstrip("\n") for text in area_texts if text]
+    if plan.remove_empty_lines:
+        texts = [remove_empty_lines(text) for text in texts]
+    extracted_text = "\n\n".join(text for text in texts if text)
+    if extracted_text and plan.copy_to_clipboard:
+        copy_to_clipboard(extracted_text)
+    return extracted_text
+
+
+def perform_full_frame_ocr(image_path, configuration, profile=None):
+    # Sparse text mode finds as much text as possible on a screenshot, the preprocessing is skipped
+    # so that the word boxes stay in the coordinate space of the captured frame
+    import pytesseract
+    from PIL import Image
+    from pytesseract import Output
+
+    plan = get_execution_plan(configuration, profile)
+    check_installed_languages(plan)
+    apply_execution_plan(plan)
+
+    logger.info(f"Performing pytesseract full frame image to data '{image_path}'")
+    return pytesseract.image_to_data(Image.open(image_path), config=plan.full_frame_args, output_type=Output.DICT)
+
+
+def check_installed_languages(plan):
+    # Fail before starting Tesseract, which would only report a missing model after loading the others
+    if plan.missing_languages:
+        raise FileNotFoundError(f"Language models not installed in the {plan.model_variant} variant: {', '.join(plan.missing_languages)}")
+
 
-    te_char = ""
-    if config['ocr']['enable_blacklist_char']:
-        te_char = fr"-c tessedit_char_blacklist={config['ocr']['blacklist_char']}"
-    elif config['ocr']['enable_whitelist_char']:
-        te_char = fr"-c tessedit_char_whitelist={config['ocr']['whitelist_char']}"
+def apply_execution_plan(plan):
+    # The Tesseract command and TESSDATA_PREFIX are process globals, only touch them when the plan changes them
+    import pytesseract
 
-    custom_config = f"{key}{psmv}{oemv}{pisv}{te_char}"
-    logger.info(f"Pytesseract custom configuration: {custom_config}")
-    return custom_config
+    if plan.tesseract_path is not None and pytesseract.pytesseract.tesseract_cmd != plan.tesseract_path:
+        logger.info(f"Tesseract Path: {plan.tesseract_path}")
+        pytesseract.pytesseract.tesseract_cmd = plan.tesseract_path
+    if plan.tesseract_path is not None and os.environ.get('TESSDATA_PREFIX') != plan.tessdata_prefix:
+        os.environ['TESSDATA_PREFIX'] = plan.tessdata_prefix
 
 
 def perform_ocr_image_to_string(image_path, custom_config):
+    import pytesseract
+    from PIL import Image
+
     logger.info(f"Performing pytesseract image to string: {image_path}")
     return pytesseract.image_to_string(Image.open(image_path), config=custom_config)
 
 
 def perform_ocr_image_to_data(image_path, custom_config):
+    import pytesseract
+    from PIL import Image
+    from pytesseract import Output
+
     logger.info(f"Performing pytesseract image to data '{image_path}'")
     d = pytesseract.image_to_data(Image.open(image_path), config=custom_config, output_type=Output.DICT)
+    return layout_text(d)
+
+
+def layout_text(d):
+    # Rebuilds the text of an image_to_data dictionary with the spaces between the words preserved
+    import pandas as pd
+
     df = pd.DataFrame(d)
 
     # Clean up blanks
@@ -113,6 +162,8 @@ def perform_ocr_image_to_data(image_path, custom_config):
 
 
 def copy_to_clipboard(text):
+    import pyperclip
+
     try:
         pyperclip.copy(text)
         logger.success("Text successfully copied to clipboard using pyperclip")
@@ -125,14 +176,8 @@ def tesseract_check(tesseract_path):
         logger.error(f"Tesseract installation path not found: {tesseract_path}")
         return None
 
+    import pytesseract
+
     logger.info(f"Tesseract Path: {tesseract_path}")
     pytesseract.pytesseract.tesseract_cmd = str(tesseract_path)
     return tesseract_path
-
-
-def tesseract_version():
-    return pytesseract.get_tesseract_version()
-
-
-def tessdata_path(config, tesseract_path):
-    os.environ['TESSDATA_PREFIX'] = './tessdata/' if config['ocr']['language'] else f"{Path(tesseract_path).parent}/tessdata"
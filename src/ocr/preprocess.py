@@ -1,53 +1,28 @@
-# Third-party libraries
-import cv2
-import numpy as np
-from deskew import determine_skew
+# Third-party library
+# OpenCV, NumPy, deskew, PIL and scikit-image are imported on first use, together they take longer to import than the whole UI
 from loguru import logger
-from PIL import Image
-from skimage import io
-from skimage.color import rgb2gray
-from skimage.transform import rotate
 
 
-def preprocess_image(image_path, config):
+def preprocess_image(image_path, plan):
+    # The plan is None when preprocessing is disabled
+    if plan is None:
+        logger.info("Preprocessing is disabled")
+        return
+
     try:
-        start_preprocess(image_path, **config['preprocess'])
+        start_preprocess(image_path, plan)
     except Exception as e:
         logger.error(f"An error occurred while preprocessing the image [{e}]")
 
 
-def start_preprocess(image_path,
-                     enable_preprocess=None,
-                     scale_factor=None,
-                     enable_grayscale=None,
-                     remove_noise=None,
-                     enable_deskew=None,
-                     deskew_position=None,
-                     enable_blurring=None,
-                     blurring=None,
-                     blur_average_kernel=None,
-                     blur_gaussian_kernel=None,
-                     blur_median_kernel=None,
-                     blur_bilateral_dcs=None,
-                     enable_thresholding=None,
-                     thresholding=None,
-                     threshold_global=None,
-                     threshold_global_type=None,
-                     threshold_adaptive=None,
-                     threshold_adaptive_method=None,
-                     enable_morphological_transformation=None,
-                     morphological_transformation=None,
-                     erosion_kernel_iteration=None,
-                     dilation_kernel_iteration=None,
-                     opening_kernel=None,
-                     closing_kernel=None,
-                     gradient_kernel=None,
-                     top_hat_kernel=None,
-                     black_hat_kernel=None):
-
-    if not enable_preprocess:
-        logger.info("Preprocessing is disabled")
-        return
+def start_preprocess(image_path, plan):
+    import cv2
+    import numpy as np
+    from deskew import determine_skew
+    from PIL import Image
+    from skimage import io
+    from skimage.color import rgb2gray
+    from skimage.transform import rotate
 
     # Check if image file is GIF (Scan)
     try:
@@ -60,7 +35,7 @@ def start_preprocess(image_path,
         return
 
     # Check if deskewing is enabled and set to be the first operation in the OCR preprocessing sequence
-    if enable_deskew and deskew_position == 0:
+    if plan.enable_deskew and plan.deskew_position == 0:
         logger.info("Deskewing image [First]")
         image = io.imread(image_path)
         grayscale = rgb2gray(image)
@@ -74,33 +49,33 @@ def start_preprocess(image_path,
             logger.info("Skipping deskew because rotated angle value is 0.0")
 
     # Grayscale
-    if enable_grayscale or enable_thresholding or remove_noise:
+    if plan.read_grayscale:
         logger.info("Converting image to grayscale")
         image = cv2.imread(image_path, 0)
     else:
         image = cv2.imread(image_path)
 
     # Scale Factor
-    if scale_factor > 1.0:
-        logger.info(f"Resizing image: {scale_factor}x scale")
-        image = cv2.resize(image, None, fx=scale_factor, fy=scale_factor, interpolation=cv2.INTER_CUBIC)
+    if plan.scale_factor > 1.0:
+        logger.info(f"Resizing image: {plan.scale_factor}x scale")
+        image = cv2.resize(image, None, fx=plan.scale_factor, fy=plan.scale_factor, interpolation=cv2.INTER_CUBIC)
 
     # Blurring
-    if enable_blurring:
+    if plan.enable_blurring:
         blurring_methods = {
-            0: {"method": cv2.blur, "params": ((blur_average_kernel[0], blur_average_kernel[1]),), "message": "Applying average blur"},
-            1: {"method": cv2.GaussianBlur, "params": ((blur_gaussian_kernel[0], blur_gaussian_kernel[1]), 0), "message": "Applying gaussian blur"},
-            2: {"method": cv2.medianBlur, "params": (blur_median_kernel,), "message": "Applying median blur"},
-            3: {"method": cv2.bilateralFilter, "params": (blur_bilateral_dcs[0], blur_bilateral_dcs[1], blur_bilateral_dcs[2]),
+            0: {"method": cv2.blur, "params": ((plan.blur_average_kernel[0], plan.blur_average_kernel[1]),), "message": "Applying average blur"},
+            1: {"method": cv2.GaussianBlur, "params": ((plan.blur_gaussian_kernel[0], plan.blur_gaussian_kernel[1]), 0), "message": "Applying gaussian blur"},
+            2: {"method": cv2.medianBlur, "params": (plan.blur_median_kernel,), "message": "Applying median blur"},
+            3: {"method": cv2.bilateralFilter, "params": (plan.blur_bilateral_dcs[0], plan.blur_bilateral_dcs[1], plan.blur_bilateral_dcs[2]),
                 "message": "Applying bilateral blur"}
         }
-        if blurring in blurring_methods:
-            method_info = blurring_methods[blurring]
+        if plan.blurring in blurring_methods:
+            method_info = blurring_methods[plan.blurring]
             logger.info(f'{method_info["message"]}: {method_info["params"]}')
             image = method_info["method"](image, *method_info["params"])
 
     # Remove Noise
-    if remove_noise:
+    if plan.remove_noise:
         logger.info("Removing noise using global thresholding and connected components with stats")
         _, black_and_white = cv2.threshold(image, 127, 255, cv2.THRESH_BINARY_INV)
 
@@ -115,8 +90,8 @@ def start_preprocess(image_path,
         image = cv2.bitwise_not(empty_image)
 
     # Thresholding
-    if enable_thresholding:
-        if thresholding == 0:
+    if plan.enable_thresholding:
+        if plan.thresholding == 0:
             threshold_types = {
                 0: cv2.THRESH_BINARY,
                 1: cv2.THRESH_BINARY_INV,
@@ -124,59 +99,59 @@ def start_preprocess(image_path,
                 3: cv2.THRESH_TOZERO,
                 4: cv2.THRESH_TOZERO_INV,
             }
-            global_type = threshold_types.get(threshold_global_type, cv2.THRESH_BINARY)
-            logger.info(f"Applying global thresholding: {threshold_global} - Type: {global_type}")
-            _, image = cv2.threshold(image, threshold_global, 255, global_type)
+            global_type = threshold_types.get(plan.threshold_global_type, cv2.THRESH_BINARY)
+            logger.info(f"Applying global thresholding: {plan.threshold_global} - Type: {global_type}")
+            _, image = cv2.threshold(image, plan.threshold_global, 255, global_type)
 
-        elif thresholding == 1:
-            logger.info(f"Applying adaptive thresholding {threshold_adaptive}")
-            adaptive_method = cv2.ADAPTIVE_THRESH_MEAN_C if threshold_adaptive_method == 0 else cv2.ADAPTIVE_THRESH_GAUSSIAN_C
-            image = cv2.adaptiveThreshold(image, 255, adaptive_method, cv2.THRESH_BINARY, threshold_adaptive, 2)
+        elif plan.thresholding == 1:
+            logger.info(f"Applying adaptive thresholding {plan.threshold_adaptive}")
+            adaptive_method = cv2.ADAPTIVE_THRESH_MEAN_C if plan.threshold_adaptive_method == 0 else cv2.ADAPTIVE_THRESH_GAUSSIAN_C
+            image = cv2.adaptiveThreshold(image, 255, adaptive_method, cv2.THRESH_BINARY, plan.threshold_adaptive, 2)
 
-        elif thresholding == 2:
+        elif plan.thresholding == 2:
             logger.info("Applying otsu's thresholding")  # Apply Gaussian Blur for best settings
             ret, image = cv2.threshold(image, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
             logger.info(f"Otsu thresholding value: {ret}")
 
     # Morphological Transformation
-    if enable_morphological_transformation:
-        if morphological_transformation == 0:
-            logger.info(f"Applying erosion: {erosion_kernel_iteration}")
-            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (erosion_kernel_iteration[0], erosion_kernel_iteration[1]))
-            image = cv2.erode(image, kernel, iterations=erosion_kernel_iteration[2])
-
-        elif morphological_transformation == 1:
-            logger.info(f"Applying dilation: {dilation_kernel_iteration}")
-            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (dilation_kernel_iteration[0], dilation_kernel_iteration[1]))
-            image = cv2.dilate(image, kernel, iterations=dilation_kernel_iteration[2])
-
-        elif morphological_transformation == 2:
-            logger.info(f"Applying opening: {opening_kernel}")
-            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (opening_kernel[0], opening_kernel[1]))
+    if plan.enable_morphological_transformation:
+        if plan.morphological_transformation == 0:
+            logger.info(f"Applying erosion: {plan.erosion_kernel_iteration}")
+            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (plan.erosion_kernel_iteration[0], plan.erosion_kernel_iteration[1]))
+            image = cv2.erode(image, kernel, iterations=plan.erosion_kernel_iteration[2])
+
+        elif plan.morphological_transformation == 1:
+            logger.info(f"Applying dilation: {plan.dilation_kernel_iteration}")
+            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (plan.dilation_kernel_iteration[0], plan.dilation_kernel_iteration[1]))
+            image = cv2.dilate(image, kernel, iterations=plan.dilation_kernel_iteration[2])
+
+        elif plan.morphological_transformation == 2:
+            logger.info(f"Applying opening: {plan.opening_kernel}")
+            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (plan.opening_kernel[0], plan.opening_kernel[1]))
             image = cv2.morphologyEx(image, cv2.MORPH_OPEN, kernel)
 
-        elif morphological_transformation == 3:
-            logger.info(f"Applying closing: {closing_kernel}")
-            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (closing_kernel[0], closing_kernel[1]))
+        elif plan.morphological_transformation == 3:
+            logger.info(f"Applying closing: {plan.closing_kernel}")
+            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (plan.closing_kernel[0], plan.closing_kernel[1]))
             image = cv2.morphologyEx(image, cv2.MORPH_CLOSE, kernel)
 
-        elif morphological_transformation == 4:
-            logger.info(f"Applying gradient: {gradient_kernel}")
-            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (gradient_kernel[0], gradient_kernel[1]))
+        elif plan.morphological_transformation == 4:
+            logger.info(f"Applying gradient: {plan.gradient_kernel}")
+            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (plan.gradient_kernel[0], plan.gradient_kernel[1]))
             image = cv2.morphologyEx(image, cv2.MORPH_GRADIENT, kernel)
 
-        elif morphological_transformation == 5:
-            logger.info(f"Applying tophat: {top_hat_kernel}")
-            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (top_hat_kernel[0], top_hat_kernel[1]))
+        elif plan.morphological_transformation == 5:
+            logger.info(f"Applying tophat: {plan.top_hat_kernel}")
+            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (plan.top_hat_kernel[0], plan.top_hat_kernel[1]))
             image = cv2.morphologyEx(image, cv2.MORPH_TOPHAT, kernel)
 
-        elif morphological_transformation == 6:
-            logger.info(f"Applying blackhat: {black_hat_kernel}")
-            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (black_hat_kernel[0], black_hat_kernel[1]))
+        elif plan.morphological_transformation == 6:
+            logger.info(f"Applying blackhat: {plan.black_hat_kernel}")
+            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (plan.black_hat_kernel[0], plan.black_hat_kernel[1]))
             image = cv2.morphologyEx(image, cv2.MORPH_BLACKHAT, kernel)
 
     # Check if deskewing is enabled and set to be the last operation in the OCR preprocessing sequence
-    if enable_deskew and deskew_position == 1:
+    if plan.enable_deskew and plan.deskew_position == 1:
         logger.info(f"Deskewing image [Last]")
         angle = determine_skew(image)
         # If the angle is not None and is greater than 0, rotate the image to correct the skew
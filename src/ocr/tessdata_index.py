@@ -0,0 +1,131 @@
+# Standard libraries
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+# Third-party library
+from loguru import logger
+
+# Custom library
+from src.utils.model_store import file_sha256
+
+
+@dataclass(frozen=True, slots=True)
+class InstalledModel:
+    code: str
+    variant: str
+    path: Path
+    size: int
+    mtime_ns: int
+
+
+class TessdataIndex:
+    """
+    In-memory index of the installed .traineddata models of every variant folder.
+
+    The folders are scanned once and scanned again only when one of them changes. A folder
+    watcher calls invalidate() when it sees a change. Without a watcher the modification
+    times of the folders are compared at most once per check interval. The version changes
+    with every scan that found a difference, so cached results can be tied to it.
+    """
+
+    def __init__(self, folders, check_interval=1.0):
+        self.folders = dict(folders)  # Variant -> folder
+        self.check_interval = check_interval
+        self.lock = threading.RLock()
+        self.models = {variant: {} for variant in self.folders}  # Variant -> language code -> InstalledModel
+        self.folder_signatures = {}
+        self.hashes = {}  # (path, size, mtime_ns) -> SHA-256, computed on demand
+        self.version = 0
+        self.watched = False  # Set by the folder watcher, the modification times are then only compared after invalidate()
+        self.dirty = True
+        self.last_check = 0.0
+
+    @staticmethod
+    def folder_signature(folder):
+        try:
+            return os.stat(folder).st_mtime_ns
+        except OSError:
+            return None
+
+    @staticmethod
+    def scan_folder(variant, folder):
+        models = {}
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.traineddata') and entry.is_file():
+                        stat = entry.stat()
+                        code = entry.name[:-len('.traineddata')]
+                        models[code] = InstalledModel(code, variant, Path(folder) / entry.name, stat.st_size, stat.st_mtime_ns)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error(f"An error occurred while scanning the tessdata folder '{folder}': {e}")
+        return models
+
+    def invalidate(self):
+        self.dirty = True
+
+    def refresh(self):
+        # Cheap unless something changed: two folder stats per check interval, or nothing while watched
+        now = time.monotonic()
+        if not self.dirty and (self.watched or now - self.last_check < self.check_interval):
+            return
+        with self.lock:
+            self.dirty = False
+            self.last_check = now
+            changed = False
+            for variant, folder in self.folders.items():
+                signature = self.folder_signature(folder)
+                if variant in self.folder_signatures and self.folder_signatures[variant] == signature:
+                    continue
+                self.folder_signatures[variant] = signature
+                models = self.scan_folder(variant, folder)
+                if models != self.models[variant]:
+                    self.models[variant] = models
+                    changed = True
+            if changed:
+                self.version += 1
+                logger.info(f"Tessdata index updated (version {self.version}): "
+                            + ", ".join(f"{variant} {len(models)}" for variant, models in self.models.items()))
+
+    def current_version(self):
+        self.refresh()
+        return self.version
+
+    def get(self, code, variant):
+        self.refresh()
+        return self.models[variant].get(code)
+
+    def is_installed(self, code, variant=None):
+        self.refresh()
+        if variant is not None:
+            return code in self.models[variant]
+        return any(code in models for models in self.models.values())
+
+    def installed_variants(self, code):
+        self.refresh()
+        return [variant for variant, models in self.models.items() if code in models]
+
+    def installed_languages(self, variant=None):
+        self.refresh()
+        if variant is not None:
+            return set(self.models[variant])
+        return set().union(*self.models.values())
+
+    def missing_languages(self, language, variant):
+        # The languages of a 'eng+jpn' setting that are not installed in the variant
+        self.refresh()
+        return [code for code in language.split('+') if code and code not in self.models[variant]]
+
+    def sha256(self, code, variant):
+        model = self.get(code, variant)
+        if model is None:
+            return None
+        key = (model.path, model.size, model.mtime_ns)
+        if key not in self.hashes:
+            self.hashes[key] = file_sha256(model.path)
+        return self.hashes[key]
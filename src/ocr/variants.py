@@ -0,0 +1,55 @@
+# Standard libraries
+from pathlib import Path
+
+# Third-party library
+from loguru import logger
+
+# Custom library
+from src.ocr.tessdata_index import TessdataIndex
+
+# tessdata_best models are installed in the tessdata folder itself, as before, and the faster
+# integer tessdata_fast models in a subfolder, so both variants of a language can be installed
+VARIANTS = ('best', 'fast')
+TESSDATA_FOLDER = Path('./tessdata')
+VARIANT_FOLDERS = {
+    'best': TESSDATA_FOLDER,
+    'fast': TESSDATA_FOLDER / 'fast',
+}
+# Variants whose models include the legacy engine needed by --oem 0 and 2, tessdata_best and tessdata_fast are LSTM only
+LEGACY_ENGINE_VARIANTS = frozenset()
+
+# Shared by the OCR, the Settings window and the translation table, see TessdataWatcher for the folder watching
+tessdata_index = TessdataIndex(VARIANT_FOLDERS)
+
+
+def tessdata_folder(variant):
+    return VARIANT_FOLDERS[variant]
+
+
+def model_path(language_code, variant):
+    return tessdata_folder(variant) / f'{language_code}.traineddata'
+
+
+def installed_variants(language_code):
+    return tessdata_index.installed_variants(language_code)
+
+
+def is_language_installed(language_code, variant=None):
+    return tessdata_index.is_installed(language_code, variant)
+
+
+def resolve_variant(language, preferred):
+    """
+    Returns the variant used to recognize a language such as 'eng+jpn'.
+
+    The preferred variant is used when every language is installed in it, otherwise
+    the other variant when it has every language, so a language that was only
+    downloaded in one variant keeps working.
+    """
+    candidates = [preferred] + [variant for variant in VARIANTS if variant != preferred]
+    for variant in candidates:
+        if not tessdata_index.missing_languages(language, variant):
+            if variant != preferred:
+                logger.warning(f"'{language}' is not installed in the {preferred} variant, using the {variant} models")
+            return variant
+    return preferred
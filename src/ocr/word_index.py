@@ -0,0 +1,88 @@
+# Standard libraries
+from collections import defaultdict
+
+# Third-party libraries
+from loguru import logger
+
+
+class WordBoxIndex:
+    """
+    Grid bucket index of the word boxes recognized in a full-screen frame.
+
+    Word boxes are stored in global screen coordinates so that a selection rectangle
+    can be answered directly by looking up the buckets it overlaps.
+    """
+
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.words = []
+        self.buckets = defaultdict(list)
+
+    def __len__(self):
+        return len(self.words)
+
+    def add_word(self, word):
+        index = len(self.words)
+        self.words.append(word)
+        for cell in self.cells_in_rect(word['left'], word['top'], word['width'], word['height']):
+            self.buckets[cell].append(index)
+
+    def cells_in_rect(self, x, y, width, height):
+        first_column, first_row = int(x // self.cell_size), int(y // self.cell_size)
+        last_column, last_row = int((x + width) // self.cell_size), int((y + height) // self.cell_size)
+        return [(column, row) for column in range(first_column, last_column + 1) for row in range(first_row, last_row + 1)]
+
+    def query(self, x, y, width, height):
+        # A word belongs to the selection when its center lies inside the selected rectangle
+        candidates = set()
+        for cell in self.cells_in_rect(x, y, width, height):
+            candidates.update(self.buckets.get(cell, ()))
+
+        selected = []
+        for index in sorted(candidates):
+            word = self.words[index]
+            center_x = word['left'] + word['width'] / 2
+            center_y = word['top'] + word['height'] / 2
+            if x <= center_x < x + width and y <= center_y < y + height:
+                selected.append(word)
+        return selected
+
+
+def build_word_index(ocr_data, origin_x=0, origin_y=0, device_pixel_ratio=1.0, cell_size=128, word_index=None):
+    """
+    Builds a WordBoxIndex from a pytesseract image_to_data dictionary.
+
+    Image pixel coordinates are converted to global logical screen coordinates
+    using the origin and the device pixel ratio of the captured screen. Pass an
+    existing word_index to add the words of another screen to it.
+    """
+    word_index = word_index if word_index is not None else WordBoxIndex(cell_size)
+    for i, text in enumerate(ocr_data['text']):
+        confidence = float(ocr_data['conf'][i])
+        if confidence < 0 or not str(text).strip():
+            continue
+        word_index.add_word({
+            'text': str(text),
+            'conf': confidence,
+            'left': origin_x + ocr_data['left'][i] / device_pixel_ratio,
+            'top': origin_y + ocr_data['top'][i] / device_pixel_ratio,
+            'width': ocr_data['width'][i] / device_pixel_ratio,
+            'height': ocr_data['height'][i] / device_pixel_ratio,
+            'line': (origin_x, origin_y, ocr_data['block_num'][i], ocr_data['par_num'][i], ocr_data['line_num'][i])
+        })
+    logger.info(f"Word box index built with {len(word_index)} words")
+    return word_index
+
+
+def words_to_text(words):
+    # Group the words by their Tesseract line, then order the lines top to bottom and the words left to right
+    lines = defaultdict(list)
+    for word in words:
+        lines[word['line']].append(word)
+    sorted_lines = sorted(lines.values(), key=lambda line_words: min(word['top'] for word in line_words))
+    return "\n".join(" ".join(word['text'] for word in sorted(line_words, key=lambda word: word['left']))
+                     for line_words in sorted_lines)
+
+
+def mean_confidence(words):
+    return sum(word['conf'] for word in words) / len(words) if words else 0.0
@@ -0,0 +1,371 @@
+"""
+Local OCR HTTP service, for other services that call the same pipeline as the application.
+
+    python -m src.service.server [--host 127.0.0.1] [--port 8765] [--workers 2] [--max-queue 8]
+
+Endpoints:
+    POST /ocr?profile=<name>  The image as the request body, or as the 'image' field of a multipart
+                              form with an optional 'profile' field. Returns the text, the word boxes,
+                              the confidences and the stage timings as JSON.
+    GET  /health              Tesseract and worker pool status.
+    GET  /metrics             Counters, gauges and latencies in the Prometheus text format.
+
+At most workers images are recognized at the same time and max_queue more wait for a worker.
+Requests beyond that are rejected with 429 and a Retry-After header as soon as their headers
+arrive, without reading the upload, and the connection is closed. Clients that send
+'Expect: 100-continue' only upload the image once the request is accepted. Every response carries
+the X-Queue-Depth and X-Queue-Limit headers, so callers can slow down before they are rejected.
+"""
+
+# Standard libraries
+import argparse
+import asyncio
+import json
+import math
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from email.parser import BytesParser
+from email.policy import HTTP
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+# Third-party library
+from loguru import logger
+
+# Custom libraries
+from src.config.config import load_config
+from src.config.model import get_execution_plan
+from src.core import ocr
+
+MAX_HEADER_LINES = 100
+KEEP_ALIVE_TIMEOUT = 15
+UPLOAD_TIMEOUT = 60
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+STAGES = ('load', 'preprocess', 'recognize', 'layout', 'total')
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass(slots=True)
+class Request:
+    method: str
+    path: str
+    query: dict
+    headers: dict  # Lower case names
+    content_length: int
+    keep_alive: bool
+    body: bytes = b""  # Read by read_body once the request is accepted
+
+
+async def read_request(reader, max_body_size):
+    # Reads the request line and the headers, returns None when the client closed the connection between two requests
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, target, version = request_line.decode('latin-1').split()
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Too many headers")
+
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        raise HTTPError(HTTPStatus.LENGTH_REQUIRED, "Chunked uploads are not supported, send a Content-Length")
+    try:
+        content_length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+    if content_length < 0:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+    if content_length > max_body_size:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Uploads are limited to {max_body_size} bytes")
+    if headers.get('expect', '100-continue').lower() != '100-continue':
+        raise HTTPError(HTTPStatus.EXPECTATION_FAILED, f"Unsupported expectation '{headers['expect']}'")
+
+    connection = headers.get('connection', '').lower()
+    keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+    url = urlsplit(target)
+    query = {key: values[0] for key, values in parse_qs(url.query).items()}
+    return Request(method.upper(), url.path, query, headers, content_length, keep_alive)
+
+
+async def read_body(reader, writer, request):
+    # A client waiting for 100 Continue sends the body only after the interim response
+    if not request.content_length:
+        return
+    if request.headers.get('expect', '').lower() == '100-continue':
+        writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+        await writer.drain()
+    request.body = await asyncio.wait_for(reader.readexactly(request.content_length), UPLOAD_TIMEOUT)
+
+
+def parse_multipart(content_type, body):
+    # Form fields by name, the values are bytes
+    message = BytesParser(policy=HTTP).parsebytes(f"Content-Type: {content_type}\r\n\r\n".encode('latin-1') + body)
+    if not message.is_multipart():
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid multipart body")
+    return {part.get_param('name', header='content-disposition'): part.get_payload(decode=True) for part in message.iter_parts()}
+
+
+def run_ocr(image, profile):
+    # Runs in a worker thread, returns the status and the JSON response
+    from pytesseract import TesseractError
+
+    try:
+        return HTTPStatus.OK, ocr(image, profile).to_dict()
+    except FileNotFoundError as e:
+        return HTTPStatus.SERVICE_UNAVAILABLE, {'error': str(e)}
+    except TesseractError as e:
+        return HTTPStatus.UNPROCESSABLE_ENTITY, {'error': f"Tesseract could not read the image: {e.message}"}
+    except Exception as e:
+        logger.error(f"An error occurred while recognizing an uploaded image: {e}")
+        return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(e)}
+
+
+class OCRService:
+    """
+    HTTP/1.1 server on asyncio streams, the recognition runs in a bounded thread pool.
+
+    The event loop only parses requests and counts, Tesseract runs as a subprocess of a
+    worker thread. The counters are only changed from the event loop.
+    """
+
+    def __init__(self, workers=2, max_queue=8, max_body_size=20 * 1024 * 1024):
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.max_body_size = max_body_size
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='service-ocr')
+        self.routes = {
+            ('POST', '/ocr'): self.handle_ocr,
+            ('GET', '/health'): self.handle_health,
+            ('GET', '/metrics'): self.handle_metrics,
+        }
+
+        self.pending = 0  # Accepted OCR requests, uploading, running or waiting for a worker
+        self.responses = Counter()  # (path, status) -> count
+        self.rejected = 0
+        self.latency_buckets = Counter()  # Upper bound -> count, cumulative when exported
+        self.latency_seconds = 0.0
+        self.stage_seconds = Counter()  # Stage -> total seconds of the successful requests
+        self.recognized = 0
+        self.started_at = time.time()
+
+    @property
+    def capacity(self):
+        return self.workers + self.max_queue
+
+    @property
+    def queue_depth(self):
+        return max(0, self.pending - self.workers)
+
+    def queue_headers(self):
+        return {'X-Queue-Depth': str(self.queue_depth), 'X-Queue-Limit': str(self.max_queue)}
+
+    def retry_after(self):
+        # Seconds until a worker is probably free, from the mean recognition time
+        mean_seconds = self.stage_seconds['total'] / self.recognized if self.recognized else 1.0
+        return max(1, math.ceil(mean_seconds * (self.queue_depth + 1) / self.workers))
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(read_request(reader, self.max_body_size), KEEP_ALIVE_TIMEOUT)
+                except HTTPError as e:
+                    # The rest of the request is not read, the connection cannot be reused
+                    await self.write_response(writer, '', e.status, {'error': str(e)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                rejection = self.admit(request)
+                if rejection is not None:
+                    # The upload is never read, the connection cannot be reused
+                    status, response, headers = rejection
+                    await self.write_response(writer, request.path, status, response, headers, keep_alive=False)
+                    break
+                admitted = (request.method, request.path) == ('POST', '/ocr')
+                try:
+                    await read_body(reader, writer, request)
+                    status, response, headers = await self.dispatch(request)
+                finally:
+                    if admitted:
+                        self.pending -= 1
+                await self.write_response(writer, request.path, status, response, headers, request.keep_alive)
+                if not request.keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def admit(self, request):
+        """
+        Takes a slot for an OCR request from its headers, before its upload is read.
+
+        Returns the 429 response when the workers and the queue are full, None otherwise. Shedding load
+        must stay cheap, so a rejected upload is neither buffered nor parsed.
+        """
+        if (request.method, request.path) != ('POST', '/ocr'):
+            return None
+        if self.pending >= self.capacity:
+            self.rejected += 1
+            return HTTPStatus.TOO_MANY_REQUESTS, {'error': "The OCR queue is full"}, {'Retry-After': str(self.retry_after())}
+        self.pending += 1
+        return None
+
+    async def dispatch(self, request):
+        route = self.routes.get((request.method, request.path))
+        if route is None:
+            allowed = [method for method, path in self.routes if path == request.path]
+            if allowed:
+                return HTTPStatus.METHOD_NOT_ALLOWED, {'error': f"Use {', '.join(allowed)}"}, {'Allow': ', '.join(allowed)}
+            return HTTPStatus.NOT_FOUND, {'error': f"Unknown path {request.path}"}, {}
+        try:
+            return await route(request)
+        except HTTPError as e:
+            return e.status, {'error': str(e)}, {}
+
+    async def write_response(self, writer, path, status, response, headers=None, keep_alive=True):
+        if isinstance(response, str):
+            body, content_type = response.encode('utf-8'), 'text/plain; version=0.0.4; charset=utf-8'
+        else:
+            body, content_type = json.dumps(response, ensure_ascii=False).encode('utf-8'), 'application/json'
+        all_headers = {
+            'Content-Type': content_type,
+            'Content-Length': str(len(body)),
+            'Connection': 'keep-alive' if keep_alive else 'close',
+            **self.queue_headers(),
+            **(headers or {}),
+        }
+        head = f"HTTP/1.1 {status.value} {status.phrase}\r\n" + "".join(f"{name}: {value}\r\n" for name, value in all_headers.items())
+        writer.write(head.encode('latin-1') + b"\r\n" + body)
+        await writer.drain()
+        self.responses[(path if path in {route_path for _, route_path in self.routes} else 'other', status.value)] += 1
+
+    def read_upload(self, request):
+        profile = request.query.get('profile') or request.headers.get('x-ocr-profile') or None
+        image = request.body
+        content_type = request.headers.get('content-type', '')
+        if content_type.lower().startswith('multipart/form-data'):
+            fields = parse_multipart(content_type, request.body)
+            image = fields.get('image')
+            if fields.get('profile'):
+                profile = fields['profile'].decode('utf-8')
+        if not image:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "No image, send it as the body or as the 'image' form field")
+
+        profiles = load_config()['profiles']
+        if profile is not None and (profile == 'active_profile' or not hasattr(profiles.get(profile), 'items')):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Unknown profile '{profile}'")
+        return image, profile
+
+    async def handle_ocr(self, request):
+        # The slot of the request was taken by admit and is released when the response is ready
+        image, profile = self.read_upload(request)
+
+        start_time = time.perf_counter()
+        status, response = await asyncio.get_running_loop().run_in_executor(self.executor, run_ocr, image, profile)
+
+        elapsed = time.perf_counter() - start_time
+        self.latency_buckets[next((bucket for bucket in LATENCY_BUCKETS if elapsed <= bucket), math.inf)] += 1
+        self.latency_seconds += elapsed
+        if status == HTTPStatus.OK:
+            self.recognized += 1
+            response['timings']['queued'] = max(0.0, elapsed * 1000 - response['timings']['total'])
+            for stage in STAGES:
+                self.stage_seconds[stage] += response['timings'][stage] / 1000
+        return status, response, {}
+
+    async def handle_health(self, request):
+        plan = get_execution_plan()
+        healthy = plan.tesseract_path is not None
+        response = {
+            'status': 'ok' if healthy else 'unavailable',
+            'tesseract': plan.capabilities.version if plan.capabilities else None,
+            'model_variant': plan.model_variant,
+            'missing_languages': list(plan.missing_languages),
+            'workers': self.workers,
+            'in_flight': min(self.pending, self.workers),
+            'queue_depth': self.queue_depth,
+            'uptime_seconds': round(time.time() - self.started_at, 1),
+        }
+        return HTTPStatus.OK if healthy else HTTPStatus.SERVICE_UNAVAILABLE, response, {}
+
+    async def handle_metrics(self, request):
+        lines = [
+            "# TYPE pytextractocr_requests_total counter",
+            *(f'pytextractocr_requests_total{{path="{path}",status="{status}"}} {count}'
+              for (path, status), count in sorted(self.responses.items())),
+            "# TYPE pytextractocr_rejected_total counter",
+            f"pytextractocr_rejected_total {self.rejected}",
+            "# TYPE pytextractocr_workers gauge",
+            f"pytextractocr_workers {self.workers}",
+            "# TYPE pytextractocr_in_flight gauge",
+            f"pytextractocr_in_flight {min(self.pending, self.workers)}",
+            "# TYPE pytextractocr_queue_depth gauge",
+            f"pytextractocr_queue_depth {self.queue_depth}",
+            "# TYPE pytextractocr_ocr_request_seconds histogram",
+        ]
+        cumulative = 0
+        for bucket in LATENCY_BUCKETS + (math.inf,):
+            cumulative += self.latency_buckets[bucket]
+            lines.append(f'pytextractocr_ocr_request_seconds_bucket{{le="{"+Inf" if bucket == math.inf else bucket}"}} {cumulative}')
+        lines.append(f"pytextractocr_ocr_request_seconds_sum {self.latency_seconds:.6f}")
+        lines.append(f"pytextractocr_ocr_request_seconds_count {cumulative}")
+        lines.append("# TYPE pytextractocr_ocr_stage_seconds_total counter")
+        lines.extend(f'pytextractocr_ocr_stage_seconds_total{{stage="{stage}"}} {self.stage_seconds[stage]:.6f}' for stage in STAGES)
+        lines.append("# TYPE pytextractocr_ocr_recognized_total counter")
+        lines.append(f"pytextractocr_ocr_recognized_total {self.recognized}")
+        return HTTPStatus.OK, "\n".join(lines) + "\n", {}
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        addresses = ", ".join(f"{socket.getsockname()[0]}:{socket.getsockname()[1]}" for socket in server.sockets)
+        logger.success(f"OCR service listening on {addresses} - Workers: {self.workers} | Queue: {self.max_queue}")
+        async with server:
+            await server.serve_forever()
+
+
+def limit_openmp_threads(workers):
+    # Tesseract built with OpenMP uses every core per image, concurrent images would oversubscribe the CPU
+    if 'OMP_THREAD_LIMIT' not in os.environ:
+        os.environ['OMP_THREAD_LIMIT'] = str(max(1, (os.cpu_count() or 1) // workers))
+
+
+def main():
+    service_config = load_config()['service']
+    parser = argparse.ArgumentParser(description="PyTextractOCR HTTP service")
+    parser.add_argument('--host', default=service_config['host'])
+    parser.add_argument('--port', type=int, default=service_config['port'])
+    parser.add_argument('--workers', type=int, default=service_config['workers'], help="Images recognized at the same time")
+    parser.add_argument('--max-queue', type=int, default=service_config['max_queue'], help="Images waiting for a worker before 429")
+    parser.add_argument('--max-upload-bytes', type=int, default=service_config['max_upload_bytes'])
+    args = parser.parse_args()
+
+    limit_openmp_threads(max(1, args.workers))
+    service = OCRService(args.workers, args.max_queue, args.max_upload_bytes)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        logger.info("OCR service stopped")
+    finally:
+        service.executor.shutdown(wait=False, cancel_futures=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,33 +2,46 @@
 import os
 import shutil
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 # Third-party libraries
 from loguru import logger
-from PIL import ImageGrab
-from playsound import playsound, PlaysoundException  # Use version 1.2.2
-from PySide6.QtCore import Qt, QRect, QTimer
-from PySide6.QtGui import QPainter, QColor, QPixmap, QCursor, QPen, QGuiApplication
+from PySide6.QtCore import Qt, QRect, QTimer, QThread, Signal
+from PySide6.QtGui import QPainter, QColor, QImage, QPixmap, QCursor, QPen, QGuiApplication
 from PySide6.QtWidgets import QMainWindow, QApplication, QLabel, QVBoxLayout, QWidget
 
 # Custom libraries
-from src.config.config import load_config
-from src.ocr.ocr_processor import perform_ocr
+from src.config.config import config_store, load_config
+from src.ocr.ocr_processor import finalize_area_texts, perform_full_frame_ocr, perform_ocr
+from src.ocr.word_index import build_word_index, mean_confidence, words_to_text
 from src.ui.ocr_text import OCRTextUI
+from src.utils.history import capture_history
 from src.utils.message_box import show_message_box
 from src.utils.translate import translate_text
+from src.utils.translation_backends import translation_time_limit
+
+# Time added to the translation time limit for the cache lookups and the worker thread start
+TRANSLATION_GRACE_MS = 1000
 
 
 class ImageLabel(QLabel):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, selection_source=None):
         super().__init__(parent)
 
+        # Every screen has its own overlay label, the selection state lives in the label of the primary overlay
+        # and the labels of the other screens mirror it. Positions are in global logical screen coordinates
+        self.selection_source = selection_source or self
+        self.mirror_labels = []
+        self.screen_geometry = QRect()
+
         self.previous_pos = None
         self.start_pos = None
         self.end_pos = None
         self.selection_area = None
+        self.batch_areas = []
         self.capture_mode = False
         self.start_capture_mode = False
 
@@ -43,6 +56,10 @@ class ImageLabel(QLabel):
         self.timer.timeout.connect(self.check_mouse_movement)
 
     def mousePressEvent(self, event):
+        if self.selection_source is not self:
+            self.selection_source.mousePressEvent(event)
+            return
+
         if event.buttons() & Qt.LeftButton:
             self.handle_left_button_event()
 
@@ -58,18 +75,18 @@ class ImageLabel(QLabel):
     def handle_right_button_event(self):
         self.capture_mode = False
         self.selection_area = QRect()
-        self.label_dimensions.hide()
+        self.hide_label_dimensions()
         self.timer.stop()
-        self.update()
+        self.update_overlays()
 
     def initiate_capture_mode(self):
         self.start_pos = QCursor.pos()
         self.selection_area = QRect(self.start_pos, self.start_pos)
-        self.label_dimensions.hide()
+        self.hide_label_dimensions()
         self.start_capture_mode = False
         self.capture_mode = True
         self.timer.start(10)
-        self.update()
+        self.update_overlays()
 
     def update_capture_mode(self):
         if not (self.start_pos.x() == self.end_pos.x() and self.start_pos.y() == self.end_pos.y()):
@@ -78,12 +95,29 @@ class ImageLabel(QLabel):
 
     def paintEvent(self, event):
         super().paintEvent(event)
-        if self.selection_area:
+        source = self.selection_source
+        offset_x, offset_y = -self.screen_geometry.x(), -self.screen_geometry.y()
+        if source.batch_areas:
+            painter = QPainter(self)
+            painter.setPen(QPen(QColor(255, 196, 0, 255), 1, Qt.DashLine))
+            for batch_area in source.batch_areas:
+                painter.drawRect(batch_area.translated(offset_x, offset_y))
+            painter.end()
+        if source.selection_area:
             painter = QPainter(self)
             border_color = QColor(117, 255, 255, 255)
             border_width = 1
             painter.setPen(QPen(border_color, border_width, Qt.SolidLine))
-            painter.drawRect(self.selection_area)
+            painter.drawRect(source.selection_area.translated(offset_x, offset_y))
+
+    def update_overlays(self):
+        self.update()
+        for mirror_label in self.mirror_labels:
+            mirror_label.update()
+
+    def hide_label_dimensions(self):
+        for label in [self] + self.mirror_labels:
+            label.label_dimensions.hide()
 
     def check_mouse_movement(self):
         self.end_pos = QCursor.pos()
@@ -93,22 +127,32 @@ class ImageLabel(QLabel):
 
             width = abs(self.start_pos.x() - self.end_pos.x()) + 1
             height = abs(self.start_pos.y() - self.end_pos.y()) + 1
-            self.label_dimensions.setText(f"{width} x {height}")
-            self.update_label_position()
-            self.update()
-
-    def update_label_position(self):
-        label_width = self.label_dimensions.sizeHint().width() + 8  # Auto-adjust label width based on text length
-        label_height = self.label_dimensions.height()
-        screen_resolution = QGuiApplication.primaryScreen().geometry()
+            self.update_label_position(f"{width} x {height}")
+            self.update_overlays()
+
+    def update_label_position(self, dimensions_text):
+        # Show the dimensions label on the overlay of the screen under the cursor and clamp it to that screen
+        target_label = self
+        for label in [self] + self.mirror_labels:
+            if label.screen_geometry.contains(self.end_pos):
+                target_label = label
+            else:
+                label.label_dimensions.hide()
+        label_dimensions = target_label.label_dimensions
+        label_dimensions.setText(dimensions_text)
+
+        label_width = label_dimensions.sizeHint().width() + 8  # Auto-adjust label width based on text length
+        label_height = label_dimensions.height()
+        screen_resolution = target_label.screen_geometry
         screen_width, screen_height = screen_resolution.width(), screen_resolution.height()
+        end_x, end_y = self.end_pos.x() - screen_resolution.x(), self.end_pos.y() - screen_resolution.y()
         # Determine the direction of mouse movement
         moving_right = self.end_pos.x() > self.start_pos.x()
         moving_down = self.end_pos.y() > self.start_pos.y()
         # Adjust label position based on mouse movement direction
         # Adjust the offsets (10 and 5) to control the spacing around the label, increase these values to add more space
-        label_x = self.end_pos.x() + 10 if moving_right else self.end_pos.x() - label_width - 5
-        label_y = self.end_pos.y() + 10 if moving_down else self.end_pos.y() - label_height - 5
+        label_x = end_x + 10 if moving_right else end_x - label_width - 5
+        label_y = end_y + 10 if moving_down else end_y - label_height - 5
         # Check if label would exceed screen width
         if label_x + label_width > screen_width:
             label_x = screen_width - label_width
@@ -119,8 +163,79 @@ class ImageLabel(QLabel):
             label_y = screen_height - label_height
         elif label_y < 0:
             label_y = 0
-        self.label_dimensions.setGeometry(label_x, label_y, label_width, label_height)
-        self.label_dimensions.show()
+        label_dimensions.setGeometry(label_x, label_y, label_width, label_height)
+        label_dimensions.show()
+
+
+class ScreenOverlay(QMainWindow):
+    def __init__(self, capture_instance):
+        super().__init__()
+
+        # Overlay for a secondary screen, the mouse and key events are forwarded to the primary FullscreenCapture
+        self.capture_instance = capture_instance
+
+        self.central_widget = QWidget()
+        self.setCentralWidget(self.central_widget)
+
+        self.image_layout = QVBoxLayout(self.central_widget)
+        self.image_layout.setContentsMargins(0, 0, 0, 0)
+
+        self.image_label = ImageLabel(self.central_widget, capture_instance.image_label)
+        self.image_layout.addWidget(self.image_label, alignment=Qt.AlignCenter)
+
+    def mouseReleaseEvent(self, event):
+        self.capture_instance.mouseReleaseEvent(event)
+
+    def keyPressEvent(self, event):
+        self.capture_instance.keyPressEvent(event)
+
+
+class PreOCRWorker(QThread):
+    index_ready_signal = Signal(int, object)
+
+    def __init__(self, frame_id, frame_images, config):
+        super().__init__()
+
+        self.frame_id = frame_id
+        self.frame_images = frame_images  # List of (QImage, origin x, origin y, device pixel ratio), one per screen
+        self.config = config
+
+    def run(self):
+        word_index = None
+        for frame_image, origin_x, origin_y, device_pixel_ratio in self.frame_images:
+            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp:
+                frame_file_name = temp.name
+            try:
+                frame_image.save(frame_file_name)
+                ocr_data = perform_full_frame_ocr(frame_file_name, self.config)
+                word_index = build_word_index(ocr_data, origin_x, origin_y, device_pixel_ratio, word_index=word_index)
+            except Exception as e:
+                logger.error(f"An error occurred during full frame pre-OCR: {e}")
+                return
+            finally:
+                FullscreenCapture.remove_temporary_image(frame_file_name)
+        self.index_ready_signal.emit(self.frame_id, word_index)
+
+
+class TranslateWorker(QThread):
+    translated_signal = Signal(int, object)
+
+    def __init__(self, generation, extracted_text, config):
+        super().__init__()
+
+        self.generation = generation
+        self.extracted_text = extracted_text
+        self.config = config
+
+    def run(self):
+        try:
+            logger.info(f"Translating text using {self.config['translate']['backend']}")
+            translated_text = translate_text(self.extracted_text, self.config)
+            logger.info(f"Translated Text ({translated_text[1]}):\n{translated_text[0]}")
+        except Exception as e:
+            translated_text = None
+            logger.error(f"An error occurred while translating text: {e}")
+        self.translated_signal.emit(self.generation, translated_text)
 
 
 class FullscreenCapture(QMainWindow):
@@ -137,6 +252,27 @@ class FullscreenCapture(QMainWindow):
         self.selection_area = None
         self.start_pos = None
         self.end_pos = None
+        self.frame_id = 0
+        self.word_index = None
+        self.pre_ocr_workers = []
+        self.frozen_frames = []
+        self.screen_overlays = []
+        self.batch_areas = []
+        self.capture_trace = None
+        self.translation_generation = 0
+        self.translate_workers = []
+        self.translation_history_ids = []
+        self.translation_start_time = None
+
+        # A translation that is not received within the time limit of its retries is abandoned
+        self.translation_timer = QTimer(self)
+        self.translation_timer.setSingleShot(True)
+        self.translation_timer.timeout.connect(self.translation_timed_out)
+
+        # The history limits follow the configuration without being re-read on every capture
+        capture_history.configure(load_config())
+        config_store.subscribe(capture_history.configure)
+        QApplication.instance().aboutToQuit.connect(capture_history.remove_spilled_images)
 
         # OCR Text instance
         self.ocr_text_ui = OCRTextUI()
@@ -188,19 +324,89 @@ class FullscreenCapture(QMainWindow):
         self.close()
         self.main_ui_instance.show_main_ui()
 
+    def closeEvent(self, event):
+        for screen_overlay in self.screen_overlays:
+            screen_overlay.close()
+        super().closeEvent(event)
+
     def get_fullscreen_capture(self):
-        screen = QApplication.primaryScreen()
-        screenshot = screen.grabWindow(0)
-        pixmap = QPixmap(screenshot)
+        # Every screen is grabbed by its own overlay at its own device pixel ratio, instead of one virtual desktop sized image
+        primary_screen = QApplication.primaryScreen()
+        secondary_screens = [screen for screen in QApplication.screens() if screen is not primary_screen]
+        while len(self.screen_overlays) < len(secondary_screens):
+            self.screen_overlays.append(ScreenOverlay(self))
+
+        self.frozen_frames = []
+        self.batch_areas = []
+        self.image_label.batch_areas = []
+        self.image_label.mirror_labels = [screen_overlay.image_label for screen_overlay in self.screen_overlays[:len(secondary_screens)]]
+
+        self.show_frozen_frame(self, primary_screen)
+        for screen_overlay, screen in zip(self.screen_overlays, secondary_screens):
+            self.show_frozen_frame(screen_overlay, screen)
+        if self.capture_trace:
+            self.capture_trace.start_user_wait()
+
+        self.start_pre_ocr()
+
+    def show_frozen_frame(self, overlay, screen):
+        pixmap = QPixmap(screen.grabWindow(0))
+        screen_geometry = screen.geometry()
+        self.frozen_frames.append((screen_geometry, pixmap))
+
+        # Display pixmap without margins or borders, the label is sized in logical pixels
+        overlay.image_label.screen_geometry = screen_geometry
+        overlay.image_label.setPixmap(pixmap)
+        overlay.image_label.setFixedSize(pixmap.deviceIndependentSize().toSize())
+
+        overlay.image_label.label_dimensions.hide()
+        overlay.setWindowFlags(Qt.WindowStaysOnTopHint | Qt.FramelessWindowHint)
+        overlay.setScreen(screen)
+        overlay.move(screen_geometry.topLeft())
+        overlay.showFullScreen()
+        overlay.setCursor(self.crosshair_cursor)
+
+    def start_pre_ocr(self):
+        # The frame is frozen while the overlay is shown, OCR it in the background so selections can be answered from the word index
+        self.frame_id += 1
+        self.word_index = None
+        self.config = load_config()
+        if not self.config['ocr']['enable_pre_ocr']:
+            return
+
+        frame_images = [(pixmap.toImage(), screen_geometry.x(), screen_geometry.y(), pixmap.devicePixelRatio())
+                        for screen_geometry, pixmap in self.frozen_frames]
+        worker = PreOCRWorker(self.frame_id, frame_images, self.config)
+        worker.index_ready_signal.connect(self.pre_ocr_index_ready)
+        worker.finished.connect(self.pre_ocr_thread_finished)
+        self.pre_ocr_workers.append(worker)
+        worker.start()
+        logger.info(f"Full frame pre-OCR started for frame {self.frame_id}")
+
+    def pre_ocr_index_ready(self, frame_id, word_index):
+        if frame_id != self.frame_id:
+            logger.info(f"Discarding pre-OCR word index of an old frame {frame_id}")
+            return
+        self.word_index = word_index
+        logger.success(f"Full frame pre-OCR completed for frame {frame_id}")
 
-        # Display pixmap without margins or borders
-        self.image_label.setPixmap(pixmap)
-        self.image_label.setFixedSize(pixmap.size())
+    def pre_ocr_thread_finished(self):
+        self.pre_ocr_workers = [worker for worker in self.pre_ocr_workers if worker.isRunning()]
 
-        self.image_label.label_dimensions.hide()
-        self.setWindowFlags(Qt.WindowStaysOnTopHint | Qt.FramelessWindowHint)
-        self.showFullScreen()
-        self.setCursor(self.crosshair_cursor)
+    def get_indexed_words(self, x, y, width, height):
+        # Returns None when the background pass has not finished or the confidence is too low, region OCR is used instead
+        if self.word_index is None:
+            logger.info("Pre-OCR word index is not ready, using region OCR")
+            return None
+
+        words = self.word_index.query(x, y, width, height)
+        confidence = mean_confidence(words)
+        if not words or confidence < self.config['ocr']['pre_ocr_min_confidence']:
+            logger.info(f"Pre-OCR confidence is too low ({confidence:.1f}), using region OCR")
+            return None
+
+        logger.success(f"Selection answered from pre-OCR word index: {len(words)} words, confidence {confidence:.1f}")
+        return words
 
     def mouseReleaseEvent(self, event):
         if event.button() == Qt.LeftButton:
@@ -215,7 +421,15 @@ class FullscreenCapture(QMainWindow):
             self.image_label.selection_area = None
             self.image_label.start_pos = None
             self.image_label.end_pos = None
+            self.batch_areas = []
+            self.image_label.batch_areas = []
+            self.capture_trace = None
             self.close_fullscreen_show_main()
+        elif event.key() in (Qt.Key_Return, Qt.Key_Enter) and self.batch_areas:
+            # Submit the rectangles collected with shift-select without adding another one
+            self.image_label.timer.stop()
+            self.image_label.capture_mode = False
+            self.submit_selected_areas([])
 
     def process_selected_area(self):
         if (self.image_label.start_pos.x() == self.image_label.end_pos.x() and self.image_label.start_pos.y() == self.image_label.end_pos.y()
@@ -224,16 +438,70 @@ class FullscreenCapture(QMainWindow):
             self.image_label.end_pos = None
             return
 
+        selected_area = self.calculate_selected_area()
+        if QGuiApplication.keyboardModifiers() & Qt.ShiftModifier:
+            # Shift-select adds the rectangle to the batch and keeps the overlay open for the next one
+            self.batch_areas.append(selected_area)
+            self.image_label.batch_areas.append(QRect(*selected_area))
+            self.image_label.selection_area = None
+            self.image_label.start_pos = None
+            self.image_label.end_pos = None
+            self.image_label.hide_label_dimensions()
+            self.image_label.update_overlays()
+            logger.info(f"Selected area added to batch: {len(self.batch_areas)} area(s)")
+            return
+
+        self.submit_selected_areas([selected_area])
+
+    def submit_selected_areas(self, selected_areas):
+        areas = self.batch_areas + selected_areas
+        self.batch_areas = []
+        self.image_label.batch_areas = []
+        if self.capture_trace:
+            self.capture_trace.end_user_wait()
         try:
             self.close()
-            x, y, width, height = self.calculate_selected_area()
-            self.capture_selected_area(x, y, width, height)
+            self.capture_selected_areas(areas)
             self.image_label.selection_area = None
             self.image_label.start_pos = None
             self.image_label.end_pos = None
         except ValueError as e:
             show_message_box("Critical", "Error", str(e))
 
+    def crop_frozen_frame(self, x, y, width, height):
+        # Crop the selected area only from the frozen frames of the screens it intersects.
+        # The pixmaps are in device pixels while the selection is in global logical pixels
+        selected_rect = QRect(x, y, width, height)
+        pieces = []
+        for screen_geometry, pixmap in self.frozen_frames:
+            intersection = selected_rect.intersected(screen_geometry)
+            if intersection.isEmpty():
+                continue
+            ratio = pixmap.devicePixelRatio()
+            local_rect = intersection.translated(-screen_geometry.x(), -screen_geometry.y())
+            device_rect = QRect(round(local_rect.x() * ratio), round(local_rect.y() * ratio),
+                                round(local_rect.width() * ratio), round(local_rect.height() * ratio))
+            pieces.append((intersection, pixmap.copy(device_rect).toImage()))
+
+        if not pieces:
+            raise ValueError("The selected area is outside of the captured screens.")
+        if len(pieces) == 1:
+            return pieces[0][1]
+
+        # The selection spans several screens, compose the pieces at the highest device pixel ratio
+        ratio = max(image.width() / intersection.width() for intersection, image in pieces)
+        composite = QImage(round(width * ratio), round(height * ratio), QImage.Format_RGB32)
+        composite.fill(Qt.black)
+        painter = QPainter(composite)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        for intersection, image in pieces:
+            target_rect = QRect(round((intersection.x() - x) * ratio), round((intersection.y() - y) * ratio),
+                                round(intersection.width() * ratio), round(intersection.height() * ratio))
+            painter.drawImage(target_rect, image)
+        painter.end()
+        logger.info(f"Selected area composed from {len(pieces)} screens")
+        return composite
+
     def calculate_selected_area(self):
         x = min(self.image_label.start_pos.x(), self.image_label.end_pos.x())
         y = min(self.image_label.start_pos.y(), self.image_label.end_pos.y())
@@ -242,30 +510,65 @@ class FullscreenCapture(QMainWindow):
         logger.info(f"Selected area: x: {x}, y: {y}, width: {width}, height: {height}")
         return x, y, width, height
 
-    def capture_selected_area(self, x, y, width, height):
+    def capture_selected_areas(self, areas):
         self.config = load_config()
         current_datetime = self.get_current_datetime()
         output_folder = self.get_output_folder_path()
 
-        # Get a capture of the selected area
-        capture_area = ImageGrab.grab(bbox=(x, y, x + width, y + height))
-
-        if self.config['output']['save_captured_image']:
-            try:
-                capture_file_name = current_datetime + ".png"
-                capture_area.save(output_folder / capture_file_name)
+        temporary_file_names = []
+        for number, (x, y, width, height) in enumerate(areas, start=1):
+            # Get a capture of the selected area from the frozen frame
+            capture_area = self.crop_frozen_frame(x, y, width, height)
+            area_datetime = current_datetime if len(areas) == 1 else f"{current_datetime}_{number}"
+
+            if self.config['output']['save_captured_image']:
+                capture_file_name = area_datetime + ".png"
+                if not capture_area.save(str(output_folder / capture_file_name)):
+                    self.close_fullscreen_show_main()
+                    logger.error(f"An error occurred while capturing '{capture_file_name}'")
+                    raise ValueError(f"Failed to create a capture file in '{output_folder}'")
                 logger.success(f"Captured image saved: {output_folder}\\{capture_file_name}")
-            except Exception as e:
-                self.close_fullscreen_show_main()
-                logger.error(f"An error occurred while capturing {e}")
-                raise ValueError(f"Failed to create a capture file in '{output_folder}'")
 
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp:
-            temporary_file_name = temp.name
+            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp:
+                temporary_file_name = temp.name
             capture_area.save(temporary_file_name)
+            temporary_file_names.append((temporary_file_name, area_datetime))
             logger.success(f"Captured image saved as temporary file: {temporary_file_name}")
 
-        self.start_perform_ocr(temporary_file_name, current_datetime, False)
+        # Keep the captured images before the preprocessing overwrites the temporary files
+        captured_images = [Path(file_name).read_bytes() for file_name, _ in temporary_file_names] if self.config['history']['enable_history'] else []
+
+        # Every area is cropped from the same frozen frame, so they can be recognized in parallel
+        with ThreadPoolExecutor(max_workers=min(len(areas), os.cpu_count() or 1)) as executor:
+            results = list(executor.map(self.recognize_area, areas, [file_name for file_name, _ in temporary_file_names]))
+        texts = [text for text, _ in results]
+
+        self.extracted_text = finalize_area_texts(texts, self.config)
+        if self.capture_trace:
+            self.capture_trace.mark('ocr_completed')
+        self.cancel_translation()
+        history_entries = [self.add_to_history(area_datetime, captured_image, text, word_boxes) for captured_image, (file_name, area_datetime),
+                           (text, word_boxes) in zip(captured_images, temporary_file_names, results)]
+        for file_name, area_datetime in temporary_file_names:
+            self.save_or_remove_temporary_image(file_name, area_datetime)
+        self.play_sound_file()
+        self.close_fullscreen_show_main()
+        self.show_ocr_text_ui()
+        self.start_translation(history_entries)
+        if self.capture_trace:
+            self.capture_trace.finish('text_displayed')
+            self.capture_trace = None
+
+    def recognize_area(self, area, file_name):
+        indexed_words = self.get_indexed_words(*area)
+        if indexed_words:
+            return words_to_text(indexed_words), indexed_words
+        return perform_ocr(file_name, self.config, clipboard=False), []
+
+    def add_to_history(self, current_datetime, captured_image, text, word_boxes=None):
+        if not self.config['history']['enable_history']:
+            return None
+        return capture_history.add(current_datetime, captured_image, text, None, word_boxes)
 
     def start_perform_ocr(self, file_name, current_datetime, scan_only):
         self.config = load_config()
@@ -274,15 +577,19 @@ class FullscreenCapture(QMainWindow):
                 temporary_file_name = temp.name
                 shutil.copy(file_name, temporary_file_name)  # Copy the selected file to the temporary file
                 logger.success(f"Selected image copied as temporary file: {temp.name}")
+            captured_image = Path(temporary_file_name).read_bytes() if self.config['history']['enable_history'] else None
             self.extracted_text = perform_ocr(temporary_file_name, self.config)
-            self.translated_text = self.translate_extracted_text(self.extracted_text)
+            self.cancel_translation()
+            history_entries = [self.add_to_history(current_datetime, captured_image, self.extracted_text)]
         else:
             self.extracted_text = perform_ocr(file_name, self.config)
-            self.translated_text = self.translate_extracted_text(self.extracted_text)
+            self.cancel_translation()
+            history_entries = []
             self.save_or_remove_temporary_image(file_name, current_datetime)
         self.play_sound_file()
         self.close_fullscreen_show_main()
         self.show_ocr_text_ui()
+        self.start_translation(history_entries)
 
     def get_output_folder_path(self):
         output_folder = Path(self.config['output']['output_folder_path'])
@@ -303,7 +610,7 @@ class FullscreenCapture(QMainWindow):
         self.ocr_text_ui.init_ui()
         self.ocr_text_ui.show() if not self.ocr_text_ui.isVisible() else self.ocr_text_ui.raise_()
         self.ocr_text_ui.set_extracted_text(self.extracted_text)
-        self.ocr_text_ui.set_translated_text(self.translated_text)
+        self.ocr_text_ui.set_translation_pending()
 
     def play_sound_file(self):
         if not self.extracted_text or not self.config['preferences']['enable_sound']:
@@ -314,6 +621,8 @@ class FullscreenCapture(QMainWindow):
             logger.error(f"{sound_file} does not exist")
             return
 
+        from playsound import playsound, PlaysoundException  # Use version 1.2.2
+
         try:
             playsound(sound_file.replace('\\', '/'), False)
             logger.success(f"Sound file has been played successfully using playsound")
@@ -326,16 +635,48 @@ class FullscreenCapture(QMainWindow):
         # The hour is in a 24-hour format (military time)
         return f"{now.year}_{now.month:02d}_{now.day:02d}_{now.hour:02d}{now.minute:02d}{now.second:02d}"
 
-    def translate_extracted_text(self, extracted_text):
-        if self.config['translate']['enable_translation']:
-            try:
-                logger.info(f"Translating text using google translate")
-                translated_text = translate_text(extracted_text, self.config)
-                logger.info(f"Translated Text ({translated_text[1]}):\n{translated_text[0]}")
-            except Exception as e:
-                translated_text = None
-                logger.error(f"An error occurred while translating text: {e}")
-            return translated_text
+    def start_translation(self, history_entries):
+        # The OCR text is already displayed, the translated pane is filled in when the translation arrives
+        if not self.extracted_text or not self.config['translate']['enable_translation']:
+            return
+
+        self.translation_history_ids = [entry.entry_id for entry in history_entries if entry is not None]
+        self.translation_start_time = time.perf_counter()
+        translate_worker = TranslateWorker(self.translation_generation, self.extracted_text, self.config)
+        translate_worker.translated_signal.connect(self.translation_ready)
+        translate_worker.finished.connect(lambda: self.translate_workers.remove(translate_worker))
+        self.translate_workers.append(translate_worker)
+        translate_worker.start()
+        self.translation_timer.start(self.translation_timeout_ms())
+
+    def translation_timeout_ms(self):
+        # The backend stops retrying at the time limit, the timer only fires when a request outlives it
+        return int(translation_time_limit(self.config['translate']) * 1000) + TRANSLATION_GRACE_MS
+
+    def cancel_translation(self):
+        # A newer capture replaces the pending translation, its result is discarded when it arrives
+        self.translation_timer.stop()
+        self.translation_generation += 1
+        self.translated_text = None
+
+    def translation_ready(self, generation, translated_text):
+        if generation != self.translation_generation:
+            logger.info("Discarding the translation of a replaced capture")
+            return
+
+        self.translation_timer.stop()
+        self.translated_text = translated_text
+        logger.info(f"Translation received {(time.perf_counter() - self.translation_start_time) * 1000:.1f} ms after the OCR text was displayed")
+        for entry_id in self.translation_history_ids:
+            capture_history.update_translation(entry_id, translated_text)
+        if self.ocr_text_ui.isVisible():
+            self.ocr_text_ui.set_translated_text(translated_text)
+
+    def translation_timed_out(self):
+        logger.error(f"Translation timed out after {self.translation_timeout_ms()} ms")
+        self.cancel_translation()
+        if self.ocr_text_ui.isVisible():
+            self.ocr_text_ui.set_translated_text(None, "<Timeout>")
 
     def save_or_remove_temporary_image(self, file_name, current_datetime):
         if self.config['output']['save_enhanced_image']:
@@ -0,0 +1,145 @@
+# Standard libraries
+import os
+import tempfile
+
+# Third-party libraries
+from loguru import logger
+from PySide6.QtCore import Qt, QSize, QThread, Signal
+from PySide6.QtGui import QIcon, QPixmap
+from PySide6.QtWidgets import (QDialog, QHBoxLayout, QLineEdit, QListWidget, QListWidgetItem,
+                               QPlainTextEdit, QPushButton, QSplitter, QVBoxLayout)
+
+# Custom libraries
+from src.config.config import load_config
+from src.ocr.ocr_processor import copy_to_clipboard, perform_ocr
+from src.ui.asset_manager import app_icon
+from src.utils.history import THUMBNAIL_SIZE, capture_history
+
+
+class RerunOCRWorker(QThread):
+    ocr_done_signal = Signal(int, object)
+
+    def __init__(self, entry_id, image_path, config):
+        super().__init__()
+
+        self.entry_id = entry_id
+        self.image_path = image_path
+        self.config = config
+
+    def run(self):
+        # The clipboard is left alone, the Copy button copies the new text
+        extracted_text = perform_ocr(self.image_path, self.config, clipboard=False)
+        try:
+            os.remove(self.image_path)
+        except OSError as e:
+            logger.error(f"An error occurred while removing temporary image '{self.image_path}': {e}")
+        self.ocr_done_signal.emit(self.entry_id, extracted_text)
+
+
+class HistoryUI(QDialog):
+    def __init__(self):
+        super().__init__()
+
+        self.setWindowTitle("PyTextractOCR - History")
+        self.setWindowIcon(QIcon(app_icon))
+        self.setGeometry(0, 0, 640, 400)
+        self.setMinimumSize(400, 250)
+
+        self.selected_entry_id = None
+        self.rerun_worker = None
+
+        self.line_edit_search = QLineEdit(self)
+        self.line_edit_search.setPlaceholderText("Search captured text")
+        self.line_edit_search.textChanged.connect(self.refresh_entries)
+
+        self.list_widget_entries = QListWidget(self)
+        self.list_widget_entries.setIconSize(QSize(THUMBNAIL_SIZE[0] // 2, THUMBNAIL_SIZE[1] // 2))
+        self.list_widget_entries.currentItemChanged.connect(self.show_selected_entry)
+
+        self.text_edit_entry = QPlainTextEdit(self)
+        self.text_edit_entry.setReadOnly(True)
+
+        splitter = QSplitter(Qt.Horizontal, self)
+        splitter.addWidget(self.list_widget_entries)
+        splitter.addWidget(self.text_edit_entry)
+        splitter.setSizes([260, 380])
+
+        self.button_rerun = QPushButton("Re-run OCR", self)
+        self.button_rerun.setAutoDefault(False)
+        self.button_rerun.setToolTip("Run OCR again on the stored image using the current settings")
+        self.button_rerun.clicked.connect(self.rerun_selected_entry)
+
+        self.button_copy = QPushButton("Copy", self)
+        self.button_copy.setAutoDefault(False)
+        self.button_copy.clicked.connect(lambda: copy_to_clipboard(self.text_edit_entry.toPlainText()))
+
+        self.button_close = QPushButton("Close", self)
+        self.button_close.setAutoDefault(False)
+        self.button_close.clicked.connect(self.close)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch(1)
+        button_layout.addWidget(self.button_rerun)
+        button_layout.addWidget(self.button_copy)
+        button_layout.addWidget(self.button_close)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(5, 5, 5, 5)
+        layout.addWidget(self.line_edit_search)
+        layout.addWidget(splitter)
+        layout.addLayout(button_layout)
+
+        capture_history.listeners.append(self.history_changed)
+
+    def showEvent(self, event):
+        self.refresh_entries()
+        super().showEvent(event)
+
+    def history_changed(self):
+        if self.isVisible():
+            self.refresh_entries()
+
+    def refresh_entries(self):
+        self.list_widget_entries.blockSignals(True)
+        self.list_widget_entries.clear()
+        for entry in capture_history.search(self.line_edit_search.text()):
+            first_line = next((line for line in entry.text.splitlines() if line.strip()), "<Empty>")
+            item = QListWidgetItem(f"{entry.timestamp}\n{first_line[:60]}")
+            item.setData(Qt.UserRole, entry.entry_id)
+            pixmap = QPixmap()
+            if entry.thumbnail and pixmap.loadFromData(entry.thumbnail, 'JPEG'):
+                item.setIcon(QIcon(pixmap))
+            self.list_widget_entries.addItem(item)
+            if entry.entry_id == self.selected_entry_id:
+                self.list_widget_entries.setCurrentItem(item)
+        self.list_widget_entries.blockSignals(False)
+        self.show_selected_entry(self.list_widget_entries.currentItem())
+
+    def show_selected_entry(self, item, previous_item=None):
+        entry = capture_history.get(item.data(Qt.UserRole)) if item else None
+        self.selected_entry_id = entry.entry_id if entry else None
+        self.text_edit_entry.setPlainText(entry.text if entry else "")
+        self.button_rerun.setEnabled(entry is not None and self.rerun_worker is None)
+        self.button_copy.setEnabled(entry is not None)
+
+    def rerun_selected_entry(self):
+        entry = capture_history.get(self.selected_entry_id)
+        if entry is None or self.rerun_worker is not None:
+            return
+
+        # The stored image is written to a temporary file, no new screen grab is needed
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp:
+            temp.write(entry.load_image())
+            temporary_file_name = temp.name
+        logger.info(f"Re-running OCR of history entry {entry.entry_id}")
+        self.button_rerun.setEnabled(False)
+        self.rerun_worker = RerunOCRWorker(entry.entry_id, temporary_file_name, load_config())
+        self.rerun_worker.ocr_done_signal.connect(self.rerun_done)
+        self.rerun_worker.finished.connect(self.rerun_worker.deleteLater)
+        self.rerun_worker.start()
+
+    def rerun_done(self, entry_id, extracted_text):
+        # The entry is not updated when it was evicted while the OCR was running
+        self.rerun_worker = None
+        capture_history.update_text(entry_id, extracted_text)
+        self.button_rerun.setEnabled(self.selected_entry_id is not None)
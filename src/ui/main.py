@@ -4,16 +4,29 @@ from pathlib import Path
 
 # Third-party libraries
 from loguru import logger
-from PySide6.QtCore import Qt, QCoreApplication
+from PySide6.QtCore import Qt, QCoreApplication, QTimer
 from PySide6.QtGui import QIcon, QAction, QGuiApplication
 from PySide6.QtWidgets import QDialog, QHBoxLayout, QPushButton, QSystemTrayIcon, QMenu, QStyle, QFileDialog
 
 # Custom libraries
-from src.config.config import load_config, update_config
+from src.config.config import flush_config, load_config, update_config
+from src.ocr.variants import tessdata_index
 from src.ui.asset_manager import app_icon, main_icon, settings_icon, about_icon, exit_icon
 from src.ui.capture import FullscreenCapture
 from src.ui.settings import SettingsUI
 from src.ui.about import AboutUI
+from src.ui.history import HistoryUI
+from src.utils.latency import LatencyTrace
+from src.utils.preload import preload_modules
+from src.utils.tessdata_watcher import TessdataWatcher
+
+
+# The OCR libraries are imported in the background once the first window had time to appear
+PRELOAD_DELAY_MS = 1000
+# A hidden window stops being exposed before the compositor has repainted the screen under it, the grab waits
+# at least the minimum delay after hiding a visible window and at most the maximum delay for it to be unexposed
+CAPTURE_HIDE_MIN_DELAY = 0.1
+CAPTURE_HIDE_MAX_DELAY = 0.3
 
 
 class MainUI(QDialog):
@@ -33,15 +46,22 @@ class MainUI(QDialog):
         self.saved_position = None
         self.ocr_text_ui_visible = False
         self.settings_ui_visible = False
+        self.show_main_after_capture = True
+        self.capture_pending = False  # Between a capture trigger and the grab of the screen
         self.open_file_dialog_path = None
 
-        # Settings UI instance
-        self.settings_ui = SettingsUI()
-        self.settings_ui.finished.connect(self.on_settings_ui_closed)
+        # Settings UI instance, created when Settings is opened for the first time
+        self.settings_ui = None
+
+        # Keeps the index of the installed language models current
+        self.tessdata_watcher = TessdataWatcher(tessdata_index, self)
 
         # About UI instance
         self.about_ui = AboutUI()
 
+        # History UI instance
+        self.history_ui = HistoryUI()
+
         # Fullscreen Capture instance
         self.fullscreen_capture = FullscreenCapture(self)
 
@@ -54,17 +74,23 @@ class MainUI(QDialog):
         self.tray_icon.setIcon(QIcon(str(icon_path)) if icon_path.is_file else self.style().standardIcon(QStyle.SP_MessageBoxInformation))
 
         self.main_menu_action = QAction('Show PyTexractOCR', triggered=self.show)
+        self.capture_action = QAction('Capture', triggered=lambda: self.start_fullscreen_capture('tray'))
+        self.history_action = QAction('History', triggered=self.show_history_from_tray)
         self.settings_action = QAction('Settings', triggered=self.show_settings_from_tray)
         self.about_action = QAction('About', triggered=self.show_about_from_tray)
         self.exit_action = QAction('Exit', triggered=self.exit_app_from_tray)
 
         self.main_menu_action.setIcon(QIcon(main_icon))
+        self.capture_action.setIcon(QIcon(main_icon))
+        self.history_action.setIcon(QIcon(main_icon))
         self.settings_action.setIcon(QIcon(settings_icon))
         self.about_action.setIcon(QIcon(about_icon))
         self.exit_action.setIcon(QIcon(exit_icon))
 
         self.menu = QMenu()
         self.menu.addAction(self.main_menu_action)
+        self.menu.addAction(self.capture_action)
+        self.menu.addAction(self.history_action)
         self.menu.addAction(self.settings_action)
         self.menu.addAction(self.about_action)
         self.menu.addAction(self.exit_action)
@@ -78,7 +104,7 @@ class MainUI(QDialog):
         capture_button = QPushButton("Capture", self)
         capture_button.setToolTip("Capture Rectangular Region")
         capture_button.setAutoDefault(False)
-        capture_button.clicked.connect(self.start_fullscreen_capture)
+        capture_button.clicked.connect(lambda: self.start_fullscreen_capture('button'))
 
         scan_button = QPushButton("Scan", self)
         scan_button.setToolTip("Select and OCR Image")
@@ -96,20 +122,57 @@ class MainUI(QDialog):
 
         self.setLayout(horizontal_layout)
 
+        QTimer.singleShot(PRELOAD_DELAY_MS, preload_modules)
+
+    def get_settings_ui(self):
+        if self.settings_ui is None:
+            start_time = time.perf_counter()
+            self.settings_ui = SettingsUI()
+            self.settings_ui.finished.connect(self.on_settings_ui_closed)
+            self.tessdata_watcher.changed.connect(self.settings_ui.refresh_installed_languages)
+            logger.info(f"Settings window created in {(time.perf_counter() - start_time) * 1000:.1f} ms")
+        return self.settings_ui
+
+    def is_settings_ui_visible(self):
+        return self.settings_ui is not None and self.settings_ui.isVisible()
+
     def show_settings_ui_main(self):
-        if not self.settings_ui.isVisible():
-            self.settings_ui.initialize_settings_components()
+        if not self.is_settings_ui_visible():
+            self.get_settings_ui().initialize_settings_components()
             self.settings_ui.show()
         else:
             self.settings_ui.showNormal()
             self.settings_ui.raise_()
 
-    def start_fullscreen_capture(self):
+    def start_fullscreen_capture(self, source):
+        # A trigger from the tray or the capture command while a capture is starting or shown is ignored
+        if self.capture_pending or self.fullscreen_capture.isVisible():
+            return
+
+        self.capture_pending = True
+        self.fullscreen_capture.capture_trace = LatencyTrace(source)
+        self.show_main_after_capture = self.isVisible()
         self.saved_position = self.pos()  # Save the current position of window before capturing. Use for show_main_ui function
         logger.info(f"Main window saved position before capture: X: {self.saved_position.x()} Y: {self.saved_position.y()}")
+        hidden_windows = ([self] if self.isVisible() else []) + self.hide_other_ui_before_capture()
         self.hide()  # Hide the MainUI window
-        self.hide_other_ui_before_capture()
-        time.sleep(0.3)  # Add a sleep to wait for the MainUI window to be fully hidden before capturing
+        # Grab once the window system reports that our windows are no longer exposed and the screen had time to be
+        # repainted, without any delay when no window was visible
+        start_time = time.perf_counter()
+        earliest = start_time + CAPTURE_HIDE_MIN_DELAY if hidden_windows else start_time
+        self.grab_when_windows_hidden(hidden_windows, earliest, start_time + CAPTURE_HIDE_MAX_DELAY)
+
+    def grab_when_windows_hidden(self, windows, earliest, deadline):
+        now = time.perf_counter()
+        exposed_windows = [window for window in windows if window.windowHandle() is not None and window.windowHandle().isExposed()]
+        if (exposed_windows or now < earliest) and now < deadline:
+            QTimer.singleShot(5, lambda: self.grab_when_windows_hidden(windows, earliest, deadline))
+            return
+        if exposed_windows:
+            logger.warning(f"Windows still exposed before capturing: {[window.windowTitle() for window in exposed_windows]}")
+
+        self.capture_pending = False
+        self.fullscreen_capture.capture_trace.mark('windows_hidden')
         self.fullscreen_capture.get_fullscreen_capture()  # Start capturing of fullscreen
 
     def select_image_to_ocr(self):
@@ -120,21 +183,28 @@ class MainUI(QDialog):
         if file_path:
             formatted_file_path = file_path.replace('/', '\\')
             self.open_file_dialog_path = formatted_file_path
-            datetime = self.fullscreen_capture.get_current_datetime()
-            self.fullscreen_capture.ocr_text_ui.save_popup_window_position()
             logger.info(f"Selected image for OCR: {formatted_file_path}")
-            self.fullscreen_capture.start_perform_ocr(formatted_file_path, datetime, True)
+            self.scan_image(formatted_file_path)
+
+    def scan_image(self, file_path):
+        datetime = self.fullscreen_capture.get_current_datetime()
+        self.fullscreen_capture.ocr_text_ui.save_popup_window_position()
+        self.fullscreen_capture.start_perform_ocr(file_path, datetime, True)
 
     def hide_other_ui_before_capture(self):
+        hidden_windows = []
         if self.fullscreen_capture.ocr_text_ui.isVisible():
             self.fullscreen_capture.ocr_text_ui.save_popup_window_position()
             self.ocr_text_ui_visible = True
             self.fullscreen_capture.ocr_text_ui.hide()
+            hidden_windows.append(self.fullscreen_capture.ocr_text_ui)
 
-        if self.settings_ui.isVisible():
+        if self.is_settings_ui_visible():
             self.settings_ui.save_settings_window_position()
             self.settings_ui_visible = True
             self.settings_ui.hide()
+            hidden_windows.append(self.settings_ui)
+        return hidden_windows
 
     def show_other_ui_after_capture(self):
         if self.ocr_text_ui_visible:
@@ -148,9 +218,10 @@ class MainUI(QDialog):
 
     # Show the MainUI window at the saved position
     def show_main_ui(self):
-        if self.saved_position is not None:
-            self.move(self.saved_position)
-        self.show()
+        if self.show_main_after_capture:
+            if self.saved_position is not None:
+                self.move(self.saved_position)
+            self.show()
         self.show_other_ui_after_capture()
 
         if not self.fullscreen_capture.isHidden():
@@ -162,7 +233,7 @@ class MainUI(QDialog):
 
     def closeEvent(self, event):
         # Ignore the closing the MainUI window if Settings window is currently open
-        if self.settings_ui.isVisible():
+        if self.is_settings_ui_visible():
             self.settings_ui.showNormal()
             self.settings_ui.raise_()
             event.ignore()
@@ -185,6 +256,7 @@ class MainUI(QDialog):
                 update_config({"miscellaneous": {'tray_notification_shown': True}})
         else:
             self.save_main_window_position()
+            flush_config()
             event.accept()
             logger.info("Application closed")
             QCoreApplication.quit()
@@ -220,17 +292,25 @@ class MainUI(QDialog):
             self.show()
 
     def show_settings_from_tray(self):
-        if not self.settings_ui.isVisible():
+        if not self.is_settings_ui_visible():
             logger.info("Showing settings using system tray")
             self.settings_action.setEnabled(False)
-            self.settings_ui.initialize_settings_components()
+            self.get_settings_ui().initialize_settings_components()
             self.settings_ui.show()
 
+    def show_history_from_tray(self):
+        if not self.history_ui.isVisible():
+            self.history_ui.show()
+        else:
+            self.history_ui.showNormal()
+            self.history_ui.raise_()
+
     def show_about_from_tray(self):
         self.about_ui.show()
 
     def exit_app_from_tray(self):
         self.save_main_window_position()
+        flush_config()
         logger.info("Application closed using system tray")
         QCoreApplication.quit()
 
@@ -120,15 +120,20 @@ class OCRTextUI(QDialog):
     def set_extracted_text(self, text):
         self.text_edit_extracted.setPlainText(text)
 
-    def set_translated_text(self, text):
-        if self.config['translate']['enable_translation']:
+    def set_translation_pending(self):
+        if self.text_edit_translated is not None:
+            self.setWindowTitle("PyTextractOCR - OCR Text (Translating...)")
+            self.text_edit_translated.setPlainText("<Translating...>")
+
+    def set_translated_text(self, text, placeholder="<Error>"):
+        if self.config['translate']['enable_translation'] and self.text_edit_translated is not None:
             if text:
                 self.setWindowTitle(f"PyTextractOCR - OCR Text ({text[1].capitalize()} to {text[2].capitalize()})")
                 self.destination_language = text[3]  # Important for translate_in_default_browser function
                 self.text_edit_translated.setPlainText(text[0])  # Translated Text
             else:
                 self.setWindowTitle("PyTextractOCR - OCR Text")
-                self.text_edit_translated.setPlainText(f"<Error>")
+                self.text_edit_translated.setPlainText(placeholder)
 
     def save_popup_window_position(self):
         window_position_x = self.pos().x()
@@ -5,23 +5,27 @@ from pathlib import Path
 
 # Third-party libraries
 from loguru import logger
-from PySide6.QtCore import Qt, QRect, QTimer, QEvent
+from PySide6.QtCore import Qt, QRect, QTimer, QEvent, Signal
 from PySide6.QtGui import QColor, QPalette, QIcon, QPainter
 from PySide6.QtWidgets import (QAbstractItemView, QCheckBox, QComboBox, QDialog, QDoubleSpinBox,
                                QFileDialog, QHeaderView, QHBoxLayout, QLabel, QLineEdit, QPushButton,
-                               QProgressBar, QScrollArea, QSpinBox, QTableWidget, QTableWidgetItem,
-                               QTabWidget, QVBoxLayout, QWidget)
+                               QProgressBar, QScrollArea, QSpinBox, QTableView, QTabWidget, QVBoxLayout, QWidget)
 
 # Custom libraries
 from src.config.config import load_config, update_config
-from src.ocr.ocr_processor import tesseract_check, tesseract_version
+from src.ocr.capabilities import capability_cache, get_capabilities
+from src.ocr.ocr_processor import tesseract_check
+from src.ocr.variants import VARIANTS, is_language_installed, model_path, tessdata_index
 from src.ui.asset_manager import app_icon
+from src.ui.translate_table import TranslateTableModel, TranslateToDelegate
 from src.utils.download import DownloadTrainedData
+from src.utils.languages import TESSERACT_CODES_BY_NAME, TESSERACT_LANGUAGES
 from src.utils.message_box import show_message_box
-from src.utils.translate import googletrans_languages, tesseract_languages, tesseract_skip_languages
 
 
 class SettingsUI(QDialog):
+    tesseract_probed = Signal(str, object)  # Emitted from the probe thread, delivered in the GUI thread
+
     def __init__(self):
         super().__init__()
 
@@ -37,12 +41,15 @@ class SettingsUI(QDialog):
         self.open_file_dialog_path = None
         self.open_folder_dialog_path = None
         self.open_executable_dialog_path = None
-        self.translate_to_comboboxes = None
-        self.tess_language_row_count = None
+        self.shown_tesseract_path = None
 
         # Download Trained Data instance
         self.download_trained_data = DownloadTrainedData(self)
 
+        # The Tesseract version is read from the capability cache, probes update the label when they finish
+        self.tesseract_probed.connect(self.update_tesseract_version)
+        capability_cache.add_listener(self.tesseract_probed.emit)
+
         # Dictionary to store QLineEdit and QSpinBox widgets
         self.line_edits = {}
         self.spinboxes = {}
@@ -93,12 +100,24 @@ class SettingsUI(QDialog):
         self.settings_tab_widget.setObjectName('tab_widget')
         self.settings_tab_widget.setGeometry(QRect(10, 8, 415, 291))
 
-        # ======== PREFERENCES TAB ========
-
-        self.preferences_tab = QWidget()
-        self.preferences_tab.setObjectName('preferences_tab')
-        self.settings_tab_widget.addTab(self.preferences_tab, "Preferences")
+        # The tabs are empty pages until they are displayed for the first time, see 'build_tab'
+        self.preferences_tab = self.create_tab('preferences_tab', "Preferences")
+        self.ocr_tab = self.create_tab('ocr_tab', "OCR")
+        self.preprocess_tab = self.create_tab('preprocess_tab', "Preprocess")
+        self.output_tab = self.create_tab('output_tab', "Output")
+        self.translate_tab = self.create_tab('translate_tab', "Translate")
+        self.tab_builders = {
+            self.preferences_tab: (self.build_preferences_tab, self.initialize_preferences_tab),
+            self.ocr_tab: (self.build_ocr_tab, self.initialize_ocr_tab),
+            self.preprocess_tab: (self.build_preprocess_tab, self.initialize_preprocess_tab),
+            self.output_tab: (self.build_output_tab, self.initialize_output_tab),
+            self.translate_tab: (self.build_translate_tab, self.initialize_translate_tab),
+        }
+        self.built_tabs = set()
+        self.scroll_content = None  # The language list of the OCR tab is built when it is shown the first time
+        self.settings_tab_widget.currentChanged.connect(self.handle_tab_change)
 
+    def build_preferences_tab(self):
         self.checkbox_minimize_to_sys_tray = self.create_checkbox("Minimize to system tray on close", self.preferences_tab,
                                                                   'checkbox_minimize_to_sys_tray', (16, 10, 210, 20))
 
@@ -111,63 +130,32 @@ class SettingsUI(QDialog):
         self.button_sound_file = self.create_button(". . .", self.preferences_tab, 'button_sound_file', (350, 70, 24, 24), False,
                                                     self.select_audio_file)
 
-        # ======== OCR TAB ========
-
-        self.ocr_tab = QWidget()
-        self.ocr_tab.setObjectName('ocr_tab')
-        self.settings_tab_widget.addTab(self.ocr_tab, "OCR")
-
+    def build_ocr_tab(self):
         self.label_ocr_language = self.create_label("OCR Languages:", self.ocr_tab, 'label_ocr_language', (15, 16, 90, 16))
 
         self.button_ocr_language = self.create_button("Show", self.ocr_tab, 'button_ocr_language', (111, 12, 86, 24), False,
                                                       self.ocr_button_clicked_toggle_widgets_display)
 
+        self.label_model_variant = self.create_label("Models:", self.ocr_tab, 'label_model_variant', (222, 16, 51, 16))
+
+        # COMBOBOX - Model variant, used by the OCR and by the language "Download" buttons
+        self.combobox_model_variant = QComboBox(self.ocr_tab)
+        self.combobox_model_variant.setObjectName('combobox_model_variant')
+        self.combobox_model_variant.setGeometry(QRect(280, 13, 111, 22))
+        self.combobox_model_variant.addItems([variant.title() for variant in VARIANTS])
+        self.combobox_model_variant.setToolTip("Best: tessdata_best models, most accurate.\n"
+                                               "Fast: tessdata_fast models, several times faster.\n"
+                                               "A language that is only installed in the other\n"
+                                               "variant is recognized with that variant.")
+        self.set_combobox_model_variant()
+        self.combobox_model_variant.currentIndexChanged.connect(lambda: (self.update_download_buttons(), self.toggle_apply_button()))
+
         # SCROLL AREA
         self.scroll_area = QScrollArea(self.ocr_tab)
         self.scroll_area.setWidgetResizable(True)
         self.scroll_area.setGeometry(QRect(5, 41, 399, 217))
         self.scroll_area.setVisible(False)
 
-        # Widget for the scroll area
-        self.scroll_content = QWidget(self.scroll_area)
-        self.scroll_area.setWidget(self.scroll_content)
-
-        # Layout for the scroll content
-        self.scroll_content_layout = QVBoxLayout(self.scroll_content)
-        self.scroll_content.setLayout(self.scroll_content_layout)
-
-        self.sc_checkbox_dict = {}
-        self.sc_button_dict = {}
-        self.sc_progressbar_dict = {}
-        self.sc_checkboxes = []
-
-        # Add checkboxes for different languages with "Download" button
-        for language_name in tesseract_languages().values():
-            self.scroll_row_layout = QHBoxLayout()
-
-            self.sc_checkbox = QCheckBox(language_name.title())
-
-            self.sc_button = QPushButton("Download")
-            self.sc_button.setFixedSize(115, 22)
-            self.sc_button.setAutoDefault(False)
-
-            self.sc_progressbar = QProgressBar()
-            self.sc_progressbar.setFixedSize(115, 22)
-            self.sc_progressbar.setVisible(False)
-            self.sc_progressbar.setTextVisible(False)
-
-            self.scroll_row_layout.addWidget(self.sc_checkbox)
-            self.scroll_row_layout.addWidget(self.sc_button)
-            self.scroll_row_layout.addWidget(self.sc_progressbar)
-            self.scroll_content_layout.addLayout(self.scroll_row_layout)
-
-            self.sc_checkbox_dict[language_name] = self.sc_checkbox
-            self.sc_button_dict[language_name] = self.sc_button
-            self.sc_progressbar_dict[language_name] = self.sc_progressbar
-            self.sc_checkboxes.append(self.sc_checkbox)
-            self.sc_checkbox.stateChanged.connect(self.toggle_apply_button)
-            self.sc_button.clicked.connect(self.download_from_github)
-
         self.label_page_seg_mode = self.create_label("Page segment mode:", self.ocr_tab, 'label_page_seg_mode', (15, 48, 119, 16))
 
         # COMBOBOX - Page segmentation mode
@@ -242,12 +230,56 @@ class SettingsUI(QDialog):
         self.button_tesseract_path = self.create_button(". . .", self.ocr_tab, 'button_tesseract_path', (330, 198, 24, 24), False,
                                                         self.select_tesseract_executable_file)
 
-        # ======== PREPROCESS TAB ========
+        # Define widgets related to OCR language and scroll area, which are used in the 'ocr_button_clicked_toggle_widgets_display' function.
+        # 'ocr_tab_widgets' contains all child widgets of 'ocr_tab' excluding those in 'ocr_tab_language_widgets' and 'scroll_area_widgets'.
+        ocr_tab_language_widgets = [self.label_ocr_language, self.button_ocr_language, self.label_model_variant, self.combobox_model_variant]
+        ocr_tab_scroll_area_widgets = self.scroll_area.findChildren(QWidget)
+        self.ocr_tab_widgets = set(self.ocr_tab.findChildren(QWidget)) - set(ocr_tab_language_widgets + ocr_tab_scroll_area_widgets)
 
-        self.preprocess_tab = QWidget()
-        self.preprocess_tab.setObjectName('preprocess_tab')
-        self.settings_tab_widget.addTab(self.preprocess_tab, "Preprocess")
+    def build_language_list(self):
+        # Widget for the scroll area
+        self.scroll_content = QWidget()
 
+        # Layout for the scroll content
+        self.scroll_content_layout = QVBoxLayout(self.scroll_content)
+        self.scroll_content.setLayout(self.scroll_content_layout)
+
+        self.sc_checkbox_dict = {}
+        self.sc_button_dict = {}
+        self.sc_progressbar_dict = {}
+        self.sc_checkboxes = []
+
+        # Add checkboxes for different languages with "Download" button
+        for language_name in TESSERACT_LANGUAGES.values():
+            self.scroll_row_layout = QHBoxLayout()
+
+            self.sc_checkbox = QCheckBox(language_name.title())
+
+            self.sc_button = QPushButton("Download")
+            self.sc_button.setFixedSize(115, 22)
+            self.sc_button.setAutoDefault(False)
+
+            self.sc_progressbar = QProgressBar()
+            self.sc_progressbar.setFixedSize(115, 22)
+            self.sc_progressbar.setVisible(False)
+            self.sc_progressbar.setTextVisible(False)
+
+            self.scroll_row_layout.addWidget(self.sc_checkbox)
+            self.scroll_row_layout.addWidget(self.sc_button)
+            self.scroll_row_layout.addWidget(self.sc_progressbar)
+            self.scroll_content_layout.addLayout(self.scroll_row_layout)
+
+            self.sc_checkbox_dict[language_name] = self.sc_checkbox
+            self.sc_button_dict[language_name] = self.sc_button
+            self.sc_progressbar_dict[language_name] = self.sc_progressbar
+            self.sc_checkboxes.append(self.sc_checkbox)
+            self.sc_checkbox.stateChanged.connect(self.toggle_apply_button)
+            self.sc_button.clicked.connect(self.download_from_github)
+
+        # The content is set after its rows are added, so that the scroll area shows them all at once
+        self.scroll_area.setWidget(self.scroll_content)
+
+    def build_preprocess_tab(self):
         self.checkbox_enable_preprocess = self.create_checkbox("Enable Preprocess", self.preprocess_tab, 'checkbox_enable_preprocess',
                                                                (16, 10, 201, 20))
 
@@ -428,12 +460,7 @@ class SettingsUI(QDialog):
         self.spinbox_morph_kernel_v = self.create_spinbox(self.preprocess_tab, 'spinbox_morph_kernel_v', (250, 183, 30, 19), 1, 15, 2)
         self.spinbox_morph_iteration = self.create_spinbox(self.preprocess_tab, 'spinbox_morph_iteration', (300, 183, 30, 19), 1, 10, 1)
 
-        # ======== OUTPUT TAB ========
-
-        self.output_tab = QWidget()
-        self.output_tab.setObjectName('output_tab')
-        self.settings_tab_widget.addTab(self.output_tab, "Output")
-
+    def build_output_tab(self):
         self.checkbox_copy_to_clipboard = self.create_checkbox("Copy to clipboard", self.output_tab, 'checkbox_copy_to_clipboard',
                                                                (16, 10, 141, 20))
 
@@ -456,12 +483,7 @@ class SettingsUI(QDialog):
         self.button_output_folder = self.create_button(". . .", self.output_tab, 'button_output_folder', (350, 160, 24, 24), False,
                                                        self.select_autosave_output_folder)
 
-        # ======== TRANSLATE TAB ========
-
-        self.translate_tab = QWidget()
-        self.translate_tab.setObjectName('translate_tab')
-        self.settings_tab_widget.addTab(self.translate_tab, "Translate")
-
+    def build_translate_tab(self):
         self.checkbox_append_translation = self.create_checkbox("Append translation to clipboard", self.translate_tab,
                                                                 'checkbox_append_translation', (16, 10, 201, 20))
 
@@ -472,39 +494,59 @@ class SettingsUI(QDialog):
                                                                       "button in OCR window for multiple languages."
                                                               )
 
-        # TABLE WIDGET - Translate To
-        self.translate_table_widget = QTableWidget(self.translate_tab)
-        table_header_labels = ["OCR Language", "Translate To (Using Google Translate)"]
+        # TABLE VIEW - Translate To
+        # The table shows a model of the installed languages, a single combobox editor is created when a cell is clicked
+        self.translate_table_model = TranslateTableModel(self)
+        self.translate_table_model.dataChanged.connect(self.toggle_apply_button)
+        self.translate_table_view = QTableView(self.translate_tab)
 
         # 'MyHeader' class is a custom class that inherits from QHeaderView and provides a way to draw a custom header section.
-        # This class is used as the horizontal and vertical header for the 'translate_table_widget'.
-        header_horizontal = MyHeader(Qt.Horizontal, self.translate_table_widget)
-        self.translate_table_widget.setHorizontalHeader(header_horizontal)
-
-        header_vertical = MyHeader(Qt.Vertical, self.translate_table_widget)
-        self.translate_table_widget.setVerticalHeader(header_vertical)
+        # This class is used as the horizontal and vertical header for the 'translate_table_view'.
+        header_horizontal = MyHeader(Qt.Horizontal, self.translate_table_view)
+        self.translate_table_view.setHorizontalHeader(header_horizontal)
 
-        self.translate_table_widget.setColumnCount(2)
-        self.translate_table_widget.setHorizontalHeaderLabels(table_header_labels)
-        self.translate_table_widget.setEditTriggers(QAbstractItemView.NoEditTriggers)  # Make the entire table read-only
-        self.translate_table_widget.setSelectionMode(QAbstractItemView.NoSelection)  # No items can be selected
+        header_vertical = MyHeader(Qt.Vertical, self.translate_table_view)
+        self.translate_table_view.setVerticalHeader(header_vertical)
 
-        self.handle_translate_tab_change()
+        self.translate_table_view.setModel(self.translate_table_model)
+        self.translate_table_view.setItemDelegateForColumn(1, TranslateToDelegate(self.translate_table_view))
+        self.translate_table_view.setEditTriggers(QAbstractItemView.CurrentChanged | QAbstractItemView.SelectedClicked)
+        self.translate_table_view.setSelectionMode(QAbstractItemView.NoSelection)  # No items can be selected
 
         # Make 'Translate To' column stretch to fill table width.
         header_horizontal.setSectionResizeMode(0, QHeaderView.ResizeToContents)
         header_horizontal.setSectionResizeMode(1, QHeaderView.Stretch)
 
-        self.translate_table_widget.setObjectName('translate_table_widget')
-        self.translate_table_widget.setGeometry(QRect(5, 70, 399, 189))
-        self.translate_table_widget.verticalHeader().setVisible(False)
-        self.settings_tab_widget.currentChanged.connect(self.handle_tab_change)
-
-        # Define widgets related to OCR language and scroll area, which are used in the 'ocr_button_clicked_toggle_widgets_display' function.
-        # 'ocr_tab_widgets' contains all child widgets of 'ocr_tab' excluding those in 'ocr_tab_language_widgets' and 'scroll_area_widgets'.
-        ocr_tab_language_widgets = [self.label_ocr_language, self.button_ocr_language]
-        ocr_tab_scroll_area_widgets = self.scroll_area.findChildren(QWidget)
-        self.ocr_tab_widgets = set(self.ocr_tab.findChildren(QWidget)) - set(ocr_tab_language_widgets + ocr_tab_scroll_area_widgets)
+        self.translate_table_view.setObjectName('translate_table_view')
+        self.translate_table_view.setGeometry(QRect(5, 70, 399, 189))
+        self.translate_table_view.verticalHeader().setVisible(False)
+
+    def create_tab(self, object_name, title):
+        tab = QWidget()
+        tab.setObjectName(object_name)
+        self.settings_tab_widget.addTab(tab, title)
+        return tab
+
+    def build_tab(self, tab):
+        # Returns True when the tab was built by this call
+        if tab in self.built_tabs:
+            return False
+        start_time = time.perf_counter()
+        build, _ = self.tab_builders[tab]
+        build()
+        self.built_tabs.add(tab)
+
+        # Qt only shows the children that exist when a widget is shown, the widgets created in a tab
+        # that is already visible are shown here unless they were explicitly hidden by the builder
+        for widget in tab.findChildren(QWidget, options=Qt.FindDirectChildrenOnly):
+            if not widget.testAttribute(Qt.WA_WState_ExplicitShowHide):
+                widget.show()
+        logger.info(f"Settings tab '{tab.objectName()}' built in {(time.perf_counter() - start_time) * 1000:.1f} ms")
+        return True
+
+    def initialize_tab(self, tab):
+        _, initialize = self.tab_builders[tab]
+        initialize()
 
     @staticmethod
     def create_label(text, parent, object_name, geometry, tooltip=None):
@@ -582,16 +624,42 @@ class SettingsUI(QDialog):
         self.config = load_config()
         self.initialize_settings_components_finish = False
 
+        # Only the tabs that were displayed exist, the others read the configuration when they are built
+        self.build_tab(self.settings_tab_widget.currentWidget())
+        for tab in self.built_tabs:
+            self.initialize_tab(tab)
+
+        self.initialize_settings_components_finish = True
+
+    def initialize_preferences_tab(self):
         widgets = [
             (self.checkbox_minimize_to_sys_tray, 'preferences', 'minimize_to_system_tray'),
             (self.checkbox_play_sound, 'preferences', 'enable_sound'),
-            (self.line_edit_sound_file, 'preferences', 'sound_file', True),
+            (self.line_edit_sound_file, 'preferences', 'sound_file', True)
+        ]
+        for widget in widgets:
+            self.init_widget(*widget)
+        self.open_file_dialog_path = self.config['preferences']['sound_file']
+
+    def initialize_ocr_tab(self):
+        widgets = [
             (self.checkbox_pres_iw_spc, 'ocr', 'preserve_interword_spaces'),
             (self.line_edit_blacklist_char, 'ocr', 'blacklist_char'),
             (self.line_edit_whitelist_char, 'ocr', 'whitelist_char'),
             (self.checkbox_blacklist_char, 'ocr', 'enable_blacklist_char'),
             (self.checkbox_whitelist_char, 'ocr', 'enable_whitelist_char'),
-            (self.line_edit_tesseract_path, 'ocr', 'tesseract_path'),
+            (self.line_edit_tesseract_path, 'ocr', 'tesseract_path')
+        ]
+        for widget in widgets:
+            self.init_widget(*widget)
+        self.set_combobox_model_variant()
+        self.update_combobox_psm_tooltip()
+        self.update_combobox_oem_tooltip()
+        self.check_trained_data_language_file()
+        self.show_tesseract_version(self.config['ocr']['tesseract_path'])
+
+    def initialize_preprocess_tab(self):
+        widgets = [
             (self.spinbox_scale_factor, 'preprocess', 'scale_factor'),
             (self.checkbox_enable_preprocess, 'preprocess', 'enable_preprocess'),
             (self.checkbox_grayscale, 'preprocess', 'enable_grayscale'),
@@ -605,34 +673,41 @@ class SettingsUI(QDialog):
             (self.combobox_global_type, 'preprocess', 'threshold_global_type'),
             (self.combobox_adaptive_method, 'preprocess', 'threshold_adaptive_method'),
             (self.checkbox_morph, 'preprocess', 'enable_morphological_transformation'),
-            (self.combobox_morph, 'preprocess', 'morphological_transformation'),
+            (self.combobox_morph, 'preprocess', 'morphological_transformation')
+        ]
+        for widget in widgets:
+            self.init_widget(*widget)
+        self.update_combobox_blurring()
+        self.update_combobox_thresholding()
+        self.update_combobox_thresh_global_type()
+        self.update_combobox_adaptive_method()
+        self.update_combobox_morph()
+
+    def initialize_output_tab(self):
+        widgets = [
             (self.checkbox_copy_to_clipboard, 'output', 'copy_to_clipboard'),
             (self.checkbox_show_popup_window, 'output', 'show_popup_window'),
             (self.checkbox_remove_empty_lines, 'output', 'remove_empty_lines'),
             (self.checkbox_save_captured_image, 'output', 'save_captured_image'),
             (self.checkbox_save_enhanced_image, 'output', 'save_enhanced_image'),
-            (self.line_edit_output_folder, 'output', 'output_folder_path', True),
-            (self.checkbox_show_translation, 'translate', 'enable_translation')
+            (self.line_edit_output_folder, 'output', 'output_folder_path', True)
         ]
-
         for widget in widgets:
             self.init_widget(*widget)
-
-        self.open_file_dialog_path = self.config['preferences']['sound_file']
         self.open_folder_dialog_path = self.config['output']['output_folder_path']
-        self.update_combobox_psm_tooltip()
-        self.update_combobox_oem_tooltip()
-        self.update_combobox_blurring()
-        self.update_combobox_thresholding()
-        self.update_combobox_thresh_global_type()
-        self.update_combobox_adaptive_method()
-        self.update_combobox_morph()
-        self.check_trained_data_language_file()
 
-        if tesseract_check(self.config['ocr']['tesseract_path']):
-            self.label_tesseract_version.setText(f"Tesseract Version: {tesseract_version()}")
+    def initialize_translate_tab(self):
+        self.init_widget(self.checkbox_show_translation, 'translate', 'enable_translation')
+        self.translate_table_model.load(self.config['translate']['languages'], tessdata_index.installed_languages())
 
-        self.initialize_settings_components_finish = True
+    def set_combobox_model_variant(self):
+        model_variant = self.config['ocr']['model_variant']
+        if model_variant not in VARIANTS:
+            logger.error(f"Invalid configuration - Table: ocr | Key: model_variant | Value: {model_variant}")
+        self.combobox_model_variant.setCurrentIndex(VARIANTS.index(model_variant) if model_variant in VARIANTS else 0)
+
+    def selected_model_variant(self):
+        return VARIANTS[self.combobox_model_variant.currentIndex()]
 
     def init_widget(self, widget, table_name, key, fix_line_edit=False):
         value = self.config[table_name][key]
@@ -783,50 +858,19 @@ class SettingsUI(QDialog):
         self.combobox_morph.setToolTip(tooltip)
 
     def handle_tab_change(self):
-        if self.settings_tab_widget.tabText(self.settings_tab_widget.currentIndex()) == 'Translate':
-            self.handle_translate_tab_change()
+        tab = self.settings_tab_widget.currentWidget()
+        if self.build_tab(tab):
+            # The values of a new tab are loaded without enabling the Apply button
+            initialize_settings_components_finish = self.initialize_settings_components_finish
+            self.initialize_settings_components_finish = False
+            self.initialize_tab(tab)
+            self.initialize_settings_components_finish = initialize_settings_components_finish
         for spinbox in self.spinboxes.values():
             spinbox.clearFocus()
 
-    def handle_translate_tab_change(self):
-        time.sleep(0.1)  # Added 0.1-millisecond sleep to wait for the temporary finish renaming
-        self.translate_to_comboboxes = []
-
-        table_row = 0
-        counter = 0
-        for tess_language_code, tess_language_name in tesseract_languages().items():
-            if tess_language_name in tesseract_skip_languages():
-                continue
-            counter += 1
-            if not Path('./tessdata', f'{tess_language_code}.traineddata').exists():
-                continue
-
-            table_widget_language = QTableWidgetItem(tess_language_name.title())
-            translate_to_combobox = QComboBox()
-
-            for gtrans_language_code, gtrans_language_name in googletrans_languages().items():
-                # Get the first word of the language_name and tess_language_name
-                first_word_language_name = gtrans_language_name.split(' ')[0]
-                first_word_tess_language_name = tess_language_name.split(' ')[0]
-
-                # Add the languages with the first letter capitalized to the combo box, excluding the current language
-                if first_word_language_name not in first_word_tess_language_name:
-                    translate_to_combobox.addItem(gtrans_language_name.title())
-
-                # Load the OCR language combobox index based on save config
-                if gtrans_language_code == self.config['translate']['languages'][counter - 1]:
-                    index = translate_to_combobox.findText(gtrans_language_name.capitalize())
-                    if index >= 0:  # -1 means the text was not found
-                        translate_to_combobox.setCurrentIndex(index)
-
-            self.translate_table_widget.setRowCount(1 + table_row)
-            self.translate_table_widget.setItem(table_row, 0, table_widget_language)
-            self.translate_table_widget.setCellWidget(table_row, 1, translate_to_combobox)
-            self.translate_to_comboboxes.append(translate_to_combobox)
-            translate_to_combobox.currentIndexChanged.connect(self.toggle_apply_button)
-            table_row += 1
-
     def ocr_button_clicked_toggle_widgets_display(self):
+        if self.scroll_content is None:
+            self.build_language_list()
         [widget.setVisible(False if not self.ocr_tab_widget_visible else True) for widget in self.ocr_tab_widgets]
         self.button_ocr_language.setText("Hide" if self.ocr_tab_widget_visible else "Show")
         self.scroll_area.setVisible(not self.ocr_tab_widget_visible)
@@ -834,16 +878,41 @@ class SettingsUI(QDialog):
         self.ocr_tab_widget_visible = not self.ocr_tab_widget_visible
 
     def check_trained_data_language_file(self):
+        if self.scroll_content is None:
+            return
         logger.info("Checking trained data languages")
         self.config = load_config()
-        for language_code, language_name in tesseract_languages().items():
-            file_path = Path('./tessdata') / f'{language_code}.traineddata'
-            is_file_exist = file_path.exists()
+        for language_code, language_name in TESSERACT_LANGUAGES.items():
+            is_file_exist = is_language_installed(language_code)
             is_language_selected = language_code in self.config['ocr']['language'].split('+')
 
             self.sc_checkbox_dict[f'{language_name}'].setChecked(is_file_exist and is_language_selected)
             self.sc_checkbox_dict[f'{language_name}'].setEnabled(is_file_exist)
-            self.sc_button_dict[f'{language_name}'].setVisible(not is_file_exist)
+        self.update_download_buttons()
+
+    def update_download_buttons(self):
+        # A language can be installed in both variants, the buttons download the variant selected in the combobox
+        if self.scroll_content is None:
+            return
+        model_variant = self.selected_model_variant()
+        for language_code, language_name in TESSERACT_LANGUAGES.items():
+            if not self.sc_progressbar_dict[language_name].isHidden():  # Downloading
+                continue
+            is_installed = is_language_installed(language_code, model_variant)
+            self.sc_button_dict[language_name].setText(f"Download {model_variant.title()}")
+            self.sc_button_dict[language_name].setVisible(not is_installed)
+
+    def refresh_installed_languages(self):
+        # Called when the tessdata folders change, the installed state is updated without reloading the settings
+        if self.scroll_content is not None:
+            for language_code, language_name in TESSERACT_LANGUAGES.items():
+                is_installed = is_language_installed(language_code)
+                self.sc_checkbox_dict[language_name].setEnabled(is_installed)
+                if not is_installed:
+                    self.sc_checkbox_dict[language_name].setChecked(False)
+            self.update_download_buttons()
+        if self.translate_tab in self.built_tabs:
+            self.translate_table_model.set_installed_languages(tessdata_index.installed_languages())
 
     @staticmethod
     def remove_duplicate_chars(line_edit):
@@ -866,8 +935,21 @@ class SettingsUI(QDialog):
             formatted_file_path = file_path.replace('/', '\\')
             self.line_edit_tesseract_path.setText(formatted_file_path)
             self.open_executable_dialog_path = formatted_file_path
-            if tesseract_check(formatted_file_path):
-                self.label_tesseract_version.setText(f"Tesseract Version: {tesseract_version()}")
+            self.show_tesseract_version(formatted_file_path)
+
+    def show_tesseract_version(self, tesseract_path):
+        # Never starts Tesseract, an unknown or updated executable is probed in the background
+        self.shown_tesseract_path = tesseract_path
+        if not tesseract_check(tesseract_path):
+            self.label_tesseract_version.setText("Tesseract Version: Not found")
+            return
+        capabilities = get_capabilities(tesseract_path)
+        self.label_tesseract_version.setText(f"Tesseract Version: {capabilities.version if capabilities else 'Checking...'}")
+
+    def update_tesseract_version(self, tesseract_path, capabilities):
+        if self.ocr_tab not in self.built_tabs or tesseract_path != self.shown_tesseract_path:
+            return
+        self.label_tesseract_version.setText(f"Tesseract Version: {capabilities.version if capabilities else 'Not found'}")
 
     def select_audio_file(self):
         options = QFileDialog.Options()
@@ -950,6 +1032,8 @@ class SettingsUI(QDialog):
         self.close()
 
     def check_sound_file(self):
+        if self.preferences_tab not in self.built_tabs:
+            return
         if self.checkbox_play_sound.isChecked():
             if not self.line_edit_sound_file.text():
                 raise ValueError("Sound file is empty.")
@@ -957,6 +1041,11 @@ class SettingsUI(QDialog):
                 raise ValueError(f"Sound file does not exist.")
 
     def check_and_create_output_folder(self):
+        if self.output_tab not in self.built_tabs:
+            self.output_folder_created = True
+            self.save_settings_config()
+            return
+
         output_folder_path = self.fix_line_edit_path(self.line_edit_output_folder)
         self.line_edit_output_folder.setText(output_folder_path)
 
@@ -1011,18 +1100,16 @@ class SettingsUI(QDialog):
     def download_from_github(self):
         sender_button = self.sender()
 
-        for name, button in self.sc_button_dict.items():
+        for language_name, button in self.sc_button_dict.items():
             if button is sender_button:
-                for language_code, language_name in tesseract_languages().items():
-                    if name == language_name:
-                        tessdata_folder = Path('./tessdata/')
-                        file_name = f'{language_code}.traineddata'
-                        download_destination = f'{tessdata_folder}/{file_name}.tmp'
-                        tessdata_folder.mkdir(parents=True, exist_ok=True)
+                model_variant = self.selected_model_variant()
+                language_code = TESSERACT_CODES_BY_NAME[language_name]
+                download_destination = model_path(language_code, model_variant)
 
-                        logger.info(f"Selected language: {language_name}")
-                        self.download_trained_data.start_download_worker(language_name, download_destination, file_name)
-                        break
+                logger.info(f"Selected language: {language_name} ({model_variant} model)")
+                self.download_trained_data.start_download_worker(language_name, download_destination, download_destination.name,
+                                                                 model_variant)
+                break
 
     def toggle_download_button_progress_bar(self, language_name, is_visible):
         logger.info(f"Download button: {not is_visible} - Progress bar: {is_visible}")
@@ -1033,21 +1120,41 @@ class SettingsUI(QDialog):
     def update_progress_bar(self, language_name, value):
         self.sc_progressbar_dict[f'{language_name}'].setValue(value)
         if value == 100:
+            tessdata_index.invalidate()  # The model was just moved into a tessdata folder, the watcher may not have reported it yet
             self.sc_progressbar_dict[f'{language_name}'].setVisible(False)
             self.sc_checkbox_dict[f'{language_name}'].setEnabled(True)
             self.button_ocr_language.setEnabled(True)
+            self.update_download_buttons()
             self.scroll_area.update()
-            self.handle_translate_tab_change()
+            if self.translate_tab in self.built_tabs:
+                self.translate_table_model.add_language(TESSERACT_CODES_BY_NAME[language_name])
 
     def save_settings_config(self):
-        settings_config = {
+        # Only the tabs that were built can have changed, the other settings are left as they are in the configuration
+        settings_config = {}
+        for tab, get_settings in [(self.preferences_tab, self.get_preferences_settings), (self.ocr_tab, self.get_ocr_settings),
+                                  (self.preprocess_tab, self.get_preprocess_settings), (self.output_tab, self.get_output_settings),
+                                  (self.translate_tab, self.get_translate_settings)]:
+            if tab in self.built_tabs:
+                settings_config.update(get_settings())
+
+        logger.info("Saving settings in configuration file")
+        update_config(settings_config)
+
+    def get_preferences_settings(self):
+        return {
             "preferences": {
                 'minimize_to_system_tray': self.checkbox_minimize_to_sys_tray.isChecked(),
                 'enable_sound': self.checkbox_play_sound.isChecked(),
                 'sound_file': self.fix_line_edit_path(self.line_edit_sound_file)
-            },
+            }
+        }
+
+    def get_ocr_settings(self):
+        settings_config = {
             "ocr": {
                 'tesseract_path': self.line_edit_tesseract_path.text(),
+                'model_variant': self.selected_model_variant(),
                 'page_segmentation_mode': int(self.combobox_page_seg_mode.currentText()),
                 'ocr_engine_mode': int(self.combobox_ocr_engine_mode.currentText()),
                 'preserve_interword_spaces': self.checkbox_pres_iw_spc.isChecked(),
@@ -1055,7 +1162,19 @@ class SettingsUI(QDialog):
                 'blacklist_char': self.line_edit_blacklist_char.text(),
                 'enable_whitelist_char': self.checkbox_whitelist_char.isChecked(),
                 'whitelist_char': self.line_edit_whitelist_char.text()
-            },
+            }
+        }
+
+        # Save all checked OCR languages, the list only exists once it was shown
+        if self.scroll_content is not None:
+            checked_languages = [language_code for language_code, language_name in TESSERACT_LANGUAGES.items()
+                                 if self.sc_checkbox_dict[language_name].isChecked() and is_language_installed(language_code)]
+            settings_config['ocr']['language'] = '+'.join(checked_languages)
+
+        return settings_config
+
+    def get_preprocess_settings(self):
+        settings_config = {
             "preprocess": {
                 'enable_preprocess': self.checkbox_enable_preprocess.isChecked(),
                 'scale_factor': self.fix_double_spinbox_zeros(self.spinbox_scale_factor.value()),
@@ -1071,17 +1190,6 @@ class SettingsUI(QDialog):
                 'threshold_adaptive_method': self.combobox_adaptive_method.currentIndex(),
                 'enable_morphological_transformation': self.checkbox_morph.isChecked(),
                 'morphological_transformation': self.combobox_morph.currentIndex()
-            },
-            "output": {
-                'copy_to_clipboard': self.checkbox_copy_to_clipboard.isChecked(),
-                'show_popup_window': self.checkbox_show_popup_window.isChecked(),
-                'remove_empty_lines': self.checkbox_remove_empty_lines.isChecked(),
-                'save_captured_image': self.checkbox_save_captured_image.isChecked(),
-                'save_enhanced_image': self.checkbox_save_enhanced_image.isChecked(),
-                'output_folder_path': self.fix_line_edit_path(self.line_edit_output_folder)
-            },
-            "translate": {
-                'enable_translation': self.checkbox_show_translation.isChecked()
             }
         }
         # Save blurring kernel and other
@@ -1123,35 +1231,30 @@ class SettingsUI(QDialog):
         settings_values.update({i: [self.spinbox_morph_kernel_h.value(), self.spinbox_morph_kernel_v.value()] for i in range(2, 7)})
         if morph_index in settings_values:
             settings_config['preprocess'][settings_name[morph_index]] = settings_values[morph_index]
+        return settings_config
 
-        # Save all checked OCR languages
-        checked_languages = [language_code for language_code, language_name in tesseract_languages().items()
-                             if self.sc_checkbox_dict[language_name].isChecked() and Path('./tessdata', f'{language_code}.traineddata').exists()]
-        settings_config['ocr']['language'] = '+'.join(checked_languages)
+    def get_output_settings(self):
+        return {
+            "output": {
+                'copy_to_clipboard': self.checkbox_copy_to_clipboard.isChecked(),
+                'show_popup_window': self.checkbox_show_popup_window.isChecked(),
+                'remove_empty_lines': self.checkbox_remove_empty_lines.isChecked(),
+                'save_captured_image': self.checkbox_save_captured_image.isChecked(),
+                'save_enhanced_image': self.checkbox_save_enhanced_image.isChecked(),
+                'output_folder_path': self.fix_line_edit_path(self.line_edit_output_folder)
+            }
+        }
 
-        # Save Translate To languages
-        settings_config['translate']['languages'] = self.config['translate']['languages']
-        google_l = googletrans_languages()
-        counter_cbox = 0
-        counter_lang = 0
-        for tess_language_code, tess_language_name in tesseract_languages().items():
-            # Skip certain languages
-            if tess_language_name in tesseract_skip_languages():
-                continue
-            counter_lang += 1
-            # Skip if trained data for the language doesn't exist
-            if not Path('./tessdata', f'{tess_language_code}.traineddata').exists():
-                continue
-            # Get current text from combobox and convert to lower case
-            combobox_text = self.translate_to_comboboxes[counter_cbox].currentText().lower()
-            # Get language code corresponding to the combobox text
-            language_code = list(google_l.keys())[list(google_l.values()).index(combobox_text)]
-            # Update language code in settings
-            settings_config['translate']['languages'][counter_lang - 1] = language_code
-            counter_cbox += 1
+    def get_translate_settings(self):
+        settings_config = {
+            "translate": {
+                'enable_translation': self.checkbox_show_translation.isChecked()
+            }
+        }
 
-        logger.info("Saving settings in configuration file")
-        update_config(settings_config)
+        # Save Translate To languages
+        settings_config['translate']['languages'] = self.translate_table_model.destination_languages()
+        return settings_config
 
     @staticmethod
     def fix_line_edit_path(line_edit: QLineEdit):
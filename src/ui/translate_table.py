@@ -0,0 +1,167 @@
+# Standard library
+from bisect import bisect_left
+
+# Third-party libraries
+from PySide6.QtCore import Qt, QAbstractListModel, QAbstractTableModel, QModelIndex, QTimer
+from PySide6.QtWidgets import QComboBox, QStyledItemDelegate
+
+# Custom libraries
+from src.utils.languages import DESTINATION_CHOICES, DESTINATION_SLOTS, GOOGLETRANS_LANGUAGES, TESSERACT_CODES_BY_SLOT, TESSERACT_LANGUAGES
+
+
+class DestinationListModel(QAbstractListModel):
+    """
+    The Google Translate languages, shared by every "Translate To" editor.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.codes = tuple(GOOGLETRANS_LANGUAGES)
+        self.rows = {code: row for row, code in enumerate(self.codes)}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.codes)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        code = self.codes[index.row()]
+        if role == Qt.DisplayRole:
+            return GOOGLETRANS_LANGUAGES[code].title()
+        if role == Qt.UserRole:
+            return code
+        return None
+
+
+class TranslateTableModel(QAbstractTableModel):
+    """
+    One row per installed OCR language, in the order of the translate.languages slots.
+
+    The "Translate To" column holds the Google Translate code saved in the slot of the language.
+    Rows are inserted and removed one by one when languages are installed, the table is only
+    reset when the settings are loaded.
+    """
+
+    headers = ("OCR Language", "Translate To (Using Google Translate)")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.codes = []  # Tesseract codes of the installed languages, sorted by slot
+        self.slots = []  # Slot of each row, kept next to the codes for the binary search
+        self.destinations = []  # The translate.languages list
+
+    def load(self, destinations, installed_codes):
+        self.beginResetModel()
+        self.destinations = list(destinations)
+        self.codes = [code for code in TESSERACT_CODES_BY_SLOT if code in installed_codes]
+        self.slots = [DESTINATION_SLOTS[code] for code in self.codes]
+        self.endResetModel()
+
+    def add_language(self, code):
+        slot = DESTINATION_SLOTS.get(code)
+        if slot is None or code in self.codes:
+            return
+        row = bisect_left(self.slots, slot)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.codes.insert(row, code)
+        self.slots.insert(row, slot)
+        self.endInsertRows()
+
+    def remove_language(self, code):
+        if code not in self.codes:
+            return
+        row = self.codes.index(code)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.codes[row]
+        del self.slots[row]
+        self.endRemoveRows()
+
+    def set_installed_languages(self, installed_codes):
+        for code in [code for code in self.codes if code not in installed_codes]:
+            self.remove_language(code)
+        for code in installed_codes:
+            self.add_language(code)
+
+    def destination_languages(self):
+        return list(self.destinations)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.codes)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.headers[section]
+        return None
+
+    def flags(self, index):
+        if index.column() == 1:
+            return Qt.ItemIsEnabled | Qt.ItemIsEditable
+        return Qt.ItemIsEnabled
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        code = self.codes[index.row()]
+        if index.column() == 0:
+            return TESSERACT_LANGUAGES[code].title() if role == Qt.DisplayRole else None
+
+        destination_code = self.destinations[self.slots[index.row()]]
+        if role == Qt.DisplayRole:
+            return GOOGLETRANS_LANGUAGES.get(destination_code, destination_code).title()
+        if role == Qt.EditRole:
+            return destination_code
+        if role == Qt.ToolTipRole:
+            return "Click to change the translation language"
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or index.column() != 1 or value not in GOOGLETRANS_LANGUAGES:
+            return False
+        slot = self.slots[index.row()]
+        if self.destinations[slot] == value:
+            return False
+        self.destinations[slot] = value
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+
+class TranslateToDelegate(QStyledItemDelegate):
+    """
+    Edits the "Translate To" column with a combobox over the shared language list model.
+
+    The editor only exists while a cell is edited, the language of the row itself is hidden from its list.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.destination_model = DestinationListModel(self)
+
+    def createEditor(self, parent, option, index):
+        editor = QComboBox(parent)
+        editor.setModel(self.destination_model)
+        code = index.model().codes[index.row()]
+        choices = {choice_code for choice_code, _ in DESTINATION_CHOICES[code]}
+        for row, destination_code in enumerate(self.destination_model.codes):
+            if destination_code not in choices:
+                editor.view().setRowHidden(row, True)
+        editor.activated.connect(lambda: self.commit_and_close(editor))
+        QTimer.singleShot(0, editor.showPopup)  # A single click opens the list
+        return editor
+
+    def commit_and_close(self, editor):
+        self.commitData.emit(editor)
+        self.closeEditor.emit(editor)
+
+    def setEditorData(self, editor, index):
+        row = self.destination_model.rows.get(index.data(Qt.EditRole))
+        if row is not None:
+            editor.setCurrentIndex(row)
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentData(Qt.UserRole), Qt.EditRole)
+
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(option.rect)
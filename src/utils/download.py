@@ -1,106 +1,64 @@
-# Standard libraries
-import shutil
-from pathlib import Path
-
 # Third-party libraries
-import requests
 from loguru import logger
-from PySide6.QtCore import QThread, Signal
+from PySide6.QtCore import QObject, Signal
+
+# Custom libraries
+from src.config.config import load_config
+from src.utils.model_store import DEFAULT_VARIANT, get_base_url, get_model_store, model_name, provision_model
+
 
+class DownloadTrainedData(QObject):
+    # Emitted from the download threads, Qt queues them to the settings window in the GUI thread
+    progress_signal = Signal(str, int)
+    error_signal = Signal(str)
 
-class DownloadTrainedData:
     def __init__(self, settings_instance):
         super().__init__()
 
-        self.download_worker = None
-        self.threads = []
+        self.download_manager = None
+        self.download_settings = None
 
         # Dependency Injection for settings method, injects an instance of SettingsUI class into this class
         self.settings_instance = settings_instance
 
-        self.github_tessdata_best_url = "https://raw.githubusercontent.com/tesseract-ocr/tessdata_best/main/"
-
-    def start_download_worker(self, language, destination, file_name):
-        url = f'{self.github_tessdata_best_url}{file_name}'
+        self.progress_signal.connect(self.settings_instance.update_progress_bar)
+        self.error_signal.connect(self.download_failed)
+
+    def get_download_manager(self, download_config):
+        # The manager and its pooled session are shared by every download until the download settings change
+        settings = tuple(download_config.values())
+        if self.download_manager is None or settings != self.download_settings:
+            if self.download_manager is not None:
+                self.download_manager.close()
+            from src.utils.downloader import create_download_manager  # Imports requests, only needed once a model is installed
+
+            self.download_manager = create_download_manager(download_config)
+            self.download_settings = settings
+        return self.download_manager
+
+    def start_download_worker(self, language, destination, file_name, variant=DEFAULT_VARIANT):
+        download_config = load_config()['download']
+        base_url = get_base_url(download_config, variant)
+        url = f"{base_url.rstrip('/')}/{file_name}"
         self.settings_instance.toggle_download_button_progress_bar(language, True)
 
-        self.download_worker = DownloadWorker(url, str(destination), file_name, language)
-        self.download_worker.progress_signal.connect(self.settings_instance.update_progress_bar)
-        self.download_worker.error_signal.connect(self.download_failed)
-        self.download_worker.finished.connect(self.thread_finished)
-        self.download_worker.start()
-        self.threads.append(self.download_worker)
+        # The model is installed from the local store when it is there, otherwise downloaded and added to the store
+        logger.info(f"Installing '{language}' language ({variant} model): {url}")
+        download_manager = self.get_download_manager(download_config)
+        store = get_model_store(download_config['store_folder'])
+        future = download_manager.submit_task(destination, provision_model, store, download_manager, base_url,
+                                              model_name(file_name, variant), destination,
+                                              lambda progress: self.progress_signal.emit(language, progress),
+                                              download_config['mirror_manifest'])
+        future.add_done_callback(lambda done: self.download_done(language, done))
+
+    def download_done(self, language, future):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Downloading '{language}' language failed: {error}")
+            self.error_signal.emit(language)
 
     def download_failed(self, language):
-        logger.error(f"Downloading '{language}' language failed")
         self.settings_instance.toggle_download_button_progress_bar(language, False)
-
-    def thread_finished(self):
-        for self.download_worker in self.threads:
-            if not self.download_worker.isRunning():
-                self.threads.remove(self.download_worker)
-                logger.info(f"Running Threads: {self.threads}")
-                del self.download_worker
-
-
-class DownloadWorker(QThread):
-    progress_signal = Signal(str, int)
-    error_signal = Signal(str)
-
-    def __init__(self, url, destination, filename, language):
-        super().__init__()
-
-        self.url = url
-        self.destination = destination
-        self.filename = filename
-        self.language = language
-
-        self.file_size = self.get_file_size()
-        self.headers = {'Range': f'bytes={self.file_size}-'}
-
-    def get_file_size(self):
-        try:
-            return Path(self.destination).stat().st_size
-        except FileNotFoundError:
-            return 0
-
-    def run(self):
-        try:
-            logger.info(f"Downloading '{self.language}' language from github: {self.url}")
-
-            with requests.get(self.url, headers=self.headers, stream=True, timeout=30) as response:
-                response.raise_for_status()
-                remaining_size = int(response.headers.get('content-length', 0))
-                downloaded_size = self.file_size
-                total_size = downloaded_size + remaining_size
-                logger.info(f"Destination: {self.destination} - Downloaded: {downloaded_size} - Remaining: {remaining_size} - Total: {total_size}")
-
-                mode = 'ab' if response.status_code == 206 else 'wb'
-                with open(self.destination, mode) as file:
-                    for chunk in response.iter_content(chunk_size=1024):
-                        downloaded_size = self.write_to_file(file, chunk, downloaded_size, total_size)
-
-                logger.success(f"Downloading '{self.language}' language completed")
-                self.rename_temp_file()
-        except (ConnectionError, TimeoutError, requests.exceptions.RequestException) as e:
-            error_type = "Connection error" if isinstance(e, ConnectionError) else (
-                "Timeout error" if isinstance(e, TimeoutError) else "Request error")
-            logger.error(f"{error_type}: {e}")
-            self.error_signal.emit(self.language)
-
-    def write_to_file(self, file, data, downloaded_size, total_size):
-        file.write(data)
-        downloaded_size += len(data)
-        progress_percentage = int(downloaded_size / total_size * 100)
-        self.progress_signal.emit(self.language, progress_percentage)
-        return downloaded_size  # Return the value so that run function can track it correctly
-
-    def rename_temp_file(self):
-        tessdata_folder = Path('./tessdata')
-        current_file_path = tessdata_folder / f'{self.filename}.tmp'
-        new_file_path = tessdata_folder / self.filename
-        try:
-            shutil.move(current_file_path, new_file_path)
-            logger.success(f"The file '{self.filename}.tmp' has been renamed to '{self.filename}'.")
-        except Exception as e:
-            logger.error(f"Failed to rename the file '{self.filename}.tmp': {e}")
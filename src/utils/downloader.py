@@ -0,0 +1,305 @@
+# Standard libraries
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Third-party libraries
+import requests
+from loguru import logger
+from requests.adapters import HTTPAdapter
+
+
+class ChecksumError(ValueError):
+    pass
+
+
+class RangeIgnoredError(requests.exceptions.RequestException):
+    # The server answered a segment request with the whole file
+    pass
+
+
+if hasattr(os, 'pwrite'):
+    def write_at(file_descriptor, data, offset):
+        while data:
+            written = os.pwrite(file_descriptor, data, offset)
+            data, offset = data[written:], offset + written
+else:
+    # Windows has no pwrite, the segments share one descriptor so the seek and the write must not interleave
+    write_lock = threading.Lock()
+
+    def write_at(file_descriptor, data, offset):
+        with write_lock:
+            os.lseek(file_descriptor, offset, os.SEEK_SET)
+            while data:
+                data = data[os.write(file_descriptor, data):]
+
+
+class DownloadManager:
+    """
+    Downloads files over a shared, pooled requests.Session with a bounded number of concurrent downloads.
+
+    Each file is written to '<destination>.tmp', verified against its SHA-256 checksum or its
+    expected size and then renamed to the destination with os.replace. Files of at least
+    segment_min_size bytes from servers that accept Range requests are downloaded as parallel
+    byte-range segments into a preallocated file, with a '<destination>.tmp.json' manifest that
+    lets every segment resume after a crash. Smaller files are streamed over one connection and
+    resumed from the size of the temporary file. Progress callbacks are called at most once per
+    progress interval, and always once at 100% after the file is in place.
+    """
+
+    def __init__(self, max_concurrent=3, chunk_size=1024 * 1024, progress_interval=0.1, timeout=30, fetch_checksum=False,
+                 segments=4, segment_min_size=4 * 1024 * 1024):
+        self.segments = max(1, segments)
+        self.segment_min_size = segment_min_size
+        self.chunk_size = chunk_size
+        self.progress_interval = progress_interval
+        self.timeout = timeout
+        self.fetch_checksum = fetch_checksum
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(4, max_concurrent * self.segments))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix='download')
+        self.lock = threading.Lock()
+        self.active = {}
+
+    def submit(self, url, destination, progress_callback=None, expected_sha256=None):
+        return self.submit_task(destination, self.download, url, destination, progress_callback, expected_sha256)
+
+    def submit_task(self, destination, function, *args):
+        # The same destination is never downloaded twice at the same time
+        destination = Path(destination)
+        with self.lock:
+            if destination in self.active:
+                logger.info(f"Download of '{destination}' is already running")
+                return self.active[destination]
+            future = self.executor.submit(function, *args)
+            self.active[destination] = future
+        future.add_done_callback(lambda _: self.release(destination))
+        return future
+
+    def release(self, destination):
+        with self.lock:
+            self.active.pop(destination, None)
+
+    def download(self, url, destination, progress_callback=None, expected_sha256=None):
+        destination = Path(destination)
+        temporary_file = destination.with_name(f"{destination.name}.tmp")
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        if expected_sha256 is None and self.fetch_checksum:
+            expected_sha256 = self.get_remote_checksum(url)
+
+        manifest_file = temporary_file.with_name(f"{temporary_file.name}.json")
+        if self.segments > 1:
+            remote = self.get_remote_info(url)
+            if remote is not None and remote['size'] >= self.segment_min_size:
+                try:
+                    return self.download_segmented(url, destination, temporary_file, manifest_file, remote, progress_callback,
+                                                   expected_sha256)
+                except RangeIgnoredError as e:
+                    # A CDN that ignores ranges, or a file that changed since the HEAD request
+                    logger.warning(f"{e}, downloading '{destination.name}' over one connection")
+        # A manifest left by a segmented download does not describe a streamed temporary file
+        if manifest_file.exists():
+            manifest_file.unlink()
+            temporary_file.unlink(missing_ok=True)
+
+        # The bytes already in the temporary file are hashed first, so the checksum covers the resumed file
+        sha256 = hashlib.sha256()
+        downloaded_size = self.hash_file(temporary_file, sha256) if temporary_file.exists() else 0
+        headers = {'Range': f'bytes={downloaded_size}-'} if downloaded_size else {}
+
+        start_time = time.perf_counter()
+        with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+            if response.status_code == 416:
+                # The temporary file is already complete
+                total_size = downloaded_size
+            else:
+                response.raise_for_status()
+                if response.status_code != 206 and downloaded_size:
+                    logger.info(f"Server ignored the Range request, restarting the download of '{destination.name}'")
+                    sha256, downloaded_size = hashlib.sha256(), 0
+                remaining_size = int(response.headers.get('content-length', 0))
+                total_size = downloaded_size + remaining_size
+                logger.info(f"Downloading {url} to {temporary_file} - Downloaded: {downloaded_size} - Total: {total_size}")
+
+                last_progress_time = 0.0
+                with open(temporary_file, 'ab' if downloaded_size else 'wb') as file:
+                    for chunk in response.iter_content(chunk_size=self.chunk_size):
+                        file.write(chunk)
+                        sha256.update(chunk)
+                        downloaded_size += len(chunk)
+                        now = time.perf_counter()
+                        if progress_callback and total_size and now - last_progress_time >= self.progress_interval:
+                            last_progress_time = now
+                            # 100% is only reported once the file is verified and renamed
+                            progress_callback(min(99, int(downloaded_size / total_size * 100)))
+
+        self.verify(temporary_file, sha256.hexdigest(), expected_sha256, downloaded_size, total_size)
+        os.replace(temporary_file, destination)
+        elapsed = time.perf_counter() - start_time
+        logger.success(f"Downloaded '{destination}' ({downloaded_size} bytes in {elapsed:.2f} seconds)")
+        if progress_callback:
+            progress_callback(100)
+        return destination
+
+    def get_remote_info(self, url):
+        # The size and validator of the remote file, None when the server does not accept byte ranges.
+        # If-Range only accepts a strong ETag or a date, a weak ETag would always get the whole file
+        try:
+            response = self.session.head(url, allow_redirects=True, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Unable to get the size of {url}, downloading over one connection: {e}")
+            return None
+        if response.headers.get('accept-ranges', '').lower() != 'bytes' or 'content-length' not in response.headers:
+            return None
+        etag = response.headers.get('etag', '')
+        validator = etag if etag and not etag.startswith('W/') else response.headers.get('last-modified', '')
+        return {'size': int(response.headers['content-length']), 'validator': validator}
+
+    def download_segmented(self, url, destination, temporary_file, manifest_file, remote, progress_callback, expected_sha256):
+        manifest = self.load_manifest(manifest_file, url, remote)
+        if manifest is None or not temporary_file.exists() or temporary_file.stat().st_size != remote['size']:
+            segment_size = max(1, -(-remote['size'] // self.segments))
+            manifest = {'url': url, 'size': remote['size'], 'validator': remote['validator'],
+                        'segments': [[start, min(start + segment_size, remote['size']), 0]
+                                     for start in range(0, remote['size'], segment_size)]}
+            # Preallocate the whole file, every segment writes at its own offset
+            with open(temporary_file, 'wb') as file:
+                file.truncate(remote['size'])
+            self.save_manifest(manifest_file, manifest)
+        else:
+            logger.info(f"Resuming segmented download of '{destination.name}' from its manifest")
+
+        state = {'lock': threading.Lock(), 'last_progress_time': 0.0, 'last_save_time': time.perf_counter()}
+        start_time = time.perf_counter()
+        file_descriptor = os.open(temporary_file, os.O_RDWR | getattr(os, 'O_BINARY', 0))
+        try:
+            pending = [segment for segment in manifest['segments'] if segment[0] + segment[2] < segment[1]]
+            logger.info(f"Downloading {url} to {temporary_file} - {len(pending)} of {len(manifest['segments'])} segments remaining")
+            with ThreadPoolExecutor(max_workers=len(pending) or 1, thread_name_prefix='segment') as executor:
+                futures = [executor.submit(self.download_segment, url, file_descriptor, segment, manifest, manifest_file,
+                                           state, progress_callback) for segment in pending]
+                for future in futures:
+                    future.result()
+            os.fsync(file_descriptor)
+        finally:
+            os.close(file_descriptor)
+            with state['lock']:
+                self.save_manifest(manifest_file, manifest)
+
+        downloaded_size = sum(segment[2] for segment in manifest['segments'])
+        # The segments arrive out of order, the file is hashed once it is complete and only when a checksum is expected
+        sha256 = None
+        if expected_sha256 is not None:
+            sha256 = hashlib.sha256()
+            self.hash_file(temporary_file, sha256)
+            sha256 = sha256.hexdigest()
+        self.verify(temporary_file, sha256, expected_sha256, downloaded_size, manifest['size'])
+        os.replace(temporary_file, destination)
+        manifest_file.unlink(missing_ok=True)
+        elapsed = time.perf_counter() - start_time
+        logger.success(f"Downloaded '{destination}' ({manifest['size']} bytes in {len(manifest['segments'])} segments, "
+                       f"{elapsed:.2f} seconds)")
+        if progress_callback:
+            progress_callback(100)
+        return destination
+
+    def download_segment(self, url, file_descriptor, segment, manifest, manifest_file, state, progress_callback):
+        start, end, done = segment
+        headers = {'Range': f'bytes={start + done}-{end - 1}'}
+        if manifest['validator']:
+            headers['If-Range'] = manifest['validator']
+        with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise RangeIgnoredError(f"Server did not return the range {headers['Range']} of {url}")
+            for chunk in response.iter_content(chunk_size=self.chunk_size):
+                chunk = chunk[:end - start - segment[2]]
+                write_at(file_descriptor, chunk, start + segment[2])
+                with state['lock']:
+                    segment[2] += len(chunk)
+                    now = time.perf_counter()
+                    # The manifest is saved at most twice per second, a crash loses at most that much progress
+                    if now - state['last_save_time'] >= 0.5:
+                        state['last_save_time'] = now
+                        os.fsync(file_descriptor)
+                        self.save_manifest(manifest_file, manifest)
+                    if progress_callback and now - state['last_progress_time'] >= self.progress_interval:
+                        state['last_progress_time'] = now
+                        downloaded_size = sum(item[2] for item in manifest['segments'])
+                        progress_callback(min(99, int(downloaded_size / manifest['size'] * 100)))
+                if segment[2] >= end - start:
+                    break
+
+    @staticmethod
+    def load_manifest(manifest_file, url, remote):
+        # A manifest is only reused for the same file, otherwise the download starts over
+        try:
+            manifest = json.loads(manifest_file.read_text())
+        except (OSError, ValueError):
+            return None
+        if (manifest.get('url'), manifest.get('size'), manifest.get('validator')) != (url, remote['size'], remote['validator']):
+            logger.info(f"Discarding the download manifest '{manifest_file}', the remote file changed")
+            return None
+        return manifest
+
+    @staticmethod
+    def save_manifest(manifest_file, manifest):
+        with tempfile.NamedTemporaryFile('w', dir=manifest_file.parent, prefix=f"{manifest_file.name}.", delete=False) as temp:
+            json.dump(manifest, temp)
+        os.replace(temp.name, manifest_file)
+
+    def verify(self, temporary_file, sha256, expected_sha256, downloaded_size, total_size):
+        # A corrupted file is removed so that the next attempt starts over instead of resuming from bad data
+        if expected_sha256 is not None and sha256 != expected_sha256.lower():
+            temporary_file.unlink(missing_ok=True)
+            raise ChecksumError(f"Checksum mismatch for '{temporary_file}': expected {expected_sha256}, got {sha256}")
+        if total_size and downloaded_size != total_size:
+            raise ChecksumError(f"Incomplete download '{temporary_file}': {downloaded_size} of {total_size} bytes")
+        logger.info(f"Verified '{temporary_file}' - Size: {downloaded_size}" + (f" - SHA-256: {sha256}" if sha256 else ""))
+
+    def get_json(self, url):
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def get_remote_checksum(self, url):
+        # An optional '<url>.sha256' file, its first word is the hex digest
+        try:
+            response = self.session.get(f"{url}.sha256", timeout=self.timeout)
+            response.raise_for_status()
+            return response.text.split()[0]
+        except (requests.exceptions.RequestException, IndexError) as e:
+            logger.warning(f"No checksum available for {url}: {e}")
+            return None
+
+    def hash_file(self, file_path, sha256):
+        size = 0
+        with open(file_path, 'rb') as file:
+            while chunk := file.read(self.chunk_size):
+                sha256.update(chunk)
+                size += len(chunk)
+        return size
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+
+def create_download_manager(download_config):
+    # A manager configured by the download section of the configuration
+    return DownloadManager(max_concurrent=max(1, int(download_config['max_concurrent_downloads'])),
+                           chunk_size=max(1024, int(download_config['chunk_size'])),
+                           progress_interval=max(0, int(download_config['progress_interval_ms'])) / 1000,
+                           timeout=download_config['timeout'],
+                           fetch_checksum=download_config['fetch_checksum'],
+                           segments=max(1, int(download_config['segments'])),
+                           segment_min_size=max(0, int(download_config['segment_min_size'])))
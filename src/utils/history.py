@@ -0,0 +1,180 @@
+# Standard libraries
+import itertools
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from io import BytesIO
+from pathlib import Path
+
+# Third-party library
+from loguru import logger
+
+THUMBNAIL_SIZE = (160, 160)
+SPILL_FILE_PREFIX = 'spilled_'  # Only the files with this prefix are removed from the spill folder
+
+
+@dataclass
+class HistoryEntry:
+    entry_id: int
+    timestamp: str
+    text: str
+    translated_text: object = None
+    word_boxes: list = field(default_factory=list)
+    thumbnail: bytes = b''
+    image: bytes = None  # PNG bytes of the captured image, None when spilled to disk
+    image_path: Path = None
+
+    def size(self):
+        # Approximate memory footprint, word boxes are counted as a fixed size per word
+        return len(self.image or b'') + len(self.thumbnail) + len(self.text.encode()) + len(self.word_boxes) * 64
+
+    def load_image(self):
+        if self.image is not None:
+            return self.image
+        return self.image_path.read_bytes()
+
+
+class CaptureHistory:
+    """
+    In-memory history of the last captures, bounded by entry count and a byte budget.
+
+    Entries are kept in least recently used order. When the byte budget is
+    exceeded the captured image of the least recently used entry is spilled to
+    disk (if a spill folder is configured) or the whole entry is evicted.
+    Spilled images are removed with their entry and when the application exits.
+    """
+
+    def __init__(self, max_entries=50, max_bytes=32 * 1024 * 1024, spill_folder=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.spill_folder = Path(spill_folder) if spill_folder else None
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.listeners = []
+        self.id_counter = itertools.count(1)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def configure(self, config):
+        history_config = config['history']
+        self.max_entries = max(1, int(history_config['max_entries']))
+        self.max_bytes = max(0, int(history_config['max_bytes']))
+        self.spill_folder = Path(history_config['spill_folder']) if history_config['spill_to_disk'] else None
+        self.evict()
+
+    def add(self, timestamp, image, text, translated_text=None, word_boxes=None):
+        entry = HistoryEntry(next(self.id_counter), timestamp, text or "", translated_text, list(word_boxes or []),
+                             self.create_thumbnail(image), image)
+        self.entries[entry.entry_id] = entry
+        self.total_bytes += entry.size()
+        logger.info(f"Capture history entry {entry.entry_id} added ({entry.size()} bytes, total {self.total_bytes} bytes)")
+        self.evict()
+        self.notify()
+        return entry
+
+    def get(self, entry_id):
+        entry = self.entries.get(entry_id)
+        if entry is not None:
+            self.entries.move_to_end(entry_id)
+        return entry
+
+    def update_text(self, entry_id, text, translated_text=None, word_boxes=None):
+        entry = self.get(entry_id)
+        if entry is None:
+            return None
+        self.total_bytes -= entry.size()
+        entry.text = text or ""
+        entry.translated_text = translated_text
+        entry.word_boxes = list(word_boxes or [])
+        self.total_bytes += entry.size()
+        self.evict()
+        self.notify()
+        return entry
+
+    def update_translation(self, entry_id, translated_text):
+        # The translation arrives after the entry was added, it does not count as a use of the entry
+        entry = self.entries.get(entry_id)
+        if entry is not None:
+            entry.translated_text = translated_text
+            self.notify()
+        return entry
+
+    def search(self, query):
+        # Newest entries first, a case-insensitive substring match on the text
+        query = query.strip().lower()
+        entries = sorted(self.entries.values(), key=lambda entry: entry.entry_id, reverse=True)
+        return [entry for entry in entries if not query or query in entry.text.lower()]
+
+    def evict(self):
+        while len(self.entries) > self.max_entries:
+            self.remove(next(iter(self.entries)))
+
+        while self.total_bytes > self.max_bytes and self.entries:
+            entry = next((entry for entry in self.entries.values() if entry.image is not None), None)
+            if entry is not None and self.spill_folder is not None and self.spill(entry):
+                continue
+            self.remove(entry.entry_id if entry is not None else next(iter(self.entries)))
+
+    def spill(self, entry):
+        try:
+            self.spill_folder.mkdir(parents=True, exist_ok=True)
+            entry.image_path = self.spill_folder / f"{SPILL_FILE_PREFIX}{entry.timestamp}_{entry.entry_id}.png"
+            entry.image_path.write_bytes(entry.image)
+        except OSError as e:
+            logger.error(f"Failed to spill capture history entry {entry.entry_id} to disk: {e}")
+            entry.image_path = None
+            return False
+
+        self.total_bytes -= len(entry.image)
+        entry.image = None
+        logger.info(f"Capture history entry {entry.entry_id} spilled to disk: {entry.image_path}")
+        return True
+
+    def remove(self, entry_id):
+        entry = self.entries.pop(entry_id)
+        self.total_bytes -= entry.size()
+        if entry.image_path is not None:
+            self.remove_image_file(entry.image_path)
+        logger.info(f"Capture history entry {entry_id} evicted")
+
+    def remove_spilled_images(self):
+        # The history only lives for the session, the files left by a session that did not exit are removed as well
+        folders = {entry.image_path.parent for entry in self.entries.values() if entry.image_path is not None}
+        if self.spill_folder is not None:
+            folders.add(self.spill_folder)
+        removed = 0
+        for folder in folders:
+            for image_path in folder.glob(f"{SPILL_FILE_PREFIX}*.png"):
+                removed += self.remove_image_file(image_path)
+        if removed:
+            logger.info(f"Removed {removed} spilled capture history images")
+
+    @staticmethod
+    def remove_image_file(image_path):
+        try:
+            image_path.unlink(missing_ok=True)
+            return True
+        except OSError as e:
+            logger.error(f"Failed to remove the spilled capture history image '{image_path}': {e}")
+            return False
+
+    def notify(self):
+        for listener in self.listeners:
+            listener()
+
+    @staticmethod
+    def create_thumbnail(image):
+        from PIL import Image  # Only imported once the first thumbnail is made
+
+        try:
+            thumbnail = Image.open(BytesIO(image))
+            thumbnail.thumbnail(THUMBNAIL_SIZE)
+            buffer = BytesIO()
+            thumbnail.convert('RGB').save(buffer, format='JPEG', quality=70)
+            return buffer.getvalue()
+        except Exception as e:
+            logger.error(f"An error occurred while creating the history thumbnail: {e}")
+            return b''
+
+
+capture_history = CaptureHistory()
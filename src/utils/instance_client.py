@@ -0,0 +1,66 @@
+# Standard libraries
+import getpass
+import json
+import os
+import re
+import socket
+import tempfile
+from pathlib import Path
+
+# Qt-free on purpose: a command forwarded to the running instance must not pay for importing PySide6
+
+
+def server_name():
+    # One instance per user
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = 'default'
+    return f"pytextractocr-{re.sub(r'[^A-Za-z0-9_.-]', '_', user)}"
+
+
+def server_address():
+    # QLocalServer listens on a full path as a Unix domain socket, and on a name as a Windows named pipe
+    if os.name == 'nt':
+        return server_name()
+    return str(Path(tempfile.gettempdir()) / f"{server_name()}.sock")
+
+
+def read_response(read):
+    chunks = []
+    while True:
+        chunk = read(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        if chunk.endswith(b"\n"):
+            break
+    return json.loads(b"".join(chunks).decode('utf-8'))
+
+
+def send_command(request, timeout=5.0, connect_timeout=0.5):
+    """
+    Sends a command to the running instance and returns its response.
+
+    Requests and responses are one line of JSON. Returns None when no instance is running.
+    The timeout only applies to Unix domain sockets, named pipes block until the response.
+    """
+    data = (json.dumps(request) + "\n").encode('utf-8')
+    try:
+        if os.name == 'nt':
+            with open(rf"\\.\pipe\{server_name()}", 'r+b', buffering=0) as pipe:
+                pipe.write(data)
+                return read_response(pipe.read)
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.settimeout(connect_timeout)
+            connection.connect(server_address())
+            connection.settimeout(timeout)
+            connection.sendall(data)
+            return read_response(connection.recv)
+    except (FileNotFoundError, ConnectionRefusedError):
+        return None
+    except TimeoutError:
+        return {'ok': False, 'error': f"The running instance did not answer within {timeout} seconds"}
+    except (OSError, ValueError) as e:
+        return {'ok': False, 'error': f"Invalid response from the running instance: {e}"}
@@ -0,0 +1,146 @@
+# Standard libraries
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Third-party libraries
+from loguru import logger
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtNetwork import QLocalServer
+
+# Custom library
+from src.utils.instance_client import send_command, server_address
+
+
+class InstanceServer(QObject):
+    """
+    Command interface of the running instance, on a QLocalServer only the current user can connect to.
+
+    A later invocation of main.py forwards its command with send_command and exits, the command
+    runs with the windows, the configuration and the OCR libraries that are already loaded.
+    Commands: ping, show, capture, scan <path> and ocr <path> [profile]. The OCR runs in a worker
+    thread, its response is written from the GUI thread.
+    """
+
+    reply_ready = Signal(object, object)  # Socket, response
+
+    def __init__(self, main_ui):
+        super().__init__(main_ui)
+        self.main_ui = main_ui
+        self.executor = None  # OCR worker, created by the first ocr command
+        self.handlers = {
+            'ping': self.ping,
+            'show': self.show,
+            'capture': self.capture,
+            'scan': self.scan,
+            'ocr': self.ocr,
+        }
+
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)
+        self.server.newConnection.connect(self.accept_connections)
+        self.reply_ready.connect(self.send_reply)
+
+    def listen(self):
+        """
+        Listens for the commands of later invocations.
+
+        Returns False when another instance answers on the address, it was started after main.py
+        looked for one and this process forwards its command to it instead of running.
+        """
+        # The instance is looked for before listening: with UserAccessOption the Unix socket is created
+        # aside and renamed over the address, which would take the address of a running instance
+        address = server_address()
+        if send_command({'command': 'ping'}) is not None:
+            logger.warning(f"Another instance is listening for commands on '{address}'")
+            return False
+        # Nobody accepts connections on the address, a socket left there by an instance that crashed is removed
+        QLocalServer.removeServer(address)
+        if not self.server.listen(address):
+            logger.error(f"Unable to listen for commands on '{address}': {self.server.errorString()}")
+            return True
+        logger.info(f"Listening for commands on '{self.server.fullServerName()}'")
+        return True
+
+    def accept_connections(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            socket.readyRead.connect(lambda socket=socket: self.read_request(socket))
+            socket.disconnected.connect(socket.deleteLater)
+
+    def read_request(self, socket):
+        if not socket.canReadLine():
+            return
+        try:
+            request = json.loads(bytes(socket.readLine()).decode('utf-8'))
+            command = request['command']
+        except (ValueError, KeyError, TypeError) as e:
+            self.send_reply(socket, {'ok': False, 'error': f"Invalid request: {e}"})
+            return
+        logger.info(f"Command received: {command}")
+        response = self.run(command, request, socket)
+        if response is not None:
+            self.send_reply(socket, response)
+
+    def run(self, command, request, socket=None):
+        # Returns the response, or None when the handler replies later
+        handler = self.handlers.get(command)
+        if handler is None:
+            return {'ok': False, 'error': f"Unknown command '{command}', expected one of {', '.join(self.handlers)}"}
+        try:
+            return handler(request, socket)
+        except Exception as e:
+            logger.error(f"An error occurred while running the '{command}' command: {e}")
+            return {'ok': False, 'error': str(e)}
+
+    def send_reply(self, socket, response):
+        try:
+            socket.write((json.dumps(response) + "\n").encode('utf-8'))
+            socket.flush()
+            socket.disconnectFromServer()
+        except RuntimeError:
+            logger.warning("The client disconnected before the response was sent")
+
+    def ping(self, request, socket):
+        return {'ok': True}
+
+    def show(self, request, socket):
+        self.main_ui.showNormal()
+        self.main_ui.raise_()
+        self.main_ui.activateWindow()
+        return {'ok': True}
+
+    def capture(self, request, socket):
+        self.main_ui.start_fullscreen_capture('command')
+        return {'ok': True}
+
+    @staticmethod
+    def image_path(request):
+        path = Path(request['path'])
+        if not path.is_file():
+            raise FileNotFoundError(f"Image file not found: {path}")
+        return str(path)
+
+    def scan(self, request, socket):
+        # The text is shown in the OCR Text window, like a scan started from the main window
+        self.main_ui.scan_image(self.image_path(request))
+        return {'ok': True}
+
+    def ocr(self, request, socket):
+        from src.core import ocr
+
+        image_path = self.image_path(request)
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='command-ocr')
+
+        def run_ocr():
+            try:
+                response = {'ok': True, 'result': ocr(image_path, request.get('profile')).to_dict()}
+            except Exception as e:
+                logger.error(f"An error occurred while running the 'ocr' command: {e}")
+                response = {'ok': False, 'error': str(e)}
+            if socket is not None:
+                self.reply_ready.emit(socket, response)
+
+        self.executor.submit(run_ocr)
+        return None
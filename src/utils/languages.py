@@ -0,0 +1,324 @@
+# Standard libraries
+from types import MappingProxyType
+
+# Languages used to download OCR languages from Github Tesseract, also used to match the Google Translate languages
+TESSERACT_LANGUAGES = MappingProxyType({
+    'afr': 'afrikaans',
+    'sqi': 'albanian',
+    'amh': 'amharic',
+    'ara': 'arabic',
+    'hye': 'armenian',
+    'asm': 'assamese',
+    'aze': 'azerbaijani',
+    'aze_cyrl': 'azerbaijani (cyrilic)',
+    'eus': 'basque',
+    'bel': 'belarusian',
+    'ben': 'bengali',
+    'bos': 'bosnian',
+    'bre': 'breton',
+    'bul': 'bulgarian',
+    'mya': 'burmese',
+    'cat': 'catalan',
+    'ceb': 'cebuano',
+    'chr': 'cherokee',
+    'chi_sim': 'chinese (simplified)',
+    'chi_tra': 'chinese (traditional)',
+    'cos': 'corsican',
+    'hrv': 'croatian',
+    'ces': 'czech',
+    'dan': 'danish',
+    'nld': 'dutch',
+    'dzo': 'dzongkha',
+    'eng': 'english',
+    'epo': 'esperanto',
+    'est': 'estonian',
+    'fao': 'faroese',
+    'fil': 'filipino',
+    'fin': 'finnish',
+    'fra': 'french',
+    'glg': 'galician',
+    'kat': 'georgian',
+    'kat_old': 'georgian (old)',
+    'deu': 'german',
+    'frk': 'german (fraktur)',
+    'ell': 'greek',
+    'guj': 'gujarati',
+    'hat': 'haitian creole',
+    'heb': 'hebrew',
+    'hin': 'hindi',
+    'hun': 'hungarian',
+    'isl': 'icelandic',
+    'ind': 'indonesian',
+    'iku': 'inuktitut',
+    'gle': 'irish',
+    'ita': 'italian',
+    'jpn': 'japanese',
+    'jpn_vert': 'japanese (vertical)',
+    'jav': 'javanese',
+    'kan': 'kannada',
+    'kaz': 'kazakh',
+    'khm': 'khmer',
+    'kor': 'korean',
+    'kor_vert': 'korean (vertical)',
+    'kmr': 'kurdish (kurmanji)',
+    'kir': 'kyrgyz',
+    'lao': 'lao',
+    'lat': 'latin',
+    'lav': 'latvian',
+    'lit': 'lithuanian',
+    'ltz': 'luxembourgish',
+    'mkd': 'macedonian',
+    'msa': 'malay',
+    'mal': 'malayalam',
+    'mlt': 'maltese',
+    'mri': 'maori',
+    'mar': 'marathi',
+    'mon': 'mongolian',
+    'nep': 'nepali',
+    'nor': 'norwegian',
+    'ori': 'odia',
+    'pus': 'pashto',
+    'fas': 'persian',
+    'pol': 'polish',
+    'por': 'portuguese',
+    'pan': 'punjabi',
+    'que': 'quechua',
+    'ron': 'romanian',
+    'rus': 'russian',
+    'san': 'sanskrit',
+    'gla': 'scottish gaelic',
+    'srp': 'serbian',
+    'srp_latn': 'serbian (latin)',
+    'snd': 'sindhi',
+    'sin': 'sinhala',
+    'slk': 'slovak',
+    'slv': 'slovenian',
+    'spa': 'spanish',
+    'sun': 'sundanese',
+    'swa': 'swahili',
+    'swe': 'swedish',
+    'syr': 'syriac',
+    'tgk': 'tajik',
+    'tam': 'tamil',
+    'tat': 'tatar',
+    'tel': 'telugu',
+    'tha': 'thai',
+    'bod': 'tibetan',
+    'tir': 'tigrinya',
+    'ton': 'tonga',
+    'tur': 'turkish',
+    'uig': 'uyghur',
+    'ukr': 'ukrainian',
+    'urd': 'urdu',
+    'uzb': 'uzbek',
+    'vie': 'vietnamese',
+    'cym': 'welsh',
+    'fry': 'western frisian',
+    'yid': 'yiddish',
+    'yor': 'yoruba'
+})
+
+GOOGLETRANS_LANGUAGES = MappingProxyType({
+    'af': 'afrikaans',
+    'sq': 'albanian',
+    'am': 'amharic',
+    'ar': 'arabic',
+    'hy': 'armenian',
+    'as': 'assamese',  # Added - Not supported
+    'ay': 'aymara',  # Added - Not supported
+    'az': 'azerbaijani',
+    'eu': 'basque',
+    'be': 'belarusian',
+    'bn': 'bengali',
+    'bho': 'bhojpuri',
+    'bs': 'bosnian',
+    'bg': 'bulgarian',
+    'my': 'burmese',  # Added - Supported
+    'ca': 'catalan',
+    'ceb': 'cebuano',
+    'ny': 'chichewa',
+    'zh-cn': 'chinese (simplified)',
+    'zh-tw': 'chinese (traditional)',
+    'co': 'corsican',
+    'hr': 'croatian',
+    'cs': 'czech',
+    'da': 'danish',
+    'dv': 'dhivehi',  # Added - Not supported
+    'doi': 'doghri',  # Added - Not supported ('hi' in detect language)
+    'nl': 'dutch',
+    'en': 'english',
+    'eo': 'esperanto',
+    'et': 'estonian',
+    'ee': 'ewe',  # Added - Supported (Bug: Translated to Estonian)
+    'tl': 'filipino',
+    'fi': 'finnish',
+    'fr': 'french',
+    'gl': 'galician',
+    'ka': 'georgian',
+    'de': 'german',
+    'el': 'greek',
+    'gu': 'gujarati',
+    'ht': 'haitian creole',
+    'ha': 'hausa',
+    'haw': 'hawaiian',
+    'iw': 'hebrew',  # Added - Supported (Changed from 'he' to 'iw')
+    'hi': 'hindi',
+    'hmn': 'hmong',
+    'hu': 'hungarian',
+    'is': 'icelandic',
+    'ig': 'igbo',
+    'ilo': 'ilocano',
+    'id': 'indonesian',
+    'ga': 'irish',
+    'it': 'italian',
+    'ja': 'japanese',
+    'jw': 'javanese',
+    'kn': 'kannada',
+    'kk': 'kazakh',
+    'km': 'khmer',
+    'rw': 'kinyarwanda',  # Added - Not supported
+    'gom': 'konkani',  # Added - Not supported
+    'kri': 'krio',  # Added - Not supported
+    'ko': 'korean',
+    'ku': 'kurdish (kurmanji)',
+    'ckb': 'kurdish (sorani)',  # Added - Not supported
+    'ky': 'kyrgyz',
+    'lo': 'lao',
+    'la': 'latin',
+    'lv': 'latvian',
+    'ln': 'lingala',  # Added - Not supported
+    'lt': 'lithuanian',
+    'lg': 'luganda',  # Added - Not supported
+    'lb': 'luxembourgish',
+    'mk': 'macedonian',
+    'mai': 'maithili',  # Added - Not supported
+    'mg': 'malagasy',
+    'ms': 'malay',
+    'ml': 'malayalam',
+    'mt': 'maltese',
+    'mi': 'maori',
+    'mr': 'marathi',
+    'mni-Mtei': 'meiteilon (manipuri)',  # Added - Not supported
+    'lus': 'mizo',  # Added - Not supported
+    'mn': 'mongolian',
+    'ne': 'nepali',
+    'no': 'norwegian',
+    'or': 'odia',
+    'om': 'oromo',  # Added - Not supported
+    'ps': 'pashto',
+    'fa': 'persian',
+    'pl': 'polish',
+    'pt': 'portuguese',
+    'pa': 'punjabi',
+    'qu': 'quechua',  # Added - Supported
+    'ro': 'romanian',
+    'ru': 'russian',
+    'sm': 'samoan',
+    'sa': 'sanskrit',  # Added - Not supported
+    'gd': 'scots gaelic',
+    'nso': 'sepedi',  # Added - Not supported
+    'sr': 'serbian',
+    'st': 'southern sotho',
+    'sn': 'shona',
+    'sd': 'sindhi',
+    'si': 'sinhala',
+    'sk': 'slovak',
+    'sl': 'slovenian',
+    'so': 'somali',
+    'es': 'spanish',
+    'su': 'sundanese',
+    'sw': 'swahili',
+    'sv': 'swedish',
+    'tg': 'tajik',
+    'ta': 'tamil',
+    'tt': 'tatar',  # Added - Not supported
+    'te': 'telugu',
+    'th': 'thai',
+    'ti': 'tigrinya',  # Added - Not supported
+    'tr': 'turkish',
+    'tk': 'turkmen',  # Added - Not supported
+    'ak': 'twi',  # Added - Not supported
+    'uk': 'ukrainian',
+    'ur': 'urdu',
+    'ug': 'uyghur',
+    'uz': 'uzbek',
+    'vi': 'vietnamese',
+    'cy': 'welsh',
+    'fy': 'western frisian',  # Added (Changed from 'frisian' to 'western frisian')
+    'xh': 'xhosa',
+    'yi': 'yiddish',
+    'yo': 'yoruba',
+    'zu': 'zulu'
+})
+
+# Tesseract languages that are not supported by Google Translation
+# These languages are skipped when creating QTableWidgetItem and QComboBox objects in the application's UI
+SKIP_LANGUAGES = frozenset({
+    'breton',
+    'cherokee',
+    'dzongkha',
+    'faroese',
+    'inuktitut',
+    'syriac',
+    'tibetan',
+    'tonga'
+})
+
+
+def find_googletrans_code(language_name):
+    # An exact name match first, then the first word of the name, for instance 'korean' for 'korean (vertical)'
+    if language_name in GOOGLETRANS_CODES_BY_NAME:
+        return GOOGLETRANS_CODES_BY_NAME[language_name]
+    return GOOGLETRANS_CODES_BY_NAME.get(language_name.split(' ')[0].lower())
+
+
+def build_destination_choices(language_name):
+    # Every Google Translate language except the OCR language itself
+    first_word = language_name.split(' ')[0]
+    return tuple((code, name) for code, name in GOOGLETRANS_LANGUAGES.items() if name.split(' ')[0] not in first_word)
+
+
+TESSERACT_CODES_BY_NAME = MappingProxyType({name: code for code, name in TESSERACT_LANGUAGES.items()})
+GOOGLETRANS_CODES_BY_NAME = MappingProxyType({name: code for code, name in GOOGLETRANS_LANGUAGES.items()})
+
+# The Translate To languages of the configuration are stored in one slot per translatable Tesseract language
+TESSERACT_CODES_BY_SLOT = tuple(code for code, name in TESSERACT_LANGUAGES.items() if name not in SKIP_LANGUAGES)
+DESTINATION_SLOTS = MappingProxyType({code: slot for slot, code in enumerate(TESSERACT_CODES_BY_SLOT)})
+
+GOOGLETRANS_CODES_BY_TESSERACT = MappingProxyType({
+    code: find_googletrans_code(TESSERACT_LANGUAGES[code]) for code in TESSERACT_CODES_BY_SLOT
+    if find_googletrans_code(TESSERACT_LANGUAGES[code])
+})
+TESSERACT_CODES_BY_GOOGLETRANS = MappingProxyType({
+    gcode: tuple(code for code, mapped in GOOGLETRANS_CODES_BY_TESSERACT.items() if mapped == gcode)
+    for gcode in set(GOOGLETRANS_CODES_BY_TESSERACT.values())
+})
+DESTINATION_CHOICES = MappingProxyType({
+    code: build_destination_choices(TESSERACT_LANGUAGES[code]) for code in TESSERACT_CODES_BY_SLOT
+})
+
+
+def resolve_language_pair(ocr_language, destination_languages):
+    """
+    Returns the source code, source name, destination code and destination name of an OCR language.
+
+    Multiple OCR languages ('eng+jpn') are translated with automatic source language detection
+    unless they all map to the same Google Translate language, the destination is the
+    Translate To language of the first OCR language.
+    """
+    codes = [code for code in ocr_language.split('+') if code]
+    if not codes or any(code not in TESSERACT_LANGUAGES for code in codes):
+        raise ValueError(f"Source language ({ocr_language}) not found in translate language list")
+
+    source_codes = {GOOGLETRANS_CODES_BY_TESSERACT.get(code) for code in codes}
+    if len(source_codes) == 1 and None not in source_codes:
+        source_code = source_codes.pop()
+        source_name = GOOGLETRANS_LANGUAGES[source_code]
+    else:
+        source_code, source_name = 'auto', 'detected language'
+
+    slot = next((DESTINATION_SLOTS[code] for code in codes if code in DESTINATION_SLOTS), None)
+    if slot is None or slot >= len(destination_languages):
+        raise ValueError("Destination language not found in the language list.")
+    destination_code = destination_languages[slot]
+    return source_code, source_name, destination_code, GOOGLETRANS_LANGUAGES.get(destination_code)
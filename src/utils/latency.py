@@ -0,0 +1,47 @@
+# Standard library
+import time
+
+# Third-party library
+from loguru import logger
+
+
+class LatencyTrace:
+    """
+    End-to-end latency trace of a single capture, from the button click or tray action to the text being displayed.
+
+    The time spent by the user drawing the selection is reported separately,
+    so the remaining total only covers the work done by the application.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.start_time = time.perf_counter()
+        self.marks = []
+        self.user_wait_start = None
+        self.user_wait_duration = 0.0
+
+    def mark(self, stage):
+        self.marks.append((stage, time.perf_counter()))
+
+    def start_user_wait(self):
+        self.mark('overlay_shown')
+        self.user_wait_start = time.perf_counter()
+
+    def end_user_wait(self):
+        if self.user_wait_start is not None:
+            self.user_wait_duration += time.perf_counter() - self.user_wait_start
+            self.user_wait_start = None
+        self.mark('selection_made')
+
+    def finish(self, stage):
+        self.mark(stage)
+        previous_time = self.start_time
+        stages = []
+        for stage_name, stage_time in self.marks:
+            stages.append(f"{stage_name} +{(stage_time - previous_time) * 1000:.1f} ms")
+            previous_time = stage_time
+        total = (previous_time - self.start_time) * 1000
+        active = total - self.user_wait_duration * 1000
+        logger.info(f"Capture latency ({self.source}): {' | '.join(stages)}")
+        logger.info(f"Capture latency ({self.source}): total {total:.1f} ms, excluding selection {active:.1f} ms")
+        return active
@@ -0,0 +1,340 @@
+"""
+Content-addressed store of Tesseract models.
+
+Model files are kept once per content under '<store>/objects/<sha256[:2]>/<sha256>' and
+'<store>/manifest.json' maps model names such as 'best/eng.traineddata' to their hash
+and size. Installing a model into the tessdata folder is a hard link (or a copy when the
+file systems differ), so a model that is already in the store is never downloaded again.
+
+Offline bundles are zip files with the same layout (a manifest.json and an objects folder),
+used to provision machines without network access:
+
+    python -m src.utils.model_store export bundle.zip best/eng.traineddata best/jpn.traineddata
+    python -m src.utils.model_store import bundle.zip
+    python -m src.utils.model_store install best/eng.traineddata best/jpn.traineddata
+"""
+
+# Standard libraries
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import zipfile
+from pathlib import Path
+
+# Third-party library
+from loguru import logger
+
+DEFAULT_VARIANT = 'best'
+SHA256_PATTERN = re.compile(r'[0-9a-f]{64}')
+
+
+def model_name(file_name, variant=DEFAULT_VARIANT):
+    return f"{variant}/{file_name}"
+
+
+def split_model_name(name):
+    # 'fast/eng.traineddata' -> ('fast', 'eng.traineddata'), a name without a variant is a best model
+    variant, _, file_name = name.rpartition('/')
+    return variant or DEFAULT_VARIANT, file_name
+
+
+def get_base_url(download_config, variant):
+    return str(download_config['fast_base_url'] if variant == 'fast' else download_config['base_url'])
+
+
+def file_sha256(file_path, chunk_size=1024 * 1024):
+    sha256 = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        while chunk := file.read(chunk_size):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def check_sha256(sha256):
+    # Hashes from manifests are used as file names in the store, anything else could escape the objects folder
+    if not isinstance(sha256, str) or not SHA256_PATTERN.fullmatch(sha256):
+        raise ValueError(f"Invalid SHA-256 in model manifest: {sha256!r}")
+    return sha256
+
+
+def checked_models(models):
+    # The models of a manifest, rejected as a whole when an entry is malformed
+    for name, entry in models.items():
+        check_sha256(entry['sha256'])
+        if not isinstance(entry['size'], int) or entry['size'] < 0:
+            raise ValueError(f"Invalid size in model manifest for '{name}': {entry['size']!r}")
+    return dict(models)
+
+
+def link_or_copy(source, destination):
+    # Hard links make installing a model instant and free, copies are used across file systems
+    destination = Path(destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    temporary_file = destination.with_name(f"{destination.name}.link")
+    temporary_file.unlink(missing_ok=True)
+    try:
+        os.link(source, temporary_file)
+    except OSError:
+        shutil.copyfile(source, temporary_file)
+    os.replace(temporary_file, destination)
+
+
+class ModelStore:
+    def __init__(self, store_folder):
+        self.store_folder = Path(store_folder)
+        self.manifest_file = self.store_folder / 'manifest.json'
+        self.lock = threading.RLock()
+        self.manifest = self.load_manifest()
+
+    def load_manifest(self):
+        try:
+            manifest = json.loads(self.manifest_file.read_text())
+            return {'models': checked_models(manifest.get('models', {}))}
+        except FileNotFoundError:
+            return {'models': {}}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.error(f"An error occurred while reading the model store manifest '{self.manifest_file}': {e}")
+            return {'models': {}}
+
+    def save_manifest(self):
+        self.store_folder.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile('w', dir=self.store_folder, prefix='manifest.', suffix='.tmp', delete=False) as temp:
+            json.dump(self.manifest, temp, indent=2, sort_keys=True)
+        os.replace(temp.name, self.manifest_file)
+
+    def object_path(self, sha256):
+        check_sha256(sha256)
+        return self.store_folder / 'objects' / sha256[:2] / sha256
+
+    def has_object(self, sha256):
+        return self.object_path(sha256).is_file()
+
+    def get(self, name):
+        # The manifest entry of a model whose content is present in the store
+        with self.lock:
+            entry = self.manifest['models'].get(name)
+        return entry if entry is not None and self.has_object(entry['sha256']) else None
+
+    def names(self):
+        with self.lock:
+            return sorted(self.manifest['models'])
+
+    def add_file(self, file_path, name, sha256=None):
+        """
+        Adds a model file to the store under the given name and returns its hash.
+
+        The file itself is left in place, the object is a hard link to it when possible.
+        """
+        sha256 = sha256 or file_sha256(file_path)
+        with self.lock:
+            if not self.has_object(sha256):
+                link_or_copy(file_path, self.object_path(sha256))
+            self.manifest['models'][name] = {'sha256': sha256, 'size': Path(file_path).stat().st_size}
+            self.save_manifest()
+        logger.info(f"Model store: {name} -> {sha256}")
+        return sha256
+
+    def add_alias(self, name, sha256, size, save=True):
+        # A model whose content is already in the store under another name
+        with self.lock:
+            self.manifest['models'][name] = {'sha256': sha256, 'size': size}
+            if save:
+                self.save_manifest()
+
+    def install(self, name, destination):
+        """
+        Installs a model from the store into the destination path.
+
+        Returns False when the store does not contain the model.
+        """
+        entry = self.get(name)
+        if entry is None:
+            return False
+        destination = Path(destination)
+        if destination.exists() and destination.stat().st_size == entry['size'] and \
+                os.path.samefile(destination, self.object_path(entry['sha256'])):
+            return True
+        link_or_copy(self.object_path(entry['sha256']), destination)
+        logger.success(f"Installed '{name}' from the model store to '{destination}'")
+        return True
+
+    def import_bundle(self, bundle_path):
+        """
+        Imports a bundle (a zip file or a store folder) and returns the number of imported models.
+
+        Every object is verified against its hash and size, including the objects that are already
+        in the store, so a corrupted bundle is rejected. Nothing is imported from a manifest with an
+        invalid hash.
+        """
+        bundle_path = Path(bundle_path)
+        if bundle_path.is_dir():
+            return self.import_store_folder(bundle_path)
+
+        imported = 0
+        with zipfile.ZipFile(bundle_path) as bundle:
+            models = checked_models(json.loads(bundle.read('manifest.json'))['models'])
+            for name, entry in sorted(models.items()):
+                self.store_folder.mkdir(parents=True, exist_ok=True)
+                with tempfile.NamedTemporaryFile(dir=self.store_folder, suffix='.tmp', delete=False) as temp:
+                    temporary_file = Path(temp.name)
+                    try:
+                        with bundle.open(f"objects/{entry['sha256']}") as source:
+                            shutil.copyfileobj(source, temp, 1024 * 1024)
+                    except KeyError:
+                        temp.close()
+                        temporary_file.unlink(missing_ok=True)
+                        raise ValueError(f"Bundle object {entry['sha256']} of '{name}' is missing")
+                self.import_object(temporary_file, entry['sha256'], entry['size'])
+                self.add_alias(name, entry['sha256'], entry['size'], save=False)
+                imported += 1
+        self.save_manifest()
+        logger.success(f"Imported {imported} models from '{bundle_path}'")
+        return imported
+
+    def import_store_folder(self, folder):
+        # The manifest is read directly, a malformed one is an error instead of an empty store
+        other_store = ModelStore(folder)
+        models = checked_models(json.loads(other_store.manifest_file.read_text())['models'])
+        imported = 0
+        for name, entry in sorted(models.items()):
+            if not other_store.has_object(entry['sha256']):
+                continue
+            self.store_folder.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=self.store_folder, suffix='.tmp', delete=False) as temp:
+                temporary_file = Path(temp.name)
+            try:
+                shutil.copyfile(other_store.object_path(entry['sha256']), temporary_file)
+            except OSError:
+                temporary_file.unlink(missing_ok=True)
+                raise
+            self.import_object(temporary_file, entry['sha256'], entry['size'])
+            self.add_alias(name, entry['sha256'], entry['size'], save=False)
+            imported += 1
+        self.save_manifest()
+        logger.success(f"Imported {imported} models from the store '{folder}'")
+        return imported
+
+    def import_object(self, temporary_file, sha256, size):
+        actual_sha256 = file_sha256(temporary_file)
+        actual_size = temporary_file.stat().st_size
+        if actual_sha256 != sha256 or actual_size != size:
+            temporary_file.unlink(missing_ok=True)
+            raise ValueError(f"Bundle object {sha256} is corrupted (SHA-256 {actual_sha256}, {actual_size} bytes)")
+        if self.has_object(sha256):
+            temporary_file.unlink()
+            return
+        self.object_path(sha256).parent.mkdir(parents=True, exist_ok=True)
+        os.replace(temporary_file, self.object_path(sha256))
+
+    def export_bundle(self, bundle_path, names=None):
+        # Models compress poorly, the objects are stored without compression
+        names = names or self.names()
+        models = {}
+        with zipfile.ZipFile(bundle_path, 'w', zipfile.ZIP_STORED) as bundle:
+            for name in names:
+                entry = self.get(name)
+                if entry is None:
+                    raise ValueError(f"Model '{name}' is not in the store")
+                if entry['sha256'] not in {model['sha256'] for model in models.values()}:
+                    bundle.write(self.object_path(entry['sha256']), f"objects/{entry['sha256']}")
+                models[name] = entry
+            bundle.writestr('manifest.json', json.dumps({'models': models}, indent=2, sort_keys=True))
+        logger.success(f"Exported {len(models)} models to '{bundle_path}'")
+        return len(models)
+
+
+def provision_model(store, download_manager, base_url, name, destination, progress_callback=None, mirror_manifest=False):
+    """
+    Installs a model from the store, or downloads it from the base URL and adds it to the store.
+
+    When mirror_manifest is enabled the mirror's own manifest.json gives the hash of the model,
+    so a model already in the store under another name is installed without a download and a
+    downloaded model is verified against that hash.
+    """
+    if store.install(name, destination):
+        if progress_callback:
+            progress_callback(100)
+        return destination
+
+    entry = None
+    if mirror_manifest:
+        try:
+            entry = download_manager.get_json(f"{base_url.rstrip('/')}/manifest.json")['models'].get(name)
+        except Exception as e:
+            logger.warning(f"Unable to read the mirror manifest of {base_url}: {e}")
+    if entry is not None and store.has_object(entry['sha256']):
+        store.add_alias(name, entry['sha256'], entry['size'])
+        return provision_model(store, download_manager, base_url, name, destination, progress_callback)
+
+    url = f"{base_url.rstrip('/')}/{Path(name).name}"
+    download_manager.download(url, destination, progress_callback, entry['sha256'] if entry else None)
+    store.add_file(destination, name, entry['sha256'] if entry else None)
+    return destination
+
+
+stores = {}
+stores_lock = threading.Lock()
+
+
+def get_model_store(store_folder):
+    with stores_lock:
+        key = str(Path(store_folder).resolve())
+        if key not in stores:
+            stores[key] = ModelStore(store_folder)
+        return stores[key]
+
+
+def main():
+    # Standalone command line, the store folder defaults to the one in the configuration
+    from src.config.config import load_config
+    from src.ocr.variants import TESSDATA_FOLDER, VARIANTS, model_path
+
+    parser = argparse.ArgumentParser(description="PyTextractOCR model store")
+    parser.add_argument('--store', default=None, help="Store folder (default: download.store_folder)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('list', help="List the models in the store")
+    add_parser = subparsers.add_parser('add', help="Add model files to the store")
+    add_parser.add_argument('files', nargs='+')
+    add_parser.add_argument('--variant', default=DEFAULT_VARIANT)
+    import_parser = subparsers.add_parser('import', help="Import a bundle zip file or another store folder")
+    import_parser.add_argument('bundle')
+    export_parser = subparsers.add_parser('export', help="Export models to a bundle zip file")
+    export_parser.add_argument('bundle')
+    export_parser.add_argument('names', nargs='*')
+    install_parser = subparsers.add_parser('install', help="Install models into the tessdata folder")
+    install_parser.add_argument('names', nargs='+')
+    install_parser.add_argument('--tessdata', default=str(TESSDATA_FOLDER), help="Tessdata folder, fast models go to its 'fast' subfolder")
+    args = parser.parse_args()
+
+    def install_destination(name):
+        # Every variant has its own folder, a fast model must not replace the best model of the same language
+        variant, file_name = split_model_name(name)
+        if variant not in VARIANTS:
+            parser.exit(1, f"Unknown model variant '{variant}' in '{name}', expected one of {', '.join(VARIANTS)}\n")
+        return Path(args.tessdata) / model_path(Path(file_name).stem, variant).relative_to(TESSDATA_FOLDER)
+
+    store = ModelStore(args.store or load_config()['download']['store_folder'])
+    if args.command == 'list':
+        for name in store.names():
+            entry = store.get(name)
+            print(f"{name}\t{entry['sha256'] if entry else 'missing'}\t{entry['size'] if entry else ''}")
+    elif args.command == 'add':
+        for file_path in args.files:
+            store.add_file(file_path, model_name(Path(file_path).name, args.variant))
+    elif args.command == 'import':
+        store.import_bundle(args.bundle)
+    elif args.command == 'export':
+        store.export_bundle(args.bundle, args.names)
+    elif args.command == 'install':
+        missing = [name for name in args.names if not store.install(name, install_destination(name))]
+        if missing:
+            parser.exit(1, f"Not in the store: {', '.join(missing)}\n")
+
+
+if __name__ == '__main__':
+    main()
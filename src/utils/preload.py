@@ -0,0 +1,45 @@
+# Standard libraries
+import importlib
+import threading
+import time
+
+# Third-party library
+from loguru import logger
+
+# Imported on first use by the OCR, preprocessing, translation and download code. None of them
+# is needed before the first window appears, scripts/import_time_benchmark.py checks that they
+# stay out of the startup imports
+DEFERRED_MODULES = (
+    'numpy',
+    'PIL.Image',
+    'cv2',
+    'skimage.io',
+    'skimage.color',
+    'skimage.transform',
+    'deskew',
+    'pandas',
+    'pytesseract',
+    'pyperclip',
+    'playsound',
+    'requests',
+    'googletrans',
+)
+
+
+def preload_modules(modules=DEFERRED_MODULES):
+    """
+    Imports the deferred modules in a background thread, once the application is idle,
+    so the first capture does not wait for them. Missing modules are reported on first use.
+    """
+    def preload():
+        start_time = time.perf_counter()
+        for module in modules:
+            try:
+                importlib.import_module(module)
+            except Exception as e:
+                logger.warning(f"Unable to preload '{module}': {e}")
+        logger.info(f"Preloaded {len(modules)} modules in {(time.perf_counter() - start_time) * 1000:.0f} ms")
+
+    thread = threading.Thread(target=preload, name='preload-modules', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,35 @@
+# Third-party libraries
+from loguru import logger
+from PySide6.QtCore import QFileSystemWatcher, QObject, Signal
+
+
+class TessdataWatcher(QObject):
+    """
+    Keeps the tessdata index current with a QFileSystemWatcher on the variant folders.
+
+    While every folder is watched the index does not poll the folders at all. A folder
+    that does not exist yet is picked up when its parent folder changes, until then the
+    index falls back to comparing the folder modification times.
+    """
+
+    changed = Signal()
+
+    def __init__(self, index, parent=None):
+        super().__init__(parent)
+        self.index = index
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.directory_changed)
+        self.watch_folders()
+
+    def watch_folders(self):
+        folders = [str(folder) for folder in self.index.folders.values() if folder.is_dir()]
+        new_folders = [folder for folder in folders if folder not in self.watcher.directories()]
+        if new_folders:
+            self.watcher.addPaths(new_folders)
+            logger.info(f"Watching tessdata folders: {new_folders}")
+        self.index.watched = len(self.watcher.directories()) == len(self.index.folders)
+
+    def directory_changed(self, path):
+        self.index.invalidate()
+        self.watch_folders()
+        self.changed.emit()
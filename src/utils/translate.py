@@ -1,329 +1,227 @@
+# Standard libraries
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
 # Third-party library
-from googletrans import Translator
+from loguru import logger
+
+# Custom libraries
+from src.config.model import get_execution_plan
+from src.utils.translation_backends import get_translation_backend
 
-translator = Translator()
+# Sentences end with a terminal punctuation followed by whitespace, or with a paragraph break (an empty line).
+# A single line break is the OCR wrapping a line, it is part of the sentence. The whitespace around the text is kept
+SEGMENT_SEPARATOR = re.compile(r'(\A\s+|\s*\n\s*\n\s*|(?<=[.!?。！？])\s+|\s+\Z)')
+LINE_BREAK = re.compile(r'[ \t]*\n[ \t]*')
 
 
-def tesseract_skip_languages():
+class TranslationCache:
     """
-    Returns a set of languages that are not supported by Google Translation.
+    Two-tier cache of translated sentences keyed by (normalized sentence, source code, destination code, backend).
 
-    These languages are skipped when creating QTableWidgetItem and QComboBox
-    objects in the application's UI.
+    The backend is the cache_key of the translation backend, its name and the service URL when
+    the service can be self-hosted, so each service keeps its own translations.
+
+    The first tier is an in-memory LRU, the second tier is a SQLite database
+    that keeps the translations between sessions. Entries older than the
+    time to live are ignored and removed from both tiers.
     """
-    return {'breton',
-            'cherokee',
-            'dzongkha',
-            'faroese',
-            'inuktitut',
-            'syriac',
-            'tibetan',
-            'tonga'}
 
+    def __init__(self, max_entries=2048, ttl=30 * 24 * 60 * 60, database_path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.database_path = database_path
+        self.settings = None
+        self.entries = OrderedDict()
+        self.connection = None
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, config):
+        translate_config = config['translate']
+        settings = (translate_config['enable_cache'], translate_config['cache_max_entries'],
+                    translate_config['cache_ttl_days'], translate_config['cache_file'])
+        if settings == self.settings:
+            return
+
+        with self.lock:
+            self.settings = settings
+            self.max_entries = max(0, int(translate_config['cache_max_entries'])) if translate_config['enable_cache'] else 0
+            self.ttl = max(0.0, float(translate_config['cache_ttl_days'])) * 24 * 60 * 60
+            database_path = translate_config['cache_file'] if translate_config['enable_cache'] else None
+            if database_path != self.database_path:
+                self.close()
+                self.database_path = database_path
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    @staticmethod
+    def normalize(sentence):
+        return " ".join(sentence.split())
+
+    def get_many(self, sentences, src, dest, backend):
+        # Returns the cached translations of the sentences found in either tier
+        now = time.time()
+        found = {}
+        with self.lock:
+            for sentence in sentences:
+                key = (self.normalize(sentence), src, dest, backend)
+                entry = self.entries.get(key)
+                if entry is not None and now - entry[1] < self.ttl:
+                    self.entries.move_to_end(key)
+                    found[sentence] = entry[0]
+                elif entry is not None:
+                    del self.entries[key]
+
+            connection = self.open()
+            for sentence in sentences:
+                if sentence in found or connection is None:
+                    continue
+                key = (self.normalize(sentence), src, dest, backend)
+                row = connection.execute("SELECT translated, created FROM translations WHERE source = ? AND src = ? AND dest = ? "
+                                         "AND backend = ?", key).fetchone()
+                if row is not None and now - row[1] < self.ttl:
+                    self.remember(key, row[0], row[1])
+                    found[sentence] = row[0]
+
+            self.hits += len(found)
+            self.misses += len(set(sentences)) - len(found)
+        return found
+
+    def put_many(self, translations, src, dest, backend):
+        now = time.time()
+        with self.lock:
+            rows = []
+            for sentence, translated in translations.items():
+                key = (self.normalize(sentence), src, dest, backend)
+                self.remember(key, translated, now)
+                rows.append((*key, translated, now))
+
+            connection = self.open()
+            if connection is not None and rows:
+                try:
+                    with connection:
+                        connection.executemany("INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)", rows)
+                except sqlite3.Error as e:
+                    logger.error(f"An error occurred while saving translations to the cache: {e}")
+
+    def remember(self, key, translated, created):
+        if self.max_entries <= 0:
+            return
+        self.entries[key] = (translated, created)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def open(self):
+        # The database is opened on first use and shared by the translation threads
+        if self.connection is not None or self.database_path is None:
+            return self.connection
+        try:
+            self.connection = sqlite3.connect(self.database_path, check_same_thread=False)
+            with self.connection:
+                # Caches written before the backend was part of the key cannot tell which service translated a sentence
+                columns = [row[1] for row in self.connection.execute("PRAGMA table_info(translations)")]
+                if columns and 'backend' not in columns:
+                    logger.info("Dropping the translation cache written without the translation backend")
+                    self.connection.execute("DROP TABLE translations")
+                self.connection.execute("CREATE TABLE IF NOT EXISTS translations (source TEXT, src TEXT, dest TEXT, backend TEXT, "
+                                        "translated TEXT, created REAL, PRIMARY KEY (source, src, dest, backend))")
+                self.connection.execute("DELETE FROM translations WHERE created < ?", (time.time() - self.ttl,))
+            logger.info(f"Translation cache opened: {self.database_path}")
+        except sqlite3.Error as e:
+            logger.error(f"An error occurred while opening the translation cache '{self.database_path}': {e}")
+            self.connection = None
+            self.database_path = None
+        return self.connection
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
 
-def tesseract_languages():
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            connection = self.open()
+            if connection is not None:
+                with connection:
+                    connection.execute("DELETE FROM translations")
+
+
+translation_cache = TranslationCache()
+
+
+def split_segments(text, max_characters=None):
     """
-    Returns a set of languages that is used to download OCR languages from Github Tesseract
+    Splits a text into sentences and the separators between them.
 
-    Also use to compare in Google Translate languages
+    Even indexes are sentences, odd indexes are the separators kept as they are when the
+    text is rebuilt. The line breaks inside a sentence are replaced with spaces, so a sentence
+    wrapped over several lines is translated and cached as one sentence. A sentence longer than max_characters is split at the last whitespace
+    before the limit, or at the limit when it has no whitespace.
     """
-    return {
-        'afr': 'afrikaans',
-        'sqi': 'albanian',
-        'amh': 'amharic',
-        'ara': 'arabic',
-        'hye': 'armenian',
-        'asm': 'assamese',
-        'aze': 'azerbaijani',
-        'aze_cyrl': 'azerbaijani (cyrilic)',
-        'eus': 'basque',
-        'bel': 'belarusian',
-        'ben': 'bengali',
-        'bos': 'bosnian',
-        'bre': 'breton',
-        'bul': 'bulgarian',
-        'mya': 'burmese',
-        'cat': 'catalan',
-        'ceb': 'cebuano',
-        'chr': 'cherokee',
-        'chi_sim': 'chinese (simplified)',
-        'chi_tra': 'chinese (traditional)',
-        'cos': 'corsican',
-        'hrv': 'croatian',
-        'ces': 'czech',
-        'dan': 'danish',
-        'nld': 'dutch',
-        'dzo': 'dzongkha',
-        'eng': 'english',
-        'epo': 'esperanto',
-        'est': 'estonian',
-        'fao': 'faroese',
-        'fil': 'filipino',
-        'fin': 'finnish',
-        'fra': 'french',
-        'glg': 'galician',
-        'kat': 'georgian',
-        'kat_old': 'georgian (old)',
-        'deu': 'german',
-        'frk': 'german (fraktur)',
-        'ell': 'greek',
-        'guj': 'gujarati',
-        'hat': 'haitian creole',
-        'heb': 'hebrew',
-        'hin': 'hindi',
-        'hun': 'hungarian',
-        'isl': 'icelandic',
-        'ind': 'indonesian',
-        'iku': 'inuktitut',
-        'gle': 'irish',
-        'ita': 'italian',
-        'jpn': 'japanese',
-        'jpn_vert': 'japanese (vertical)',
-        'jav': 'javanese',
-        'kan': 'kannada',
-        'kaz': 'kazakh',
-        'khm': 'khmer',
-        'kor': 'korean',
-        'kor_vert': 'korean (vertical)',
-        'kmr': 'kurdish (kurmanji)',
-        'kir': 'kyrgyz',
-        'lao': 'lao',
-        'lat': 'latin',
-        'lav': 'latvian',
-        'lit': 'lithuanian',
-        'ltz': 'luxembourgish',
-        'mkd': 'macedonian',
-        'msa': 'malay',
-        'mal': 'malayalam',
-        'mlt': 'maltese',
-        'mri': 'maori',
-        'mar': 'marathi',
-        'mon': 'mongolian',
-        'nep': 'nepali',
-        'nor': 'norwegian',
-        'ori': 'odia',
-        'pus': 'pashto',
-        'fas': 'persian',
-        'pol': 'polish',
-        'por': 'portuguese',
-        'pan': 'punjabi',
-        'que': 'quechua',
-        'ron': 'romanian',
-        'rus': 'russian',
-        'san': 'sanskrit',
-        'gla': 'scottish gaelic',
-        'srp': 'serbian',
-        'srp_latn': 'serbian (latin)',
-        'snd': 'sindhi',
-        'sin': 'sinhala',
-        'slk': 'slovak',
-        'slv': 'slovenian',
-        'spa': 'spanish',
-        'sun': 'sundanese',
-        'swa': 'swahili',
-        'swe': 'swedish',
-        'syr': 'syriac',
-        'tgk': 'tajik',
-        'tam': 'tamil',
-        'tat': 'tatar',
-        'tel': 'telugu',
-        'tha': 'thai',
-        'bod': 'tibetan',
-        'tir': 'tigrinya',
-        'ton': 'tonga',
-        'tur': 'turkish',
-        'uig': 'uyghur',
-        'ukr': 'ukrainian',
-        'urd': 'urdu',
-        'uzb': 'uzbek',
-        'vie': 'vietnamese',
-        'cym': 'welsh',
-        'fry': 'western frisian',
-        'yid': 'yiddish',
-        'yor': 'yoruba'
-    }
-
-
-def googletrans_languages():
-    return {
-        'af': 'afrikaans',
-        'sq': 'albanian',
-        'am': 'amharic',
-        'ar': 'arabic',
-        'hy': 'armenian',
-        'as': 'assamese',  # Added - Not supported
-        'ay': 'aymara',  # Added - Not supported
-        'az': 'azerbaijani',
-        'eu': 'basque',
-        'be': 'belarusian',
-        'bn': 'bengali',
-        'bho': 'bhojpuri',
-        'bs': 'bosnian',
-        'bg': 'bulgarian',
-        'my': 'burmese',  # Added - Supported
-        'ca': 'catalan',
-        'ceb': 'cebuano',
-        'ny': 'chichewa',
-        'zh-cn': 'chinese (simplified)',
-        'zh-tw': 'chinese (traditional)',
-        'co': 'corsican',
-        'hr': 'croatian',
-        'cs': 'czech',
-        'da': 'danish',
-        'dv': 'dhivehi',  # Added - Not supported
-        'doi': 'doghri',  # Added - Not supported ('hi' in detect language)
-        'nl': 'dutch',
-        'en': 'english',
-        'eo': 'esperanto',
-        'et': 'estonian',
-        'ee': 'ewe',  # Added - Supported (Bug: Translated to Estonian)
-        'tl': 'filipino',
-        'fi': 'finnish',
-        'fr': 'french',
-        'gl': 'galician',
-        'ka': 'georgian',
-        'de': 'german',
-        'el': 'greek',
-        'gu': 'gujarati',
-        'ht': 'haitian creole',
-        'ha': 'hausa',
-        'haw': 'hawaiian',
-        'iw': 'hebrew',  # Added - Supported (Changed from 'he' to 'iw')
-        'hi': 'hindi',
-        'hmn': 'hmong',
-        'hu': 'hungarian',
-        'is': 'icelandic',
-        'ig': 'igbo',
-        'ilo': 'ilocano',
-        'id': 'indonesian',
-        'ga': 'irish',
-        'it': 'italian',
-        'ja': 'japanese',
-        'jw': 'javanese',
-        'kn': 'kannada',
-        'kk': 'kazakh',
-        'km': 'khmer',
-        'rw': 'kinyarwanda',  # Added - Not supported
-        'gom': 'konkani',  # Added - Not supported
-        'kri': 'krio',  # Added - Not supported
-        'ko': 'korean',
-        'ku': 'kurdish (kurmanji)',
-        'ckb': 'kurdish (sorani)',  # Added - Not supported
-        'ky': 'kyrgyz',
-        'lo': 'lao',
-        'la': 'latin',
-        'lv': 'latvian',
-        'ln': 'lingala',  # Added - Not supported
-        'lt': 'lithuanian',
-        'lg': 'luganda',  # Added - Not supported
-        'lb': 'luxembourgish',
-        'mk': 'macedonian',
-        'mai': 'maithili',  # Added - Not supported
-        'mg': 'malagasy',
-        'ms': 'malay',
-        'ml': 'malayalam',
-        'mt': 'maltese',
-        'mi': 'maori',
-        'mr': 'marathi',
-        'mni-Mtei': 'meiteilon (manipuri)',  # Added - Not supported
-        'lus': 'mizo',  # Added - Not supported
-        'mn': 'mongolian',
-        'ne': 'nepali',
-        'no': 'norwegian',
-        'or': 'odia',
-        'om': 'oromo',  # Added - Not supported
-        'ps': 'pashto',
-        'fa': 'persian',
-        'pl': 'polish',
-        'pt': 'portuguese',
-        'pa': 'punjabi',
-        'qu': 'quechua',  # Added - Supported
-        'ro': 'romanian',
-        'ru': 'russian',
-        'sm': 'samoan',
-        'sa': 'sanskrit',  # Added - Not supported
-        'gd': 'scots gaelic',
-        'nso': 'sepedi',  # Added - Not supported
-        'sr': 'serbian',
-        'st': 'southern sotho',
-        'sn': 'shona',
-        'sd': 'sindhi',
-        'si': 'sinhala',
-        'sk': 'slovak',
-        'sl': 'slovenian',
-        'so': 'somali',
-        'es': 'spanish',
-        'su': 'sundanese',
-        'sw': 'swahili',
-        'sv': 'swedish',
-        'tg': 'tajik',
-        'ta': 'tamil',
-        'tt': 'tatar',  # Added - Not supported
-        'te': 'telugu',
-        'th': 'thai',
-        'ti': 'tigrinya',  # Added - Not supported
-        'tr': 'turkish',
-        'tk': 'turkmen',  # Added - Not supported
-        'ak': 'twi',  # Added - Not supported
-        'uk': 'ukrainian',
-        'ur': 'urdu',
-        'ug': 'uyghur',
-        'uz': 'uzbek',
-        'vi': 'vietnamese',
-        'cy': 'welsh',
-        'fy': 'western frisian',  # Added (Changed from 'frisian' to 'western frisian')
-        'xh': 'xhosa',
-        'yi': 'yiddish',
-        'yo': 'yoruba',
-        'zu': 'zulu'
-    }
+    segments = [LINE_BREAK.sub(' ', segment) if i % 2 == 0 else segment for i, segment in enumerate(SEGMENT_SEPARATOR.split(text))]
+    if not max_characters:
+        return segments
 
+    chunked = []
+    for i, segment in enumerate(segments):
+        if i % 2 == 1 or len(segment) <= max_characters:
+            chunked.append(segment)
+            continue
+        while len(segment) > max_characters:
+            split_at = segment.rfind(' ', 1, max_characters + 1)
+            split_at = split_at if split_at > 0 else max_characters
+            chunked.extend([segment[:split_at], ' ' if segment[split_at:split_at + 1] == ' ' else ''])
+            segment = segment[split_at:].lstrip(' ') if segment[split_at:split_at + 1] == ' ' else segment[split_at:]
+        chunked.append(segment)
+    return chunked
 
-def translate_text(extracted_text, configuration):
-    config = configuration
-    googletrans_languages_dict = googletrans_languages()
-    tesseract_languages_dict = tesseract_languages()
-
-    source_language_code = None
-    source_language_name = None
-    # Identify a single language
-    # Evaluate the OCR language and retrieve the corresponding language
-    # For example, if the language is 'eng', match it with the googletrans_languages dictionary and identify the key that corresponds to 'English'
-    # Extract the first part of the language string, for instance, extract 'korean' from 'korean (vertical)'
-    language = tesseract_languages_dict.get(config['ocr']['language'])
-    if language:
-        for gcode, gname in googletrans_languages_dict.items():
-            #  If the googletrans language name matches the first part of the OCR language, print it and set the source language code and name
-            if gname == language.split(' ')[0].lower():
-                source_language_code = gcode
-                source_language_name = gname
-    else:
-        # ValueError indicates that the user selected multiple OCR language or the language in the config not found
-        raise ValueError(f"Source language ({config['ocr']['language']}) not found in translate language list")
-
-    # Find the position of the language in the Tesseract dictionary
-    # Then get the destination code from the config based on the 'counter' number
-    counter = 0
-    destination_language_code = None
-    destination_language_name = None
-    # Filter out languages from Tesseract that are in the skip list
-    save_tesseract_languages = [lang for lang in tesseract_languages().values() if lang not in tesseract_skip_languages()]
-    for tess_language_name in save_tesseract_languages:
-        # If the current language is the one we're looking for, get its corresponding destination code
-        if tess_language_name == language:
-            # Get the destination language code from the config file at the index specified by 'counter'
-            destination_language_code = config['translate']['languages'][counter]
-            # Using the destination language code as a key, get the corresponding destination language name (value)
-            destination_language_name = googletrans_languages_dict.get(destination_language_code)
-        # Increment the counter for the next iteration
-        counter += 1
-    if destination_language_code is None:
-        raise ValueError(f"Destination language not found in the language list.")
 
+def translate_texts(texts, configuration):
+    """
+    Translates a list of texts with the backend selected in the configuration.
+
+    The sentences of all the texts are deduplicated, looked up in the translation
+    cache, and the missing ones are sent to the backend in batches. Returns one
+    translated text per input text.
+    """
+    # The language pair is resolved once per configuration version by the execution plan
+    plan = get_execution_plan(configuration)
+    if plan.translation is None:
+        raise ValueError(plan.translation_error)
+    pair = plan.translation
+    translation_cache.configure(configuration)
+
+    max_characters = int(configuration['translate']['batch_characters'])
+    text_segments = [split_segments(text, max_characters) for text in texts]
+    sentences = list(dict.fromkeys(segment for segments in text_segments for segment in segments[::2] if segment.strip()))
     try:
-        translated_text = translator.translate(extracted_text, src=source_language_code, dest=destination_language_code)
-        translated_text_result = translated_text.text
+        backend = get_translation_backend(configuration)
+        # Only the sentences missing from the cache are sent to the backend, duplicates are sent once
+        translations = translation_cache.get_many(sentences, pair.source_code, pair.destination_code,
+                                                  backend.cache_key) if backend.cacheable else {}
+        missing = [sentence for sentence in sentences if sentence not in translations]
+        if missing:
+            translated = dict(zip(missing, backend.translate_batch(missing, pair.source_code, pair.destination_code)))
+            if backend.cacheable:
+                translation_cache.put_many(translated, pair.source_code, pair.destination_code, backend.cache_key)
+            translations.update(translated)
+        logger.info(f"Translation cache: {len(sentences) - len(missing)} of {len(sentences)} sentences cached "
+                    f"(session hits {translation_cache.hits}, misses {translation_cache.misses})")
     except Exception as e:
         raise ValueError(f"Translating error: {e}")
+
+    return ["".join(translations.get(segment, segment) if i % 2 == 0 else segment for i, segment in enumerate(segments))
+            for segments in text_segments], pair
+
+
+def translate_text(extracted_text, configuration):
+    translated_texts, pair = translate_texts([extracted_text], configuration)
     # The destination_language_code is used for the translate_in_default_browser function when translating the OCR text
-    return translated_text_result, source_language_name, destination_language_name, destination_language_code
+    return translated_texts[0], pair.source_name, pair.destination_name, pair.destination_code
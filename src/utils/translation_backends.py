@@ -0,0 +1,246 @@
+# Standard libraries
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Third-party library
+# googletrans and requests are imported when a backend is created, the first window does not need them
+from loguru import logger
+
+
+def translation_time_limit(translate_config):
+    """
+    Returns the seconds a translation may take, the time of a batch whose every attempt times out.
+
+    Every attempt waits up to the server timeout and the backoff doubles between the attempts.
+    The backend stops retrying when the limit is reached, the UI gives up on the translation
+    after the same limit.
+    """
+    timeout = max(0.1, float(translate_config['server_timeout']) / 1000)
+    max_retries = max(0, int(translate_config['max_retries']))
+    retry_backoff = max(0.0, float(translate_config['retry_backoff']))
+    return timeout * (max_retries + 1) + sum(retry_backoff * 2 ** attempt for attempt in range(max_retries))
+
+
+class TranslationBackend:
+    """
+    Base class of the translation services.
+
+    translate_batch receives a list of sentences and returns their translations in the same order.
+    Backends send as many sentences per request as the service allows and keep their
+    connections open between calls.
+    """
+
+    name = None
+    cacheable = True  # Translations of backends that are not cacheable are never stored in the translation cache
+
+    def __init__(self, translate_config):
+        self.timeout = max(0.1, float(translate_config['server_timeout']) / 1000)
+        self.batch_size = max(1, int(translate_config['batch_size']))
+        self.batch_characters = max(1, int(translate_config['batch_characters']))
+        self.max_parallel_requests = max(1, int(translate_config['max_parallel_requests']))
+        self.max_retries = max(0, int(translate_config['max_retries']))
+        self.retry_backoff = max(0.0, float(translate_config['retry_backoff']))
+        self.time_limit = translation_time_limit(translate_config)
+
+    @property
+    def cache_key(self):
+        # Identifies the service in the translation cache, two services translate the same sentence differently
+        return self.name
+
+    def batches(self, sentences):
+        # Groups the sentences by count and by number of characters, a single long sentence is sent alone
+        batch, characters = [], 0
+        for sentence in sentences:
+            if batch and (len(batch) >= self.batch_size or characters + len(sentence) > self.batch_characters):
+                yield batch
+                batch, characters = [], 0
+            batch.append(sentence)
+            characters += len(sentence) + 1
+        if batch:
+            yield batch
+
+    def translate_batch(self, sentences, src, dest):
+        # The batches are translated concurrently, executor.map keeps them in their original order.
+        # Every batch shares the deadline of the translation
+        deadline = time.monotonic() + self.time_limit
+        batches = list(self.batches(sentences))
+        if len(batches) == 1:
+            return self.translate_with_retry(batches[0], src, dest, deadline)
+
+        translations = []
+        with ThreadPoolExecutor(max_workers=min(len(batches), self.max_parallel_requests)) as executor:
+            for translated in executor.map(lambda batch: self.translate_with_retry(batch, src, dest, deadline), batches):
+                translations.extend(translated)
+        return translations
+
+    def translate_with_retry(self, sentences, src, dest, deadline):
+        # Exponential backoff between the attempts, the last error is raised when every attempt failed
+        # or when the next attempt would start after the deadline
+        for attempt in range(self.max_retries + 1):
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Translation time limit of {self.time_limit:.1f} seconds reached")
+            try:
+                return self.translate_request(sentences, src, dest)
+            except Exception as e:
+                delay = self.retry_backoff * 2 ** attempt
+                if attempt == self.max_retries or time.monotonic() + delay >= deadline:
+                    raise
+                logger.warning(f"Translation request failed ({e}), retrying in {delay:.1f} seconds")
+                time.sleep(delay)
+
+    def translate_request(self, sentences, src, dest):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class GoogleBackend(TranslationBackend):
+    name = 'google'
+
+    def __init__(self, translate_config):
+        super().__init__(translate_config)
+        from googletrans import Translator
+
+        # The googletrans client keeps one HTTP/2 connection pool for the lifetime of the backend
+        self.translator = Translator(timeout=self.timeout)
+
+    def translate_request(self, sentences, src, dest):
+        # The sentences of a batch are sent as the lines of a single text, the response is split back into lines.
+        # When Google merges or splits lines the batch is sent again one sentence per request
+        if len(sentences) > 1:
+            translated = self.translator.translate("\n".join(sentences), src=src, dest=dest).text.split("\n")
+            if len(translated) == len(sentences):
+                return translated
+            logger.warning(f"Google Translate returned {len(translated)} lines for {len(sentences)} sentences, retrying one by one")
+        return [translation.text for translation in self.translator.translate(list(sentences), src=src, dest=dest)]
+
+    def close(self):
+        self.translator.client.close()
+
+
+class LibreTranslateBackend(TranslationBackend):
+    name = 'libretranslate'
+
+    # Google Translate language codes that are different in LibreTranslate
+    language_codes = {'zh-cn': 'zh', 'zh-tw': 'zt', 'iw': 'he', 'jw': 'jv'}
+
+    def __init__(self, translate_config):
+        super().__init__(translate_config)
+        self.url = f"{str(translate_config['service_url']).rstrip('/')}/translate"
+        self.api_key = translate_config['service_api_key']
+
+        # Keep-alive connections shared by the translation threads
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(8, self.max_parallel_requests))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    @property
+    def cache_key(self):
+        # Instances of LibreTranslate can run different models
+        return f"{self.name} {self.url}"
+
+    def translate_request(self, sentences, src, dest):
+        # LibreTranslate accepts a list of texts and answers with a list of translations
+        payload = {
+            'q': list(sentences),
+            'source': self.language_codes.get(src, src),
+            'target': self.language_codes.get(dest, dest),
+            'format': 'text'
+        }
+        if self.api_key:
+            payload['api_key'] = self.api_key
+
+        response = self.session.post(self.url, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        translated = response.json()['translatedText']
+        if isinstance(translated, str):
+            translated = [translated]
+        if len(translated) != len(sentences):
+            raise ValueError(f"Translation service returned {len(translated)} translations for {len(sentences)} sentences")
+        return translated
+
+    def close(self):
+        self.session.close()
+
+
+class DictionaryBackend(TranslationBackend):
+    """
+    Offline translation from a JSON dictionary file.
+
+    The file maps "source:destination" language pairs to a dictionary of phrases,
+    for instance {"en:tl": {"good morning": "magandang umaga", "thank you": "salamat"}}.
+    Whole sentences are looked up first, then the words that are found are replaced one by one.
+    """
+
+    name = 'dictionary'
+    cacheable = False
+
+    def __init__(self, translate_config):
+        super().__init__(translate_config)
+        self.dictionary_file = Path(translate_config['dictionary_file'])
+        self.dictionaries = {}
+        try:
+            with open(self.dictionary_file, 'r', encoding='utf-8') as file:
+                for pair, phrases in json.load(file).items():
+                    self.dictionaries[pair] = {phrase.lower(): translation for phrase, translation in phrases.items()}
+            logger.info(f"Translation dictionary loaded: {self.dictionary_file} ({len(self.dictionaries)} language pairs)")
+        except (OSError, ValueError, AttributeError) as e:
+            logger.error(f"An error occurred while loading the translation dictionary '{self.dictionary_file}': {e}")
+
+    def translate_batch(self, sentences, src, dest):
+        # Every sentence is answered locally, there is nothing to batch
+        return self.translate_request(sentences, src, dest)
+
+    def translate_request(self, sentences, src, dest):
+        dictionary = self.dictionaries.get(f"{src}:{dest}")
+        if dictionary is None:
+            raise ValueError(f"No dictionary for the language pair {src}:{dest} in '{self.dictionary_file}'")
+        return [self.translate_sentence(dictionary, sentence) for sentence in sentences]
+
+    @staticmethod
+    def translate_sentence(dictionary, sentence):
+        translated = dictionary.get(sentence.strip().lower())
+        if translated is not None:
+            return translated
+        return re.sub(r'\w+', lambda match: dictionary.get(match.group(0).lower(), match.group(0)), sentence)
+
+
+BACKENDS = {backend.name: backend for backend in (GoogleBackend, LibreTranslateBackend, DictionaryBackend)}
+
+backend_lock = threading.Lock()
+active_backend = (None, None)
+
+
+def get_translation_backend(config):
+    """
+    Returns the backend selected in the configuration.
+
+    The backend and its connections are reused until one of the translate settings changes.
+    """
+    global active_backend
+    translate_config = config['translate']
+    settings = (translate_config['backend'], translate_config['server_timeout'], translate_config['batch_size'],
+                translate_config['batch_characters'], translate_config['max_parallel_requests'], translate_config['max_retries'],
+                translate_config['retry_backoff'], translate_config['service_url'], translate_config['service_api_key'],
+                translate_config['dictionary_file'])
+    with backend_lock:
+        active_settings, backend = active_backend
+        if active_settings != settings:
+            backend_class = BACKENDS.get(translate_config['backend'])
+            if backend_class is None:
+                raise ValueError(f"Unknown translation backend: {translate_config['backend']}")
+            if backend is not None:
+                backend.close()
+            backend = backend_class(translate_config)
+            active_backend = (settings, backend)
+            logger.info(f"Translation backend: {backend.name}")
+        return backend
@@ -0,0 +1,99 @@
+# Standard libraries
+import hashlib
+import json
+import sys
+import zipfile
+
+# Third-party library
+import pytest
+
+# Custom libraries
+from src.utils import model_store
+from src.utils.model_store import ModelStore
+
+MODEL = b"traineddata"
+MODEL_SHA256 = hashlib.sha256(MODEL).hexdigest()
+
+
+def write_bundle(bundle_path, models, objects):
+    with zipfile.ZipFile(bundle_path, 'w') as bundle:
+        bundle.writestr('manifest.json', json.dumps({'models': models}))
+        for name, content in objects.items():
+            bundle.writestr(f"objects/{name}", content)
+    return bundle_path
+
+
+def temporary_files(store):
+    return list(store.store_folder.glob('*.tmp'))
+
+
+def test_import_bundle(tmp_path):
+    bundle = write_bundle(tmp_path / 'bundle.zip', {'best/eng.traineddata': {'sha256': MODEL_SHA256, 'size': len(MODEL)}},
+                          {MODEL_SHA256: MODEL})
+    store = ModelStore(tmp_path / 'store')
+    assert store.import_bundle(bundle) == 1
+    assert store.object_path(MODEL_SHA256).read_bytes() == MODEL
+    assert ModelStore(tmp_path / 'store').get('best/eng.traineddata')['sha256'] == MODEL_SHA256
+
+
+@pytest.mark.parametrize('sha256', ["../secret.txt", "../../" + "a" * 58, MODEL_SHA256.upper(), MODEL_SHA256[:-1], 42])
+def test_import_bundle_rejects_invalid_hashes(tmp_path, sha256):
+    (tmp_path / 'secret.txt').write_text("secret")
+    bundle = write_bundle(tmp_path / 'bundle.zip', {'best/eng.traineddata': {'sha256': sha256, 'size': len(MODEL)}},
+                          {str(sha256): MODEL})
+    store = ModelStore(tmp_path / 'store')
+    with pytest.raises(ValueError, match="Invalid SHA-256"):
+        store.import_bundle(bundle)
+    assert store.names() == []
+    assert (tmp_path / 'secret.txt').read_text() == "secret"
+
+
+def test_object_path_rejects_invalid_hashes(tmp_path):
+    with pytest.raises(ValueError):
+        ModelStore(tmp_path / 'store').object_path("../secret.txt")
+
+
+def test_import_bundle_verifies_objects_already_in_store(tmp_path):
+    store = ModelStore(tmp_path / 'store')
+    (tmp_path / 'eng.traineddata').write_bytes(MODEL)
+    store.add_file(tmp_path / 'eng.traineddata', 'best/eng.traineddata')
+    bundle = write_bundle(tmp_path / 'bundle.zip', {'best/jpn.traineddata': {'sha256': MODEL_SHA256, 'size': len(MODEL)}},
+                          {MODEL_SHA256: b"corrupted"})
+    with pytest.raises(ValueError, match="corrupted"):
+        store.import_bundle(bundle)
+    assert store.names() == ['best/eng.traineddata']
+    assert temporary_files(store) == []
+
+
+def test_import_bundle_removes_temporary_file_of_missing_object(tmp_path):
+    bundle = write_bundle(tmp_path / 'bundle.zip', {'best/eng.traineddata': {'sha256': MODEL_SHA256, 'size': len(MODEL)}}, {})
+    store = ModelStore(tmp_path / 'store')
+    with pytest.raises(ValueError, match="missing"):
+        store.import_bundle(bundle)
+    assert temporary_files(store) == []
+
+
+def test_import_store_folder_rejects_invalid_hashes(tmp_path):
+    other_folder = tmp_path / 'other'
+    other_folder.mkdir()
+    (other_folder / 'manifest.json').write_text(json.dumps({'models': {'best/eng.traineddata': {'sha256': "../../secret.txt", 'size': 6}}}))
+    (tmp_path / 'secret.txt').write_text("secret")
+    store = ModelStore(tmp_path / 'store')
+    with pytest.raises(ValueError, match="Invalid SHA-256"):
+        store.import_bundle(other_folder)
+    assert store.names() == []
+
+
+def test_install_command_keeps_variants_apart(tmp_path, monkeypatch):
+    store = ModelStore(tmp_path / 'store')
+    (tmp_path / 'eng.traineddata').write_bytes(b"fast model")
+    store.add_file(tmp_path / 'eng.traineddata', 'fast/eng.traineddata')
+    tessdata = tmp_path / 'tessdata'
+    tessdata.mkdir()
+    (tessdata / 'eng.traineddata').write_bytes(MODEL)
+
+    monkeypatch.setattr(sys, 'argv', ['model_store', '--store', str(tmp_path / 'store'), 'install', 'fast/eng.traineddata',
+                                      '--tessdata', str(tessdata)])
+    model_store.main()
+    assert (tessdata / 'fast' / 'eng.traineddata').read_bytes() == b"fast model"
+    assert (tessdata / 'eng.traineddata').read_bytes() == MODEL